@@ -0,0 +1,354 @@
+import asyncio
+import hashlib
+import logging
+import math
+import uuid
+from datetime import datetime, timedelta
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+logger = logging.getLogger(__name__)
+
+# Raw ad_views documents are kept this long after being rolled up
+RAW_VIEW_RETENTION_SECONDS = 7 * 24 * 60 * 60
+# Views younger than this are left for the next run so late inserts are not skipped
+ROLLUP_LAG = timedelta(minutes=1)
+ROLLUP_INTERVAL_SECONDS = 5 * 60
+ROLLUP_BATCH_SIZE = 5000
+# A rollup holds this lease in ad_rollup_state (renewed every batch) so only one process merges at a time
+ROLLUP_LEASE = timedelta(minutes=10)
+# Ids of the last batches merged into a bucket, kept so a batch retried after a crash is not counted twice
+APPLIED_BATCH_HISTORY = 20
+VIEW_PROJECTION = {"_id": 1, "ad_id": 1, "user_ip": 1, "user_agent": 1, "clicked": 1, "timestamp": 1}
+
+HLL_PRECISION = 10  # 1024 registers, ~3% standard error
+
+
+class HyperLogLog:
+    """Minimal HyperLogLog sketch stored as one byte per register"""
+
+    def __init__(self, registers: bytes = None, precision: int = HLL_PRECISION):
+        self.p = precision
+        self.m = 1 << precision
+        self.registers = bytearray(registers) if registers else bytearray(self.m)
+
+    def add(self, value: str):
+        h = int.from_bytes(hashlib.sha1(value.encode('utf-8')).digest()[:8], 'big')
+        index = h >> (64 - self.p)
+        remainder = h & ((1 << (64 - self.p)) - 1)
+        rank = (64 - self.p) - remainder.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: "HyperLogLog"):
+        self.registers = bytearray(max(a, b) for a, b in zip(self.registers, other.registers))
+
+    def count(self) -> int:
+        alpha = 0.7213 / (1 + 1.079 / self.m)
+        estimate = alpha * self.m * self.m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * self.m and zeros:
+            estimate = self.m * math.log(self.m / zeros)
+        return int(round(estimate))
+
+    def to_bytes(self) -> bytes:
+        return bytes(self.registers)
+
+
+def _hour_bucket(timestamp: datetime) -> datetime:
+    return timestamp.replace(minute=0, second=0, microsecond=0)
+
+
+def _day_bucket(timestamp: datetime) -> datetime:
+    return timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _visitor_key(view: dict) -> str:
+    return f"{view.get('user_ip') or ''}|{view.get('user_agent') or ''}"
+
+
+def _group_views(views, bucket_of) -> dict:
+    """{(ad_id, bucket): {views, clicks, hll}} of raw views"""
+    groups = {}
+    for view in views:
+        group = groups.setdefault((view["ad_id"], bucket_of(view["timestamp"])), {"views": 0, "clicks": 0, "hll": HyperLogLog()})
+        group["views"] += 1
+        group["clicks"] += 1 if view.get("clicked") else 0
+        group["hll"].add(_visitor_key(view))
+    return groups
+
+
+class AdAnalytics:
+    """Incrementally rolls raw ad_views up into hourly and daily buckets.
+
+    Each run processes views between the stored watermark and now - ROLLUP_LAG,
+    merges them into ad_stats_hourly / ad_stats_daily (views, clicks and a
+    HyperLogLog sketch of visitors) and stamps the raw views with rolled_up_at,
+    which the TTL index uses to age them out. Views inserted after the watermark
+    already passed their timestamp are picked up by the next run the same way.
+
+    Each batch first claims its views with a rollup_batch id and every bucket
+    records the ids it has merged, so a batch interrupted between the merge and
+    the rolled_up_at stamp is finished by the next run without counting twice.
+
+    Merging is a read-modify-write of the sketches, so a run holds a lease
+    stored in Mongo: processes on other hosts skip their run while it is held.
+    """
+
+    def __init__(self):
+        self.db = None
+        self._task = None
+        self._lock = asyncio.Lock()
+        self._owner = uuid.uuid4().hex
+
+    async def ensure_indexes(self):
+        await self.db.ad_views.create_index("timestamp")
+        await self.db.ad_views.create_index("rolled_up_at", expireAfterSeconds=RAW_VIEW_RETENTION_SECONDS)
+        # Views not rolled up yet (null rolled_up_at) by time, without walking the retained ones
+        await self.db.ad_views.create_index([("rolled_up_at", 1), ("timestamp", 1)])
+        await self.db.ad_stats_hourly.create_index([("ad_id", 1), ("bucket", 1)], unique=True)
+        await self.db.ad_stats_daily.create_index([("ad_id", 1), ("bucket", 1)], unique=True)
+        await self.db.ad_rollup_state.create_index("id", unique=True)
+
+    async def _get_watermark(self) -> datetime:
+        state = await self.db.ad_rollup_state.find_one({"id": "ad_views"})
+        if state:
+            return state["watermark"]
+        first = await self.db.ad_views.find_one({}, {"_id": 0, "timestamp": 1}, sort=[("timestamp", 1)])
+        return first["timestamp"] if first else datetime.utcnow()
+
+    async def _merge_buckets(self, collection, groups: dict, batch_id: str):
+        """Merge {(ad_id, bucket): {views, clicks, hll}} into a stats collection, once per batch_id"""
+        existing = {}
+        if groups:
+            cursor = collection.find(
+                {"$or": [{"ad_id": ad_id, "bucket": bucket} for ad_id, bucket in groups]},
+                {"_id": 0, "ad_id": 1, "bucket": 1, "hll": 1}
+            )
+            async for doc in cursor:
+                existing[(doc["ad_id"], doc["bucket"])] = doc.get("hll")
+
+        operations = []
+        for (ad_id, bucket), group in groups.items():
+            sketch = group["hll"]
+            if existing.get((ad_id, bucket)):
+                sketch.merge(HyperLogLog(existing[(ad_id, bucket)]))
+            operations.append(UpdateOne(
+                {"ad_id": ad_id, "bucket": bucket, "batches": {"$ne": batch_id}},
+                {
+                    "$inc": {"views": group["views"], "clicks": group["clicks"]},
+                    "$set": {"hll": sketch.to_bytes(), "updated_at": datetime.utcnow()},
+                    "$push": {"batches": {"$each": [batch_id], "$slice": -APPLIED_BATCH_HISTORY}}
+                },
+                upsert=True
+            ))
+
+        if operations:
+            try:
+                await collection.bulk_write(operations, ordered=False)
+            except BulkWriteError as e:
+                # A bucket that already holds this batch fails the upsert on the unique index: already merged
+                if any(error.get("code") != 11000 for error in e.details.get("writeErrors", [])):
+                    raise
+
+    async def _acquire_lease(self) -> bool:
+        """Take or renew the rollup lease, False while another process holds it"""
+        now = datetime.utcnow()
+        try:
+            await self.db.ad_rollup_state.update_one(
+                {"id": "ad_views_lease"},
+                {"$setOnInsert": {"lease_until": now, "owner": None}},
+                upsert=True
+            )
+        except DuplicateKeyError:
+            pass  # another process created it first
+        result = await self.db.ad_rollup_state.update_one(
+            {"id": "ad_views_lease", "$or": [{"owner": self._owner}, {"lease_until": {"$lte": now}}]},
+            {"$set": {"owner": self._owner, "lease_until": now + ROLLUP_LEASE}}
+        )
+        return result.matched_count == 1
+
+    async def _release_lease(self):
+        await self.db.ad_rollup_state.update_one(
+            {"id": "ad_views_lease", "owner": self._owner},
+            {"$set": {"owner": None, "lease_until": datetime.utcnow()}}
+        )
+
+    async def _roll_up_views(self, views: list, batch_id: str = None):
+        """Merge views into the hourly and daily buckets and stamp exactly those views.
+
+        batch_id is given when finishing a batch an earlier run claimed.
+        """
+        view_ids = [view["_id"] for view in views]
+        if batch_id is None:
+            batch_id = uuid.uuid4().hex
+            await self.db.ad_views.update_many({"_id": {"$in": view_ids}}, {"$set": {"rollup_batch": batch_id}})
+
+        await self._merge_buckets(self.db.ad_stats_hourly, _group_views(views, _hour_bucket), batch_id)
+        await self._merge_buckets(self.db.ad_stats_daily, _group_views(views, _day_bucket), batch_id)
+
+        # By _id rather than by time range: a view inserted meanwhile stays unstamped for the next run
+        await self.db.ad_views.update_many({"_id": {"$in": view_ids}}, {"$set": {"rolled_up_at": datetime.utcnow()}})
+
+    async def _finish_claimed(self) -> int:
+        """Re-run batches claimed by a run that stopped before stamping them"""
+        processed = 0
+        claimed = await self.db.ad_views.find(
+            {"rolled_up_at": None, "rollup_batch": {"$ne": None}}, {**VIEW_PROJECTION, "rollup_batch": 1}
+        ).to_list(length=None)
+        batches = {}
+        for view in claimed:
+            batches.setdefault(view["rollup_batch"], []).append(view)
+        for batch_id, views in batches.items():
+            await self._roll_up_views(views, batch_id)
+            processed += len(views)
+        return processed
+
+    async def rollup(self) -> dict:
+        """Aggregate all pending raw views, returns the number processed"""
+        async with self._lock:
+            if not await self._acquire_lease():
+                return {"processed": 0, "watermark": None}
+            try:
+                return await self._rollup()
+            finally:
+                await self._release_lease()
+
+    async def _rollup(self) -> dict:
+        watermark = await self._get_watermark()
+        upper = datetime.utcnow() - ROLLUP_LAG
+        processed = await self._finish_claimed()
+
+        # Stragglers: views stored with a timestamp the watermark had already passed
+        while True:
+            views = await self.db.ad_views.find(
+                {"rolled_up_at": None, "timestamp": {"$lt": watermark}, "rollup_batch": None}, VIEW_PROJECTION
+            ).limit(ROLLUP_BATCH_SIZE).to_list(length=ROLLUP_BATCH_SIZE)
+            if not views:
+                break
+            await self._roll_up_views(views)
+            processed += len(views)
+            if not await self._acquire_lease():
+                return {"processed": processed, "watermark": watermark}
+
+        while watermark < upper:
+            views = await self.db.ad_views.find(
+                {"rolled_up_at": None, "timestamp": {"$gte": watermark, "$lt": upper}, "rollup_batch": None},
+                VIEW_PROJECTION
+            ).sort("timestamp", 1).limit(ROLLUP_BATCH_SIZE).to_list(length=ROLLUP_BATCH_SIZE)
+
+            if len(views) == ROLLUP_BATCH_SIZE:
+                # Stop before the last timestamp so no view sharing it is split across batches
+                batch_upper = views[-1]["timestamp"]
+                views = [view for view in views if view["timestamp"] < batch_upper]
+                if not views:
+                    # Whole batch shares one timestamp, take all of it (Mongo stores milliseconds)
+                    views = await self.db.ad_views.find(
+                        {"rolled_up_at": None, "timestamp": batch_upper, "rollup_batch": None},
+                        VIEW_PROJECTION
+                    ).to_list(length=None)
+                    batch_upper = batch_upper + timedelta(milliseconds=1)
+            else:
+                batch_upper = upper
+
+            if views:
+                await self._roll_up_views(views)
+            await self.db.ad_rollup_state.update_one(
+                {"id": "ad_views"},
+                {"$set": {"watermark": batch_upper, "updated_at": datetime.utcnow()}},
+                upsert=True
+            )
+
+            processed += len(views)
+            watermark = batch_upper
+            if not await self._acquire_lease():
+                break
+
+        if processed:
+            logger.info(f"Rolled up {processed} advertisement views")
+        return {"processed": processed, "watermark": watermark}
+
+    async def get_stats(self, ad_id: str, granularity: str, start: datetime, end: datetime) -> dict:
+        """Buckets from start to end, both widened to whole buckets.
+
+        Views not rolled up yet are counted from the raw log, so the current
+        bucket is complete too.
+        """
+        bucket_of, size = (_day_bucket, timedelta(days=1)) if granularity == "day" else (_hour_bucket, timedelta(hours=1))
+        start, end = bucket_of(start), bucket_of(end)
+        collection = self.db.ad_stats_daily if granularity == "day" else self.db.ad_stats_hourly
+        docs = await collection.find(
+            {"ad_id": ad_id, "bucket": {"$gte": start, "$lte": end}},
+            {"_id": 0, "bucket": 1, "views": 1, "clicks": 1, "hll": 1}
+        ).to_list(length=None)
+        pending = await self.db.ad_views.find(
+            {"rolled_up_at": None, "timestamp": {"$gte": start, "$lt": end + size}, "ad_id": ad_id, "rollup_batch": None},
+            VIEW_PROJECTION
+        ).to_list(length=None)
+
+        groups = _group_views(pending, bucket_of)
+        for doc in docs:
+            group = groups.setdefault((ad_id, doc["bucket"]), {"views": 0, "clicks": 0, "hll": HyperLogLog()})
+            group["views"] += doc["views"]
+            group["clicks"] += doc["clicks"]
+            group["hll"].merge(HyperLogLog(doc.get("hll")))
+
+        total_sketch = HyperLogLog()
+        buckets = []
+        for (_, bucket), group in sorted(groups.items(), key=lambda item: item[0][1]):
+            total_sketch.merge(group["hll"])
+            buckets.append({
+                "bucket": bucket,
+                "views": group["views"],
+                "clicks": group["clicks"],
+                "ctr": round(group["clicks"] / group["views"], 4) if group["views"] else 0.0,
+                "unique_visitors": group["hll"].count()
+            })
+
+        total_views = sum(bucket["views"] for bucket in buckets)
+        total_clicks = sum(bucket["clicks"] for bucket in buckets)
+        return {
+            "ad_id": ad_id,
+            "granularity": granularity,
+            "start": start,
+            "end": end,
+            "buckets": buckets,
+            "totals": {
+                "views": total_views,
+                "clicks": total_clicks,
+                "ctr": round(total_clicks / total_views, 4) if total_views else 0.0,
+                "unique_visitors": total_sketch.count()
+            }
+        }
+
+    async def _loop(self):
+        while True:
+            try:
+                await self.rollup()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Advertisement rollup error: {e}")
+            await asyncio.sleep(ROLLUP_INTERVAL_SECONDS)
+
+    async def start(self, db):
+        self.db = db
+        try:
+            await self.ensure_indexes()
+        except Exception as e:
+            logger.error(f"Advertisement analytics index creation failed: {e}")
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Global advertisement analytics instance
+ad_analytics = AdAnalytics()
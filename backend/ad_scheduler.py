@@ -0,0 +1,163 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+
+logger = logging.getLogger(__name__)
+
+# Statuses are stored as plain strings (AdvertisementStatus values)
+ACTIVE = "active"
+INACTIVE = "inactive"
+EXPIRED = "expired"
+
+# Safety net: even without a known boundary, re-check at least this often
+MAX_SLEEP_SECONDS = 6 * 60 * 60
+
+
+def _naive(value: datetime) -> datetime:
+    """Mongo stores naive UTC datetimes, compare everything in that form"""
+    if value is not None and value.tzinfo:
+        return value.replace(tzinfo=None)
+    return value
+
+
+def compute_ad_status(start_date: datetime, end_date: datetime, is_active: bool, now: datetime = None) -> str:
+    """Status of an advertisement at `now` (naive UTC)"""
+    now = now or datetime.utcnow()
+    start_date = _naive(start_date)
+    end_date = _naive(end_date)
+
+    if now > end_date:
+        return EXPIRED
+    if start_date <= now and is_active:
+        return ACTIVE
+    return INACTIVE
+
+
+class AdStatusScheduler:
+    """Flips advertisement statuses when their start/end dates are reached.
+
+    Instead of polling, the loop sleeps until the nearest known boundary
+    (earliest pending start_date or active end_date) and is woken early by
+    notify() whenever an advertisement is created or its dates change.
+    """
+
+    def __init__(self):
+        self.db = None
+        self._task = None
+        self._wakeup = asyncio.Event()
+        self._listeners = []
+        self.next_run_at = None
+        self.last_run_at = None
+
+    def add_listener(self, callback):
+        """Register a callback fired after statuses change (e.g. cache invalidation)"""
+        self._listeners.append(callback)
+
+    def notify(self):
+        """Ask the loop to recompute its next boundary"""
+        self._wakeup.set()
+
+    async def ensure_indexes(self):
+        await self.db.advertisements.create_index([("status", 1), ("start_date", 1)])
+        await self.db.advertisements.create_index([("status", 1), ("end_date", 1)])
+
+    async def run_transitions(self, now: datetime = None) -> dict:
+        """Apply every due transition with one update_many each"""
+        now = now or datetime.utcnow()
+        changes = {}
+
+        result = await self.db.advertisements.update_many(
+            {"status": {"$in": [ACTIVE, INACTIVE]}, "end_date": {"$lt": now}},
+            {"$set": {"status": EXPIRED, "updated_at": now}}
+        )
+        changes["expired"] = result.modified_count
+
+        result = await self.db.advertisements.update_many(
+            {
+                "status": INACTIVE,
+                "is_active": True,
+                "start_date": {"$lte": now},
+                "end_date": {"$gte": now}
+            },
+            {"$set": {"status": ACTIVE, "updated_at": now}}
+        )
+        changes["activated"] = result.modified_count
+
+        self.last_run_at = now
+        if any(changes.values()):
+            logger.info(f"Advertisement status transitions: {changes}")
+            for callback in self._listeners:
+                try:
+                    outcome = callback(changes)
+                    if asyncio.iscoroutine(outcome):
+                        await outcome
+                except Exception as e:
+                    logger.error(f"Advertisement status listener error: {e}")
+
+        return changes
+
+    async def next_boundary(self, now: datetime = None):
+        """Earliest future datetime at which some advertisement changes status"""
+        now = now or datetime.utcnow()
+        candidates = []
+
+        next_start = await self.db.advertisements.find_one(
+            {"status": INACTIVE, "is_active": True, "start_date": {"$gt": now}},
+            {"_id": 0, "start_date": 1},
+            sort=[("start_date", 1)]
+        )
+        if next_start:
+            candidates.append(next_start["start_date"])
+
+        next_end = await self.db.advertisements.find_one(
+            {"status": {"$in": [ACTIVE, INACTIVE]}, "end_date": {"$gte": now}},
+            {"_id": 0, "end_date": 1},
+            sort=[("end_date", 1)]
+        )
+        if next_end:
+            # end_date is inclusive, the ad expires right after it
+            candidates.append(next_end["end_date"] + timedelta(milliseconds=1))
+
+        return min(candidates) if candidates else None
+
+    async def _loop(self):
+        while True:
+            try:
+                self._wakeup.clear()
+                await self.run_transitions()
+                now = datetime.utcnow()
+                self.next_run_at = await self.next_boundary(now)
+                timeout = MAX_SLEEP_SECONDS
+                if self.next_run_at:
+                    timeout = min(timeout, max((self.next_run_at - now).total_seconds(), 0))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Advertisement scheduler error: {e}")
+                timeout = 60
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def start(self, db):
+        self.db = db
+        try:
+            await self.ensure_indexes()
+        except Exception as e:
+            logger.error(f"Advertisement index creation failed: {e}")
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Global advertisement scheduler instance
+ad_scheduler = AdStatusScheduler()
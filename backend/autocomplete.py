@@ -0,0 +1,283 @@
+import asyncio
+import bisect
+import heapq
+import logging
+from typing import List
+
+from search_index import fold
+
+logger = logging.getLogger(__name__)
+
+SUGGESTABLE_HOTELS = {"is_active": True, "approval_status": "approved", "deleted_at": None}
+HOTEL_PROJECTION = {"_id": 0, "id": 1, "name": 1, "city": 1}
+MAX_CACHED_RESULTS = 10000
+KEY_END = "\U0010ffff"  # sorts after every character, needle + KEY_END bounds a prefix range
+DIRECT_RANK_LIMIT = 1000  # prefixes matching more names than this walk the global ranking instead
+
+
+def _word_suffixes(text: str) -> List[str]:
+    """"grand pera palas" -> ["grand pera palas", "pera palas", "palas"], so any word start matches"""
+    words = fold(text).split()
+    return [" ".join(words[start:]) for start in range(len(words))]
+
+
+class AutocompleteIndex:
+    """Prefix lookup of city and hotel names for the search box.
+
+    Names are folded (see search_index.fold) and every word suffix of a name is
+    kept in one sorted array; a prefix is the range found by bisecting it.
+    Suggestions rank by popularity: non-cancelled bookings of a hotel, summed
+    per city for cities.
+
+    Every name matching a prefix is ranked, however short the prefix: all
+    cities and hotels are also kept in one list sorted by rank (updated in
+    place when popularity moves), so a prefix matching thousands of names
+    takes its best matches from the front of that list instead of sorting
+    them. The matching names of a prefix are memoized until a name changes
+    and the answers until the next change of any kind, so repeated
+    keystrokes cost a dict lookup.
+
+    Built at startup from approved hotels. Hotels are reloaded after
+    mark_dirty (approvals, rejections, deletes), record_booking() and
+    record_cancellation() move a hotel's popularity; all fan out to the other
+    workers.
+    """
+
+    def __init__(self):
+        self.db = None
+        self._keys = []  # sorted folded name suffixes
+        self._refs = []  # ("city", folded city) or ("hotel", hotel id), parallel to _keys
+        self._hotels = {}  # hotel_id -> {"name", "city", "keys"}
+        self._cities = {}  # folded city -> {"name", "hotels"}
+        self._popularity = {}  # hotel_id -> bookings
+        self._city_popularity = {}  # folded city -> bookings of its hotels
+        self._ranked = []  # (rank key, ref) of every city and hotel, best first
+        self._rank_keys = {}  # ref -> its rank key in _ranked
+        self._ranges = {}  # prefix -> refs with a key starting with it, cleared when keys change
+        self._results = {}  # (prefix, limit) -> suggestions, cleared on every change
+        self._dirty = set()
+        self._lock = asyncio.Lock()
+        self._listeners = []
+
+    def init(self, db):
+        self.db = db
+
+    def add_listener(self, callback):
+        """Called with (kind, ids) for local changes: "hotel" (reload), "booking" / "cancellation" (popularity +1 / -1)"""
+        self._listeners.append(callback)
+
+    def _notify(self, kind: str, ids: List[str]):
+        for callback in self._listeners:
+            callback(kind, ids)
+
+    def mark_dirty(self, *hotel_ids: str, broadcast: bool = True):
+        self._dirty.update(hotel_ids)
+        if broadcast:
+            self._notify("hotel", list(hotel_ids))
+
+    def _add_popularity(self, hotel_id: str, delta: int):
+        before = self._popularity.get(hotel_id, 0)
+        after = self._popularity[hotel_id] = max(0, before + delta)
+        hotel = self._hotels.get(hotel_id)
+        if hotel:
+            self._rerank(("hotel", hotel_id))
+            city_key = fold(hotel["city"]).strip()
+            if city_key in self._city_popularity:
+                self._city_popularity[city_key] += after - before
+                self._rerank(("city", city_key))
+        self._results.clear()
+
+    def record_booking(self, hotel_id: str, broadcast: bool = True):
+        self._add_popularity(hotel_id, 1)
+        if broadcast:
+            self._notify("booking", [hotel_id])
+
+    def record_cancellation(self, hotel_id: str, broadcast: bool = True):
+        """A booking of the hotel was cancelled (un-cancelling is a record_booking)"""
+        self._add_popularity(hotel_id, -1)
+        if broadcast:
+            self._notify("cancellation", [hotel_id])
+
+    def apply(self, kind: str, ids: List[str]):
+        """A change announced by another worker (see add_listener)"""
+        if kind == "hotel":
+            self.mark_dirty(*ids, broadcast=False)
+            return
+        for hotel_id in ids:
+            self._add_popularity(hotel_id, 1 if kind == "booking" else -1)
+
+    def _rank_key(self, ref: tuple) -> tuple:
+        # Most booked first, cities first on ties, then alphabetical
+        kind, ref_id = ref
+        if kind == "city":
+            return -self._city_popularity.get(ref_id, 0), False, ref_id
+        keys = self._hotels[ref_id]["keys"]
+        return -self._popularity.get(ref_id, 0), True, keys[0] if keys else ""
+
+    def _unrank(self, ref: tuple):
+        key = self._rank_keys.pop(ref, None)
+        if key is not None:
+            del self._ranked[bisect.bisect_left(self._ranked, (key, ref))]
+
+    def _rerank(self, ref: tuple):
+        self._unrank(ref)
+        key = self._rank_keys[ref] = self._rank_key(ref)
+        bisect.insort(self._ranked, (key, ref))
+
+    def _insert_key(self, key: str, ref: tuple):
+        self._ranges.clear()
+        index = bisect.bisect_left(self._keys, key)
+        self._keys.insert(index, key)
+        self._refs.insert(index, ref)
+
+    def _remove_key(self, key: str, ref: tuple):
+        self._ranges.clear()
+        index = bisect.bisect_left(self._keys, key)
+        while index < len(self._keys) and self._keys[index] == key:
+            if self._refs[index] == ref:
+                del self._keys[index]
+                del self._refs[index]
+                return
+            index += 1
+
+    def _put(self, hotel: dict):
+        self._drop(hotel["id"])
+        self._results.clear()
+        keys = _word_suffixes(hotel.get("name"))
+        self._hotels[hotel["id"]] = {"name": hotel.get("name"), "city": hotel.get("city"), "keys": keys}
+        for key in keys:
+            self._insert_key(key, ("hotel", hotel["id"]))
+        self._rerank(("hotel", hotel["id"]))
+
+        city_key = fold(hotel.get("city")).strip()
+        if not city_key:
+            return
+        city = self._cities.get(city_key)
+        if city is None:
+            city = self._cities[city_key] = {"name": hotel.get("city").strip(), "hotels": set()}
+            for key in _word_suffixes(city_key):
+                self._insert_key(key, ("city", city_key))
+        city["hotels"].add(hotel["id"])
+        self._city_popularity[city_key] = self._city_popularity.get(city_key, 0) + self._popularity.get(hotel["id"], 0)
+        self._rerank(("city", city_key))
+
+    def _drop(self, hotel_id: str):
+        hotel = self._hotels.pop(hotel_id, None)
+        if hotel is None:
+            return
+        self._results.clear()
+        for key in hotel["keys"]:
+            self._remove_key(key, ("hotel", hotel_id))
+        self._unrank(("hotel", hotel_id))
+        city_key = fold(hotel["city"]).strip()
+        city = self._cities.get(city_key)
+        if city:
+            city["hotels"].discard(hotel_id)
+            self._city_popularity[city_key] -= self._popularity.get(hotel_id, 0)
+            if not city["hotels"]:
+                del self._cities[city_key]
+                del self._city_popularity[city_key]
+                self._unrank(("city", city_key))
+                for key in _word_suffixes(city_key):
+                    self._remove_key(key, ("city", city_key))
+            else:
+                self._rerank(("city", city_key))
+
+    async def _load_popularity(self) -> dict:
+        booked = await self.db.bookings.aggregate([
+            {"$match": {"status": {"$ne": "cancelled"}}},
+            {"$group": {"_id": "$room_id", "bookings": {"$sum": 1}}}
+        ]).to_list(length=None)
+        room_bookings = {row["_id"]: row["bookings"] for row in booked}
+        popularity = {}
+        if room_bookings:
+            async for room in self.db.conference_rooms.find(
+                {"id": {"$in": list(room_bookings)}}, {"_id": 0, "id": 1, "hotel_id": 1}
+            ):
+                popularity[room["hotel_id"]] = popularity.get(room["hotel_id"], 0) + room_bookings[room["id"]]
+        return popularity
+
+    async def rebuild(self):
+        async with self._lock:
+            self._dirty.clear()
+            self._keys, self._refs, self._hotels, self._cities = [], [], {}, {}
+            self._city_popularity, self._ranges, self._results = {}, {}, {}
+            self._ranked, self._rank_keys = [], {}
+            self._popularity = await self._load_popularity()
+            async for hotel in self.db.hotels.find(SUGGESTABLE_HOTELS, HOTEL_PROJECTION):
+                self._put(hotel)
+        logger.info(f"Autocomplete index built: {len(self._hotels)} hotels, {len(self._cities)} cities")
+
+    async def sync(self):
+        """Reload the hotels marked dirty since the last query"""
+        if not self._dirty:
+            return
+        async with self._lock:
+            hotel_ids, self._dirty = list(self._dirty), set()
+            try:
+                hotels = await self.db.hotels.find(
+                    {"id": {"$in": hotel_ids}, **SUGGESTABLE_HOTELS}, HOTEL_PROJECTION
+                ).to_list(length=None)
+            except Exception:
+                # Retry them on the next query
+                self._dirty.update(hotel_ids)
+                raise
+            found = set()
+            for hotel in hotels:
+                self._put(hotel)
+                found.add(hotel["id"])
+            for hotel_id in hotel_ids:
+                if hotel_id not in found:
+                    self._drop(hotel_id)
+
+    def suggest(self, prefix: str, limit: int = 8) -> List[dict]:
+        """Cities and hotels with a word starting with prefix, most booked first"""
+        needle = " ".join(fold(prefix).split())
+        if not needle:
+            return []
+        cached = self._results.get((needle, limit))
+        if cached is not None:
+            return cached
+
+        refs = self._ranges.get(needle)
+        if refs is None:
+            start = bisect.bisect_left(self._keys, needle)
+            end = bisect.bisect_left(self._keys, needle + KEY_END, start)
+            refs = set(self._refs[start:end])
+            if len(self._ranges) >= MAX_CACHED_RESULTS:
+                self._ranges.clear()
+            self._ranges[needle] = refs
+
+        if len(refs) <= DIRECT_RANK_LIMIT:
+            best = heapq.nsmallest(limit, refs, key=self._rank_keys.__getitem__)
+        else:
+            # Many matches: the best ones are near the front of the global ranking
+            best = []
+            for _, ref in self._ranked:
+                if ref in refs:
+                    best.append(ref)
+                    if len(best) == limit:
+                        break
+
+        suggestions = []
+        for kind, ref_id in best:
+            if kind == "city":
+                city = self._cities[ref_id]
+                suggestions.append({
+                    "type": "city", "value": city["name"], "hotel_count": len(city["hotels"]),
+                    "popularity": self._city_popularity.get(ref_id, 0)
+                })
+            else:
+                hotel = self._hotels[ref_id]
+                suggestions.append({
+                    "type": "hotel", "value": hotel["name"], "id": ref_id, "city": hotel["city"],
+                    "popularity": self._popularity.get(ref_id, 0)
+                })
+        if len(self._results) >= MAX_CACHED_RESULTS:
+            self._results.clear()
+        self._results[(needle, limit)] = suggestions
+        return suggestions
+
+
+# Global autocomplete index instance
+autocomplete_index = AutocompleteIndex()
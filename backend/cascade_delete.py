@@ -0,0 +1,191 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+
+logger = logging.getLogger(__name__)
+
+# Documents removed per delete_many, keeps each write short
+PURGE_BATCH_SIZE = 500
+# A "running" purge job that has not reported progress for this long belongs to a dead worker
+PURGE_STALE_AFTER = timedelta(minutes=10)
+
+
+class CascadeDeleter:
+    """Soft-deletes hotels and rooms and purges everything that hangs off them.
+
+    Deleting is two-phase: soft_delete_* hides the hotel/room immediately
+    (is_active / is_available False plus deleted_at), then a background job
+    removes bookings, reviews, extra services, advertisements and uploaded
+    image files in bounded batches before removing the documents themselves.
+    Purges left unfinished by a restart are resumed on startup.
+
+    Purging a room also recomputes its hotel's rating without the room's
+    reviews; listeners are called with the hotel id afterwards.
+    """
+
+    def __init__(self):
+        self.db = None
+        self.jobs = None
+        self.hotel_images_dir = None
+        self.room_images_dir = None
+        self._listeners = []
+
+    def init(self, db, jobs, hotel_images_dir, room_images_dir):
+        self.db = db
+        self.jobs = jobs
+        self.hotel_images_dir = hotel_images_dir
+        self.room_images_dir = room_images_dir
+
+    def add_listener(self, callback):
+        """Called with the hotel id after a room purge changed the hotel's rating (e.g. cache invalidation)"""
+        self._listeners.append(callback)
+
+    async def soft_delete_hotel(self, hotel_id: str, requested_by: str = None) -> dict:
+        now = datetime.utcnow()
+        await self.db.hotels.update_one({"id": hotel_id}, {"$set": {"is_active": False, "deleted_at": now}})
+        await self.db.conference_rooms.update_many(
+            {"hotel_id": hotel_id},
+            {"$set": {"is_available": False, "deleted_at": now}}
+        )
+        return await self._start_purge("hotel", hotel_id, requested_by)
+
+    async def soft_delete_room(self, room_id: str, requested_by: str = None) -> dict:
+        await self.db.conference_rooms.update_one(
+            {"id": room_id},
+            {"$set": {"is_available": False, "deleted_at": datetime.utcnow()}}
+        )
+        return await self._start_purge("room", room_id, requested_by)
+
+    async def _start_purge(self, entity: str, entity_id: str, requested_by: str = None) -> dict:
+        job = await self.jobs.create(
+            f"{entity}_purge",
+            meta={"entity": entity, "entity_id": entity_id},
+            requested_by=requested_by
+        )
+        collection = self.db.hotels if entity == "hotel" else self.db.conference_rooms
+        await collection.update_one({"id": entity_id}, {"$set": {"deletion_job_id": job["id"]}})
+        purge = self.purge_hotel if entity == "hotel" else self.purge_room
+        self.jobs.run(job["id"], purge(entity_id, job["id"]))
+        return job
+
+    async def _running_jobs(self, docs) -> set:
+        """Ids of the docs' purge jobs that another worker is still running"""
+        job_ids = [doc["deletion_job_id"] for doc in docs if doc.get("deletion_job_id")]
+        if not job_ids:
+            return set()
+        running = await self.db.jobs.find(
+            {
+                "id": {"$in": job_ids},
+                "status": "running",
+                "updated_at": {"$gt": datetime.utcnow() - PURGE_STALE_AFTER}
+            },
+            {"_id": 0, "id": 1}
+        ).to_list(length=None)
+        return {job["id"] for job in running}
+
+    async def resume_pending(self):
+        """Restart purges for soft-deleted documents that are still present.
+
+        Documents whose purge job is still running (recent progress) are left
+        to the worker running it; interrupted, failed or stale ones restart.
+        """
+        projection = {"_id": 0, "id": 1, "deletion_job_id": 1}
+        hotels = await self.db.hotels.find({"deleted_at": {"$exists": True}}, projection).to_list(length=None)
+        rooms = await self.db.conference_rooms.find(
+            {"deleted_at": {"$exists": True}, "hotel_id": {"$nin": [hotel["id"] for hotel in hotels]}},
+            projection
+        ).to_list(length=None)
+
+        running = await self._running_jobs(hotels + rooms)
+        hotels = [hotel for hotel in hotels if hotel.get("deletion_job_id") not in running]
+        rooms = [room for room in rooms if room.get("deletion_job_id") not in running]
+        for hotel in hotels:
+            await self._start_purge("hotel", hotel["id"])
+        for room in rooms:
+            await self._start_purge("room", room["id"])
+        if hotels or rooms:
+            logger.info(f"Resumed purge of {len(hotels)} hotels and {len(rooms)} rooms")
+
+    async def _delete_in_batches(self, collection, query: dict, job_id: str) -> int:
+        deleted = 0
+        while True:
+            batch = await collection.find(query, {"_id": 1}).limit(PURGE_BATCH_SIZE).to_list(length=PURGE_BATCH_SIZE)
+            if not batch:
+                return deleted
+            result = await collection.delete_many({"_id": {"$in": [doc["_id"] for doc in batch]}})
+            deleted += result.deleted_count
+            await self.jobs.progress(job_id, processed=result.deleted_count)
+            # Give request handlers a turn between batches
+            await asyncio.sleep(0)
+
+    def _delete_images(self, directory, owner_ids) -> int:
+        """Uploaded files are named <owner_id>_<uuid>.<ext>"""
+        removed = 0
+        for owner_id in owner_ids:
+            for path in directory.glob(f"{owner_id}_*"):
+                try:
+                    path.unlink()
+                    removed += 1
+                except OSError as e:
+                    logger.error(f"Could not delete image {path}: {e}")
+        return removed
+
+    async def _count(self, queries) -> int:
+        return sum([await collection.count_documents(query) for collection, query in queries])
+
+    async def _purge(self, job_id: str, dependents, hotel_ids, room_ids) -> dict:
+        await self.jobs.progress(job_id, total=await self._count(dependents))
+
+        deleted = {}
+        for collection, query in dependents:
+            deleted[collection.name] = await self._delete_in_batches(collection, query, job_id)
+
+        loop = asyncio.get_running_loop()
+        deleted["image_files"] = await loop.run_in_executor(None, self._delete_images, self.hotel_images_dir, hotel_ids)
+        deleted["image_files"] += await loop.run_in_executor(None, self._delete_images, self.room_images_dir, room_ids)
+        return deleted
+
+    async def _refresh_hotel_rating(self, hotel_id: str):
+        """average_rating / total_reviews of the hotel from its remaining reviews, as the review endpoints store them"""
+        summary = await self.db.reviews.aggregate([
+            {"$match": {"hotel_id": hotel_id}},
+            {"$group": {"_id": None, "average": {"$avg": "$overall_rating"}, "count": {"$sum": 1}}}
+        ]).to_list(length=1)
+        count = summary[0]["count"] if summary else 0
+        average = round(summary[0]["average"], 1) if count else 0.0
+        await self.db.hotels.update_one({"id": hotel_id}, {"$set": {"average_rating": average, "total_reviews": count}})
+        for callback in self._listeners:
+            callback(hotel_id)
+
+    async def purge_room(self, room_id: str, job_id: str) -> dict:
+        room = await self.db.conference_rooms.find_one({"id": room_id}, {"_id": 0, "hotel_id": 1})
+        dependents = [
+            (self.db.bookings, {"room_id": room_id}),
+            (self.db.reviews, {"room_id": room_id}),
+            (self.db.advertisements, {"target_id": room_id}),
+            (self.db.conference_rooms, {"id": room_id}),
+        ]
+        deleted = await self._purge(job_id, dependents, [], [room_id])
+        if room and deleted["reviews"]:
+            await self._refresh_hotel_rating(room["hotel_id"])
+        logger.info(f"Purged room {room_id}: {deleted}")
+        return deleted
+
+    async def purge_hotel(self, hotel_id: str, job_id: str) -> dict:
+        rooms = await self.db.conference_rooms.find({"hotel_id": hotel_id}, {"_id": 0, "id": 1}).to_list(length=None)
+        room_ids = [room["id"] for room in rooms]
+        dependents = [
+            (self.db.bookings, {"room_id": {"$in": room_ids}}),
+            (self.db.reviews, {"hotel_id": hotel_id}),
+            (self.db.extra_services, {"hotel_id": hotel_id}),
+            (self.db.advertisements, {"target_id": {"$in": [hotel_id] + room_ids}}),
+            (self.db.conference_rooms, {"hotel_id": hotel_id}),
+            (self.db.hotels, {"id": hotel_id}),
+        ]
+        deleted = await self._purge(job_id, dependents, [hotel_id], room_ids)
+        logger.info(f"Purged hotel {hotel_id}: {deleted}")
+        return deleted
+
+
+# Global cascade deleter instance
+cascade_deleter = CascadeDeleter()
@@ -0,0 +1,269 @@
+import asyncio
+import logging
+from typing import Iterable, List, Optional
+
+import numpy as np
+
+from feature_index import feature_index, mask_words, WORD_BITS
+
+logger = logging.getLogger(__name__)
+
+VISIBLE_HOTELS = {"is_active": True, "approval_status": "approved", "deleted_at": None}
+SEARCHABLE_ROOMS = {"approval_status": "approved", "is_available": True, "deleted_at": None}
+HOTEL_PROJECTION = {"_id": 0, "id": 1}
+SORT_ORDERS = ("price", "-price", "capacity", "-capacity", "rating")
+# Stored room fields the columns are built from, read whatever the display fields are
+COLUMN_FIELDS = (
+    "id", "hotel_id", "capacity", "price_per_day", "currency", "average_rating", "created_at", "features", "layout_options"
+)
+
+
+def record_type(fields: Iterable[str]) -> type:
+    """Slotted record class holding a room's display fields (no per-instance __dict__)"""
+    return type("RoomRecord", (), {"__slots__": tuple(fields)})
+
+
+class CatalogSnapshot:
+    """Columnar copy of the approved room inventory for GET /api/rooms.
+
+    Every searchable room (approved, available, not deleted) owns a row of
+    parallel numpy columns: capacity, price_per_day, currency code, rating,
+    hotel index, created_at and its feature words (see feature_index). A
+    filter is a handful of vectorized comparisons over the columns, sorting is
+    an argsort of the surviving rows, and only the requested page is turned
+    back into dicts from the slotted display records kept beside the columns.
+
+    Hotels only contribute a visibility flag per hotel index, so approving,
+    rejecting or deleting a hotel flips one bool instead of touching its rooms.
+
+    Built at startup and kept current like the other in-memory indexes: rooms
+    and hotels are marked dirty on writes (fanned out to other workers) and
+    only those are reloaded before the next query. Rows of dropped rooms are
+    reused and the columns double when full.
+    """
+
+    def __init__(self, initial_rows: int = 1024, initial_hotels: int = 256):
+        self.db = None
+        self.ready = False
+        self._fields = ()
+        self._record = None
+        self._projection = {}
+        self._capacity = np.zeros(initial_rows, dtype=np.int32)
+        self._price = np.zeros(initial_rows, dtype=np.float64)
+        self._currency = np.zeros(initial_rows, dtype=np.int8)
+        self._rating = np.zeros(initial_rows, dtype=np.float32)
+        self._hotel = np.zeros(initial_rows, dtype=np.int32)
+        self._created = np.zeros(initial_rows, dtype=np.float64)
+        self._features = np.zeros((initial_rows, 1), dtype=np.uint64)
+        self._live = np.zeros(initial_rows, dtype=bool)
+        self._records = [None] * initial_rows
+        self._rows = {}  # room id -> row
+        self._free = list(range(initial_rows - 1, -1, -1))
+        self._hotel_live = np.zeros(initial_hotels, dtype=bool)
+        self._hotel_index = {}  # hotel id -> hotel index
+        self._currencies = {}  # currency code -> small int stored in _currency
+        self._dirty_hotels = set()
+        self._dirty_rooms = set()
+        self._lock = asyncio.Lock()
+        self._listeners = []
+
+    def init(self, db, fields: Iterable[str]):
+        """fields are the stored room fields a search result returns"""
+        self.db = db
+        self._fields = tuple(fields)
+        self._record = record_type(self._fields)
+        self._projection = {"_id": 0, **{name: 1 for name in COLUMN_FIELDS + self._fields}}
+
+    def add_listener(self, callback):
+        """Called with (kind, ids) for every local mark_dirty (used to fan out to other workers)"""
+        self._listeners.append(callback)
+
+    def mark_dirty(self, kind: str, *ids: str, broadcast: bool = True):
+        """kind is "hotel" or "room"; they are reloaded before the next query"""
+        (self._dirty_hotels if kind == "hotel" else self._dirty_rooms).update(ids)
+        if broadcast:
+            for callback in self._listeners:
+                callback(kind, list(ids))
+
+    # Maintenance
+
+    def _grow(self):
+        rows = len(self._records)
+        self._capacity = np.concatenate([self._capacity, np.zeros_like(self._capacity)])
+        self._price = np.concatenate([self._price, np.zeros_like(self._price)])
+        self._currency = np.concatenate([self._currency, np.zeros_like(self._currency)])
+        self._rating = np.concatenate([self._rating, np.zeros_like(self._rating)])
+        self._hotel = np.concatenate([self._hotel, np.zeros_like(self._hotel)])
+        self._created = np.concatenate([self._created, np.zeros_like(self._created)])
+        self._features = np.vstack([self._features, np.zeros_like(self._features)])
+        self._live = np.concatenate([self._live, np.zeros_like(self._live)])
+        self._records.extend([None] * rows)
+        self._free = list(range(2 * rows - 1, rows - 1, -1))
+
+    def _hotel_slot(self, hotel_id: str) -> int:
+        index = self._hotel_index.get(hotel_id)
+        if index is None:
+            index = self._hotel_index[hotel_id] = len(self._hotel_index)
+            if index >= len(self._hotel_live):
+                self._hotel_live = np.concatenate([self._hotel_live, np.zeros_like(self._hotel_live)])
+        return index
+
+    def _currency_code(self, currency: str) -> int:
+        code = self._currencies.get(currency)
+        if code is None:
+            code = self._currencies[currency] = len(self._currencies)
+        return code
+
+    def _put_room(self, room: dict, mask: int):
+        row = self._rows.get(room["id"])
+        if row is None:
+            if not self._free:
+                self._grow()
+            row = self._rows[room["id"]] = self._free.pop()
+        words = max(1, -(-mask.bit_length() // WORD_BITS))
+        if words > self._features.shape[1]:
+            grown = np.zeros((self._features.shape[0], words), dtype=np.uint64)
+            grown[:, :self._features.shape[1]] = self._features
+            self._features = grown
+
+        self._capacity[row] = room.get("capacity") or 0
+        self._price[row] = room.get("price_per_day") or 0.0
+        self._currency[row] = self._currency_code(room.get("currency") or "EUR")
+        self._rating[row] = room.get("average_rating") or 0.0
+        self._hotel[row] = self._hotel_slot(room["hotel_id"])
+        created_at = room.get("created_at")
+        self._created[row] = created_at.timestamp() if created_at else 0.0
+        self._features[row] = mask_words(mask, self._features.shape[1])
+        self._live[row] = True
+
+        record = self._record()
+        for name in self._fields:
+            if name in room:
+                setattr(record, name, room[name])
+        self._records[row] = record
+
+    def _drop_room(self, room_id: str):
+        row = self._rows.pop(room_id, None)
+        if row is None:
+            return
+        self._live[row] = False
+        self._features[row] = 0
+        self._records[row] = None
+        self._free.append(row)
+
+    async def _load_rooms(self, query: dict) -> set:
+        found = set()
+        async for room in self.db.conference_rooms.find({**query, **SEARCHABLE_ROOMS}, self._projection):
+            mask = await feature_index.encode(room.get("features"), room.get("layout_options"))
+            self._put_room(room, mask)
+            found.add(room["id"])
+        return found
+
+    async def _load_hotels(self, hotel_ids: List[str]):
+        visible = set()
+        async for hotel in self.db.hotels.find({"id": {"$in": hotel_ids}, **VISIBLE_HOTELS}, HOTEL_PROJECTION):
+            visible.add(hotel["id"])
+        for hotel_id in hotel_ids:
+            self._hotel_live[self._hotel_slot(hotel_id)] = hotel_id in visible
+
+    async def rebuild(self):
+        """Load every visible hotel and searchable room (startup)"""
+        async with self._lock:
+            self._dirty_hotels.clear()
+            self._dirty_rooms.clear()
+            for room_id in list(self._rows):
+                self._drop_room(room_id)
+            self._hotel_live[:] = False
+            async for hotel in self.db.hotels.find(VISIBLE_HOTELS, HOTEL_PROJECTION):
+                self._hotel_live[self._hotel_slot(hotel["id"])] = True
+            await self._load_rooms({})
+            self.ready = True
+        logger.info(f"Catalog snapshot built: {len(self._rows)} rooms, {int(self._hotel_live.sum())} hotels")
+
+    async def sync(self):
+        """Reload the hotels and rooms marked dirty since the last query"""
+        if not self._dirty_hotels and not self._dirty_rooms:
+            return
+        async with self._lock:
+            hotel_ids, self._dirty_hotels = list(self._dirty_hotels), set()
+            room_ids, self._dirty_rooms = list(self._dirty_rooms), set()
+            try:
+                if hotel_ids:
+                    await self._load_hotels(hotel_ids)
+                if room_ids:
+                    found = await self._load_rooms({"id": {"$in": room_ids}})
+                    for room_id in room_ids:
+                        if room_id not in found:
+                            self._drop_room(room_id)
+            except Exception:
+                # Retry them on the next query
+                self._dirty_hotels.update(hotel_ids)
+                self._dirty_rooms.update(room_ids)
+                raise
+
+    # Queries
+
+    def search(
+        self,
+        hotel_ids: Optional[Iterable[str]] = None,
+        min_capacity: Optional[int] = None,
+        max_price: Optional[float] = None,
+        required_mask: int = 0,
+        sort: Optional[str] = None,
+        rates: Optional[dict] = None
+    ) -> np.ndarray:
+        """Rows of visible rooms matching every filter, in sort order (oldest first by default).
+
+        max_price compares the stored price_per_day as is; "price" sorts on the
+        price converted with rates (currency -> rate to the display currency).
+        """
+        matches = self._live & self._hotel_live[self._hotel]
+        if hotel_ids is not None:
+            indexes = [self._hotel_index[hotel_id] for hotel_id in hotel_ids if hotel_id in self._hotel_index]
+            matches &= np.isin(self._hotel, indexes)
+        if min_capacity:
+            matches &= self._capacity >= min_capacity
+        if max_price:
+            matches &= self._price <= max_price
+        if required_mask:
+            if required_mask.bit_length() > self._features.shape[1] * WORD_BITS:
+                return np.zeros(0, dtype=np.intp)  # a bit no room has yet
+            required = mask_words(required_mask, self._features.shape[1])
+            matches &= ((self._features & required) == required).all(axis=1)
+        rows = np.flatnonzero(matches)
+
+        if not sort:
+            return rows[np.argsort(self._created[rows], kind="stable")]
+        if sort in ("price", "-price"):
+            by_code = np.ones(max(1, len(self._currencies)))
+            for currency, code in self._currencies.items():
+                by_code[code] = (rates or {}).get(currency, 1.0)
+            key = self._price[rows] * by_code[self._currency[rows]]
+        elif sort in ("capacity", "-capacity"):
+            key = self._capacity[rows]
+        else:
+            key = -self._rating[rows]
+        if sort.startswith("-"):
+            key = -key
+        # Ties keep the default (oldest first) order
+        return rows[np.lexsort((self._created[rows], key))]
+
+    def page(self, rows: np.ndarray, skip: int, limit: int, fields: Optional[Iterable[str]] = None) -> List[dict]:
+        """Room dicts for rows[skip:skip + limit] (only fields of them, if given), the only rows ever hydrated.
+
+        skip and limit must not be negative (callers clamp them).
+        """
+        fields = self._fields if fields is None else [name for name in fields if name in self._fields]
+        documents = []
+        for row in rows[skip:skip + limit]:
+            record = self._records[row]
+            documents.append({name: getattr(record, name) for name in fields if hasattr(record, name)})
+        return documents
+
+    @property
+    def size(self) -> int:
+        return len(self._rows)
+
+
+# Global catalog snapshot instance
+catalog_snapshot = CatalogSnapshot()
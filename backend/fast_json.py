@@ -0,0 +1,71 @@
+from typing import Iterable, List, Optional
+
+import orjson
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+# response model -> [(name, FieldInfo)] of the fields that have a default
+_optional_fields = {}
+
+
+def _default(obj):
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content) -> bytes:
+    """orjson encoding that also accepts pydantic models.
+
+    Not byte-identical to json.dumps/JSONResponse output, see response_cache.render_json.
+    """
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def sparse_fields(model, fields: Optional[str]) -> Optional[List[str]]:
+    """Model fields named in a ?fields=a,b,c parameter (in model order, always with id), None for all.
+
+    Raises ValueError naming the first field the model does not declare.
+    """
+    if not fields:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    for name in requested:
+        if name not in model.model_fields:
+            raise ValueError(name)
+    if "id" in model.model_fields:
+        requested.add("id")
+    return [name for name in model.model_fields if name in requested]
+
+
+def projection_for(model, fields: Optional[Iterable[str]] = None) -> dict:
+    """Mongo projection returning only the fields the response model declares (or just fields of it)"""
+    projection = {name: 1 for name in (model.model_fields if fields is None else fields)}
+    projection["_id"] = 0
+    return projection
+
+
+def trusted_documents(model, documents: list, fields: Optional[List[str]] = None) -> list:
+    """Shape documents read with projection_for(model) like model, without validating them.
+
+    Only for documents this app wrote itself from the matching pydantic model:
+    missing optional fields get the model default, nothing else is checked.
+    With fields (see sparse_fields) the documents are trimmed to those fields.
+    """
+    optional = _optional_fields.get(model)
+    if optional is None:
+        optional = [(name, field) for name, field in model.model_fields.items() if not field.is_required()]
+        _optional_fields[model] = optional
+
+    for document in documents:
+        for name, field in optional:
+            if name not in document:
+                document[name] = field.get_default(call_default_factory=True)
+    if fields is not None:
+        return [{name: document.get(name) for name in fields} for document in documents]
+    return documents
+
+
+def trusted_response(model, documents: list, fields: Optional[List[str]] = None) -> ORJSONResponse:
+    """List endpoint response that skips response_model re-validation"""
+    return ORJSONResponse(trusted_documents(model, documents, fields))
@@ -0,0 +1,222 @@
+import asyncio
+import logging
+from typing import Iterable, List, Optional
+
+import numpy as np
+from bson import Binary
+from pymongo import UpdateOne
+
+logger = logging.getLogger(__name__)
+
+VOCABULARY_ID = "room_features"
+LIVE_ROOMS = {"deleted_at": None}
+ROOM_PROJECTION = {"_id": 0, "id": 1, "features": 1, "layout_options": 1, "feature_mask": 1}
+WORD_BITS = 64
+
+
+def feature_keys(features: Iterable[str] = (), layouts: Iterable[str] = ()) -> List[str]:
+    """Vocabulary keys of a room's features and layout options (one namespace, two prefixes)"""
+    keys = [f"feature:{value.strip().lower()}" for value in features or () if value and value.strip()]
+    keys += [f"layout:{value.strip().lower()}" for value in layouts or () if value and value.strip()]
+    return list(dict.fromkeys(keys))
+
+
+def to_binary(mask: int) -> Binary:
+    """Stored form of a mask: little-endian bytes, so bit n is what $bitsAllSet calls position n"""
+    return Binary(mask.to_bytes(max(1, (mask.bit_length() + 7) // 8), "little"))
+
+
+def mask_words(mask: int, words: int) -> np.ndarray:
+    """mask as `words` little-endian uint64 words (a row of a mask matrix)"""
+    return np.array([(mask >> (WORD_BITS * word)) & (2 ** WORD_BITS - 1) for word in range(words)], dtype=np.uint64)
+
+
+def bit_positions(mask: int) -> List[int]:
+    return [position for position in range(mask.bit_length()) if mask >> position & 1]
+
+
+class FeatureIndex:
+    """Room features and layout options as bitmasks, for "has all of" filters.
+
+    Every distinct feature / layout value gets a bit; the assignment is the
+    order of the keys array of one vocabulary document in Mongo, appended to
+    atomically, so every worker derives the same bits. Each room stores its
+    mask as feature_mask (BinData, usable with $bitsAllSet), and the index
+    mirrors all live rooms' masks in a numpy uint64 matrix so a filter is one
+    vectorized AND over the whole catalog.
+
+    Like the other in-memory indexes it is built at startup (backfilling
+    feature_mask on rooms that lack it) and rooms are reloaded after
+    mark_dirty; new rooms are added directly and announced to other workers.
+    """
+
+    def __init__(self, initial_rows: int = 1024):
+        self.db = None
+        self._bits = {}  # vocabulary key -> bit
+        self._masks = np.zeros((initial_rows, 1), dtype=np.uint64)
+        self._live = np.zeros(initial_rows, dtype=bool)
+        self._ids = [None] * initial_rows
+        self._rows = {}  # room id -> row
+        self._free = list(range(initial_rows - 1, -1, -1))
+        self._dirty = set()
+        self._lock = asyncio.Lock()
+        self._listeners = []
+
+    def init(self, db):
+        self.db = db
+
+    def add_listener(self, callback):
+        """Called with the room ids of every local add / mark_dirty (used to fan out to other workers)"""
+        self._listeners.append(callback)
+
+    def _notify(self, room_ids: List[str]):
+        for callback in self._listeners:
+            callback(room_ids)
+
+    # Vocabulary
+
+    async def load_vocabulary(self):
+        vocabulary = await self.db.feature_vocabulary.find_one({"_id": VOCABULARY_ID})
+        keys = vocabulary["keys"] if vocabulary else []
+        self._bits = {key: bit for bit, key in enumerate(keys)}
+        self._ensure_words(len(keys))
+
+    async def _register(self, keys: List[str]):
+        await self.db.feature_vocabulary.update_one(
+            {"_id": VOCABULARY_ID}, {"$setOnInsert": {"keys": []}}, upsert=True
+        )
+        for key in keys:
+            # No-op if another worker appended it first
+            await self.db.feature_vocabulary.update_one(
+                {"_id": VOCABULARY_ID, "keys": {"$ne": key}}, {"$push": {"keys": key}}
+            )
+        await self.load_vocabulary()
+
+    async def encode(self, features: Iterable[str] = (), layouts: Iterable[str] = ()) -> int:
+        """Mask of a room, registering values not seen before"""
+        keys = feature_keys(features, layouts)
+        if any(key not in self._bits for key in keys):
+            await self.load_vocabulary()
+            missing = [key for key in keys if key not in self._bits]
+            if missing:
+                await self._register(missing)
+        mask = 0
+        for key in keys:
+            mask |= 1 << self._bits[key]
+        return mask
+
+    def mask_of(self, features: Iterable[str] = (), layouts: Iterable[str] = ()) -> Optional[int]:
+        """Mask of a filter, None if a value is on no room at all"""
+        mask = 0
+        for key in feature_keys(features, layouts):
+            bit = self._bits.get(key)
+            if bit is None:
+                return None
+            mask |= 1 << bit
+        return mask
+
+    # Mirror
+
+    def _ensure_words(self, bits: int):
+        words = max(1, -(-bits // WORD_BITS))
+        if words > self._masks.shape[1]:
+            grown = np.zeros((self._masks.shape[0], words), dtype=np.uint64)
+            grown[:, :self._masks.shape[1]] = self._masks
+            self._masks = grown
+
+    def _words(self, mask: int) -> np.ndarray:
+        return mask_words(mask, self._masks.shape[1])
+
+    def _put(self, room_id: str, mask: int):
+        self._ensure_words(mask.bit_length())
+        row = self._rows.get(room_id)
+        if row is None:
+            if not self._free:
+                rows = self._masks.shape[0]
+                self._masks = np.vstack([self._masks, np.zeros_like(self._masks)])
+                self._live = np.concatenate([self._live, np.zeros(rows, dtype=bool)])
+                self._ids.extend([None] * rows)
+                self._free = list(range(2 * rows - 1, rows - 1, -1))
+            row = self._free.pop()
+            self._rows[room_id] = row
+            self._ids[row] = room_id
+            self._live[row] = True
+        self._masks[row] = self._words(mask)
+
+    def _drop(self, room_id: str):
+        row = self._rows.pop(room_id, None)
+        if row is None:
+            return
+        self._masks[row] = 0
+        self._live[row] = False
+        self._ids[row] = None
+        self._free.append(row)
+
+    def add(self, room_id: str, mask: int):
+        """A room created by this worker"""
+        self._put(room_id, mask)
+        self._notify([room_id])
+
+    def mark_dirty(self, *room_ids: str, broadcast: bool = True):
+        self._dirty.update(room_ids)
+        if broadcast:
+            self._notify(list(room_ids))
+
+    async def _load(self, query: dict) -> tuple:
+        """Mirror the matching rooms; returns (feature_mask writes for rooms whose stored mask is missing or stale, ids found)"""
+        backfill = []
+        found = set()
+        async for room in self.db.conference_rooms.find({**query, **LIVE_ROOMS}, ROOM_PROJECTION):
+            mask = await self.encode(room.get("features"), room.get("layout_options"))
+            stored = room.get("feature_mask")
+            if stored is None or int.from_bytes(bytes(stored), "little") != mask:
+                backfill.append(UpdateOne({"id": room["id"]}, {"$set": {"feature_mask": to_binary(mask)}}))
+            self._put(room["id"], mask)
+            found.add(room["id"])
+        return backfill, found
+
+    async def rebuild(self):
+        async with self._lock:
+            self._dirty.clear()
+            for room_id in list(self._rows):
+                self._drop(room_id)
+            await self.load_vocabulary()
+            backfill, _ = await self._load({})
+            if backfill:
+                await self.db.conference_rooms.bulk_write(backfill, ordered=False)
+        logger.info(
+            f"Feature index built: {len(self._rows)} rooms, {len(self._bits)} values"
+            + (f", feature_mask backfilled on {len(backfill)} rooms" if backfill else "")
+        )
+
+    async def sync(self):
+        """Reload the rooms marked dirty since the last query"""
+        if not self._dirty:
+            return
+        async with self._lock:
+            room_ids, self._dirty = list(self._dirty), set()
+            try:
+                backfill, found = await self._load({"id": {"$in": room_ids}})
+            except Exception:
+                # Retry them on the next query
+                self._dirty.update(room_ids)
+                raise
+            for room_id in room_ids:
+                if room_id not in found:
+                    self._drop(room_id)
+            if backfill:
+                await self.db.conference_rooms.bulk_write(backfill, ordered=False)
+
+    def matching(self, mask: int) -> List[str]:
+        """Ids of live rooms that have every bit of mask"""
+        required = self._words(mask)
+        hits = np.flatnonzero(self._live & ((self._masks & required) == required).all(axis=1))
+        return [self._ids[row] for row in hits]
+
+    @property
+    def size(self) -> int:
+        return len(self._rows)
+
+
+# Global feature index instance
+feature_index = FeatureIndex()
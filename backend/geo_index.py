@@ -0,0 +1,198 @@
+import asyncio
+import heapq
+import logging
+import math
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = 111.32
+CELL_DEGREES = 0.1  # grid cell edge, about 11 km of latitude
+CLUSTER_CELLS_PER_TILE = 4  # clusters are a quarter of a map tile wide
+
+MAPPABLE_HOTELS = {
+    "is_active": True, "approval_status": "approved", "deleted_at": None,
+    "latitude": {"$ne": None}, "longitude": {"$ne": None}
+}
+HOTEL_PROJECTION = {
+    "_id": 0, "id": 1, "name": 1, "city": 1, "star_rating": 1, "average_rating": 1,
+    "images": {"$slice": 1}, "latitude": 1, "longitude": 1
+}
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def _cell(lat: float, lng: float, size: float = CELL_DEGREES) -> tuple:
+    return math.floor(lat / size), math.floor(lng / size)
+
+
+def _wrap_lng(lng: float) -> float:
+    """Longitude in [-180, 180), so 180 and -180 are the same meridian"""
+    return (lng + 180.0) % 360.0 - 180.0
+
+
+class GeoIndex:
+    """In-memory grid of approved hotels with coordinates for the map endpoints.
+
+    Hotels are bucketed into CELL_DEGREES x CELL_DEGREES cells; a radius or
+    bounding-box query only visits the cells the area overlaps (or the
+    occupied cells, when there are fewer of those), then filters by exact
+    distance or bounds.
+
+    Kept current like the search index: built at startup, hotels are marked
+    dirty on writes (fanned out to other workers) and reloaded before the
+    next query.
+    """
+
+    def __init__(self):
+        self.db = None
+        self._hotels = {}  # hotel_id -> summary dict (with latitude/longitude)
+        self._grid = {}  # cell -> hotel ids
+        self._dirty = set()
+        self._lock = asyncio.Lock()
+        self._listeners = []
+
+    def init(self, db):
+        self.db = db
+
+    def add_listener(self, callback):
+        """Called with the hotel ids of every local mark_dirty (used to fan out to other workers)"""
+        self._listeners.append(callback)
+
+    def mark_dirty(self, *hotel_ids: str, broadcast: bool = True):
+        self._dirty.update(hotel_ids)
+        if broadcast:
+            for callback in self._listeners:
+                callback(list(hotel_ids))
+
+    def _put(self, hotel: dict):
+        self._drop(hotel["id"])
+        images = hotel.pop("images", None)
+        hotel["image"] = images[0] if images else None
+        self._hotels[hotel["id"]] = hotel
+        self._grid.setdefault(_cell(hotel["latitude"], hotel["longitude"]), set()).add(hotel["id"])
+
+    def _drop(self, hotel_id: str):
+        hotel = self._hotels.pop(hotel_id, None)
+        if hotel is None:
+            return
+        cell = _cell(hotel["latitude"], hotel["longitude"])
+        ids = self._grid[cell]
+        ids.discard(hotel_id)
+        if not ids:
+            del self._grid[cell]
+
+    async def rebuild(self):
+        async with self._lock:
+            self._dirty.clear()
+            self._hotels, self._grid = {}, {}
+            async for hotel in self.db.hotels.find(MAPPABLE_HOTELS, HOTEL_PROJECTION):
+                self._put(hotel)
+        logger.info(f"Geo index built: {len(self._hotels)} hotels in {len(self._grid)} cells")
+
+    async def sync(self):
+        """Reload the hotels marked dirty since the last query"""
+        if not self._dirty:
+            return
+        async with self._lock:
+            hotel_ids, self._dirty = list(self._dirty), set()
+            try:
+                found = set()
+                async for hotel in self.db.hotels.find({"id": {"$in": hotel_ids}, **MAPPABLE_HOTELS}, HOTEL_PROJECTION):
+                    self._put(hotel)
+                    found.add(hotel["id"])
+            except Exception:
+                # Retry them on the next query
+                self._dirty.update(hotel_ids)
+                raise
+            for hotel_id in hotel_ids:
+                if hotel_id not in found:
+                    self._drop(hotel_id)
+
+    def _in_box(self, south: float, west: float, north: float, east: float):
+        """Hotels inside a box that does not cross the antimeridian"""
+        (low_row, low_col), (high_row, high_col) = _cell(south, west), _cell(north, east)
+        if (high_row - low_row + 1) * (high_col - low_col + 1) > len(self._grid):
+            cells = [cell for cell in self._grid if low_row <= cell[0] <= high_row and low_col <= cell[1] <= high_col]
+        else:
+            cells = [(row, col) for row in range(low_row, high_row + 1) for col in range(low_col, high_col + 1)]
+        for cell in cells:
+            for hotel_id in self._grid.get(cell, ()):
+                hotel = self._hotels[hotel_id]
+                if south <= hotel["latitude"] <= north and west <= hotel["longitude"] <= east:
+                    yield hotel
+
+    def in_bounds(self, south: float, west: float, north: float, east: float):
+        if west <= east:
+            yield from self._in_box(south, west, north, east)
+        else:
+            yield from self._in_box(south, west, north, 180.0)
+            yield from self._in_box(south, -180.0, north, east)
+
+    def nearby(self, lat: float, lng: float, radius_km: float, limit: int) -> List[dict]:
+        """Hotels within radius_km of (lat, lng), nearest first, with distance_km"""
+        lat_span = radius_km / KM_PER_DEGREE
+        cos_lat = math.cos(math.radians(lat))
+        lng_span = 180.0 if cos_lat < 1e-6 else min(180.0, radius_km / (KM_PER_DEGREE * cos_lat))
+        south, north = max(-90.0, lat - lat_span), min(90.0, lat + lat_span)
+        if lng_span >= 180.0:
+            candidates = self._in_box(south, -180.0, north, 180.0)
+        else:
+            west, east = lng - lng_span, lng + lng_span
+            west = west + 360.0 if west < -180.0 else west
+            east = east - 360.0 if east > 180.0 else east
+            candidates = self.in_bounds(south, west, north, east)
+
+        within = []
+        for hotel in candidates:
+            distance = haversine_km(lat, lng, hotel["latitude"], hotel["longitude"])
+            if distance <= radius_km:
+                within.append((distance, hotel["id"], hotel))
+        return [
+            dict(hotel, distance_km=round(distance, 3))
+            for distance, _, hotel in heapq.nsmallest(limit, within)
+        ]
+
+    def clustered(self, hotels: List[dict], zoom: int):
+        """(single hotels, clusters) grouped on a grid a quarter map tile wide at zoom.
+
+        Longitude 180 shares the cells of -180, and longitudes are averaged as
+        offsets from the cluster's first hotel, so a cluster on the antimeridian
+        is centered there (and has west > east) rather than on the opposite
+        side of the globe.
+        """
+        size = 360.0 / (2 ** zoom) / CLUSTER_CELLS_PER_TILE
+        groups = {}
+        for hotel in hotels:
+            groups.setdefault(_cell(hotel["latitude"], _wrap_lng(hotel["longitude"]), size), []).append(hotel)
+        singles, clusters = [], []
+        for members in groups.values():
+            if len(members) == 1:
+                singles.append(members[0])
+                continue
+            latitudes = [hotel["latitude"] for hotel in members]
+            origin = members[0]["longitude"]
+            offsets = [(_wrap_lng(hotel["longitude"] - origin), hotel["longitude"]) for hotel in members]
+            longitude = origin + sum(offset for offset, _ in offsets) / len(members)
+            clusters.append({
+                "latitude": sum(latitudes) / len(members),
+                "longitude": longitude if -180.0 <= longitude <= 180.0 else _wrap_lng(longitude),
+                "count": len(members),
+                "south": min(latitudes), "west": min(offsets)[1],
+                "north": max(latitudes), "east": max(offsets)[1]
+            })
+        clusters.sort(key=lambda cluster: -cluster["count"])
+        return singles, clusters
+
+    @property
+    def size(self) -> int:
+        return len(self._hotels)
+
+
+# Global geo index instance
+geo_index = GeoIndex()
@@ -0,0 +1,103 @@
+import asyncio
+import logging
+import uuid
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+
+class JobTracker:
+    """Runs long admin operations in the background and records their progress.
+
+    Progress lives in the `jobs` collection so any worker can answer a status
+    request: {id, type, status, total, processed, result, error, ...}.
+    """
+
+    def __init__(self):
+        self.db = None
+        self._tasks = set()
+
+    def init(self, db):
+        self.db = db
+
+    async def create(self, job_type: str, total: int = 0, meta: dict = None, requested_by: str = None) -> dict:
+        job = {
+            "id": str(uuid.uuid4()),
+            "type": job_type,
+            "requested_by": requested_by,
+            "status": "running",
+            "total": total,
+            "processed": 0,
+            "meta": meta or {},
+            "result": None,
+            "error": None,
+            "created_at": datetime.utcnow(),
+            "updated_at": datetime.utcnow()
+        }
+        await self.db.jobs.insert_one(job)
+        job.pop("_id", None)
+        return job
+
+    async def progress(self, job_id: str, processed: int = 0, total: int = None, **fields):
+        update = {"$set": {"updated_at": datetime.utcnow(), **fields}}
+        if processed:
+            update["$inc"] = {"processed": processed}
+        if total is not None:
+            update["$set"]["total"] = total
+        await self.db.jobs.update_one({"id": job_id}, update)
+
+    async def finish(self, job_id: str, result: dict = None):
+        await self.db.jobs.update_one(
+            {"id": job_id},
+            {"$set": {"status": "completed", "result": result, "updated_at": datetime.utcnow()}}
+        )
+
+    async def fail(self, job_id: str, error: str):
+        await self.db.jobs.update_one(
+            {"id": job_id},
+            {"$set": {"status": "failed", "error": error, "updated_at": datetime.utcnow()}}
+        )
+
+    async def get(self, job_id: str):
+        return await self.db.jobs.find_one({"id": job_id}, {"_id": 0})
+
+    def run(self, job_id: str, coro):
+        """Run coro in the background, marking the job completed or failed"""
+        async def runner():
+            try:
+                result = await coro
+                await self.finish(job_id, result)
+            except asyncio.CancelledError:
+                await self.db.jobs.update_one(
+                    {"id": job_id},
+                    {"$set": {"status": "interrupted", "updated_at": datetime.utcnow()}}
+                )
+                raise
+            except Exception as e:
+                logger.error(f"Job {job_id} failed: {e}")
+                await self.fail(job_id, str(e))
+
+        task = asyncio.create_task(runner())
+        # Keep a reference so the task is not garbage collected mid-run
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def drain(self, timeout: float):
+        """Wait up to timeout seconds for running jobs, then cancel the rest.
+
+        Cancelled jobs are marked "interrupted", resumable ones (cascade
+        purges) are picked up again on the next startup.
+        """
+        if not self._tasks:
+            return
+        done, pending = await asyncio.wait(set(self._tasks), timeout=timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            logger.warning(f"Cancelled {len(pending)} background job(s) still running at shutdown")
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+# Global job tracker instance
+job_tracker = JobTracker()
@@ -0,0 +1,311 @@
+import contextvars
+import threading
+import time
+from collections import defaultdict
+
+from pymongo import monitoring
+
+# Latency buckets in seconds, Prometheus style (+Inf is implicit)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+POOL_WAIT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.total += 1
+        self.sum += value
+
+
+class RequestStats:
+    """Mongo work attributed to one HTTP request"""
+    __slots__ = ("queries", "duration", "docs")
+
+    def __init__(self):
+        self.queries = 0
+        self.duration = 0.0
+        self.docs = 0
+
+
+# Set by the middleware, read by the Mongo listener (Motor copies the context to its executor threads)
+current_request_stats = contextvars.ContextVar("current_request_stats", default=None)
+
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{key}="{str(value)}"' for key, value in labels.items())
+    return "{" + pairs + "}"
+
+
+class MetricsRegistry:
+    """Process-local request and Mongo metrics rendered in Prometheus text format"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.requests = defaultdict(int)  # (method, route, status) -> count
+        self.latency = {}  # (method, route) -> Histogram
+        self.mongo_queries = {}  # route -> Histogram of queries per request
+        self.mongo_duration = defaultdict(float)  # route -> seconds
+        self.mongo_docs = defaultdict(int)  # route -> documents returned/affected
+        self.mongo_command_latency = {}  # command name -> Histogram
+        self.mongo_failures = defaultdict(int)  # command name -> count
+        self.spans = {}  # span name -> Histogram, for hot helpers such as get_current_user
+        self.pool_max_size = None
+        self.pool_connections = 0  # open connections across all servers
+        self.pool_checked_out = 0
+        self.pool_wait = Histogram(POOL_WAIT_BUCKETS)
+        self.pool_checkout_failures = defaultdict(int)  # reason -> count
+        self.pool_clears = 0
+
+    def observe_request(self, method: str, route: str, status_code: int, duration: float, stats: RequestStats):
+        with self._lock:
+            self.requests[(method, route, status_code)] += 1
+            self.latency.setdefault((method, route), Histogram(LATENCY_BUCKETS)).observe(duration)
+            self.mongo_queries.setdefault(route, Histogram(QUERY_COUNT_BUCKETS)).observe(stats.queries)
+            self.mongo_duration[route] += stats.duration
+            self.mongo_docs[route] += stats.docs
+
+    def observe_command(self, command: str, duration: float, failed: bool = False):
+        with self._lock:
+            self.mongo_command_latency.setdefault(command, Histogram(LATENCY_BUCKETS)).observe(duration)
+            if failed:
+                self.mongo_failures[command] += 1
+
+    def observe_span(self, name: str, duration: float):
+        with self._lock:
+            self.spans.setdefault(name, Histogram(LATENCY_BUCKETS)).observe(duration)
+
+    def observe_pool(self, connections: int = 0, checked_out: int = 0, wait: float = None, failure: str = None, cleared: bool = False):
+        with self._lock:
+            self.pool_connections += connections
+            self.pool_checked_out += checked_out
+            if wait is not None:
+                self.pool_wait.observe(wait)
+            if failure:
+                self.pool_checkout_failures[failure] += 1
+            if cleared:
+                self.pool_clears += 1
+
+    def _render_histogram(self, lines, name, histogram, labels):
+        for bound, count in zip(histogram.buckets, histogram.counts):
+            lines.append(f"{name}_bucket{_format_labels({**labels, 'le': bound})} {count}")
+        lines.append(f"{name}_bucket{_format_labels({**labels, 'le': '+Inf'})} {histogram.total}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {histogram.sum}")
+        lines.append(f"{name}_count{_format_labels(labels)} {histogram.total}")
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            lines.append("# HELP http_requests_in_flight Requests currently being served")
+            lines.append("# TYPE http_requests_in_flight gauge")
+            lines.append(f"http_requests_in_flight {self.in_flight}")
+
+            lines.append("# HELP http_requests_total Requests by method, route and status code")
+            lines.append("# TYPE http_requests_total counter")
+            for (method, route, status_code), count in sorted(self.requests.items()):
+                lines.append(f"http_requests_total{_format_labels({'method': method, 'route': route, 'status': status_code})} {count}")
+
+            lines.append("# HELP http_request_duration_seconds Request latency by method and route")
+            lines.append("# TYPE http_request_duration_seconds histogram")
+            for (method, route), histogram in sorted(self.latency.items()):
+                self._render_histogram(lines, "http_request_duration_seconds", histogram, {"method": method, "route": route})
+
+            lines.append("# HELP mongo_queries_per_request Mongo commands issued per request by route")
+            lines.append("# TYPE mongo_queries_per_request histogram")
+            for route, histogram in sorted(self.mongo_queries.items()):
+                self._render_histogram(lines, "mongo_queries_per_request", histogram, {"route": route})
+
+            lines.append("# HELP mongo_request_duration_seconds_total Time spent in Mongo commands by route")
+            lines.append("# TYPE mongo_request_duration_seconds_total counter")
+            for route, seconds in sorted(self.mongo_duration.items()):
+                lines.append(f"mongo_request_duration_seconds_total{_format_labels({'route': route})} {seconds}")
+
+            lines.append("# HELP mongo_documents_total Documents returned or written by route")
+            lines.append("# TYPE mongo_documents_total counter")
+            for route, docs in sorted(self.mongo_docs.items()):
+                lines.append(f"mongo_documents_total{_format_labels({'route': route})} {docs}")
+
+            lines.append("# HELP mongo_command_duration_seconds Mongo command latency by command name")
+            lines.append("# TYPE mongo_command_duration_seconds histogram")
+            for command, histogram in sorted(self.mongo_command_latency.items()):
+                self._render_histogram(lines, "mongo_command_duration_seconds", histogram, {"command": command})
+
+            lines.append("# HELP mongo_command_failures_total Failed Mongo commands by command name")
+            lines.append("# TYPE mongo_command_failures_total counter")
+            for command, count in sorted(self.mongo_failures.items()):
+                lines.append(f"mongo_command_failures_total{_format_labels({'command': command})} {count}")
+
+            if self.pool_max_size is not None:
+                lines.append("# HELP mongo_pool_max_size Configured maxPoolSize per server")
+                lines.append("# TYPE mongo_pool_max_size gauge")
+                lines.append(f"mongo_pool_max_size {self.pool_max_size}")
+
+            lines.append("# HELP mongo_pool_connections Open Mongo connections in this worker")
+            lines.append("# TYPE mongo_pool_connections gauge")
+            lines.append(f"mongo_pool_connections {self.pool_connections}")
+
+            lines.append("# HELP mongo_pool_checked_out Connections currently checked out of the pool")
+            lines.append("# TYPE mongo_pool_checked_out gauge")
+            lines.append(f"mongo_pool_checked_out {self.pool_checked_out}")
+
+            lines.append("# HELP mongo_pool_checkout_wait_seconds Time spent waiting for a pooled connection")
+            lines.append("# TYPE mongo_pool_checkout_wait_seconds histogram")
+            self._render_histogram(lines, "mongo_pool_checkout_wait_seconds", self.pool_wait, {})
+
+            lines.append("# HELP mongo_pool_checkout_failures_total Failed connection checkouts by reason")
+            lines.append("# TYPE mongo_pool_checkout_failures_total counter")
+            for reason, count in sorted(self.pool_checkout_failures.items()):
+                lines.append(f"mongo_pool_checkout_failures_total{_format_labels({'reason': reason})} {count}")
+
+            lines.append("# HELP mongo_pool_clears_total Times a connection pool was cleared")
+            lines.append("# TYPE mongo_pool_clears_total counter")
+            lines.append(f"mongo_pool_clears_total {self.pool_clears}")
+
+            lines.append("# HELP app_span_duration_seconds Latency of instrumented helpers")
+            lines.append("# TYPE app_span_duration_seconds histogram")
+            for name, histogram in sorted(self.spans.items()):
+                self._render_histogram(lines, "app_span_duration_seconds", histogram, {"span": name})
+
+        return "\n".join(lines) + "\n"
+
+
+def _reply_documents(reply: dict) -> int:
+    cursor = reply.get("cursor")
+    if cursor:
+        return len(cursor.get("firstBatch") or cursor.get("nextBatch") or [])
+    return reply.get("n", 0) or 0
+
+
+class MongoCommandListener(monitoring.CommandListener):
+    """Counts Mongo round trips and attributes them to the current request.
+
+    Command replies do not carry docsExamined, so documents returned
+    (cursor batches) or affected (`n`) are recorded instead.
+    """
+
+    def __init__(self, registry: MetricsRegistry):
+        self.registry = registry
+
+    def started(self, event):
+        pass
+
+    def _record(self, event, failed):
+        duration = event.duration_micros / 1_000_000
+        self.registry.observe_command(event.command_name, duration, failed)
+        stats = current_request_stats.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.duration += duration
+            if not failed:
+                stats.docs += _reply_documents(event.reply)
+
+    def succeeded(self, event):
+        self._record(event, failed=False)
+
+    def failed(self, event):
+        self._record(event, failed=True)
+
+
+class MongoPoolListener(monitoring.ConnectionPoolListener):
+    """Connection pool gauges and checkout wait times.
+
+    Checkouts run synchronously in Motor's executor threads, so the wait is
+    measured between check-out-started and checked-out on the same thread.
+    """
+
+    def __init__(self, registry: MetricsRegistry):
+        self.registry = registry
+        self._local = threading.local()
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self.registry.observe_pool(cleared=True)
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self.registry.observe_pool(connections=1)
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self.registry.observe_pool(connections=-1)
+
+    def connection_check_out_started(self, event):
+        self._local.started = time.perf_counter()
+
+    def _wait(self):
+        started = getattr(self._local, "started", None)
+        self._local.started = None
+        return time.perf_counter() - started if started is not None else None
+
+    def connection_check_out_failed(self, event):
+        self.registry.observe_pool(wait=self._wait(), failure=str(event.reason))
+
+    def connection_checked_out(self, event):
+        self.registry.observe_pool(checked_out=1, wait=self._wait())
+
+    def connection_checked_in(self, event):
+        self.registry.observe_pool(checked_out=-1)
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware timing every HTTP request by its route template"""
+
+    def __init__(self, app, registry: MetricsRegistry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = current_request_stats.set(stats)
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        with self.registry._lock:
+            self.registry.in_flight += 1
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - started
+            with self.registry._lock:
+                self.registry.in_flight -= 1
+            # FastAPI stores the matched route in the scope, label by its template
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            self.registry.observe_request(scope["method"], route_path, status_code, duration, stats)
+            current_request_stats.reset(token)
+
+
+# Global metrics registry and Mongo listener instances
+metrics_registry = MetricsRegistry()
+mongo_command_listener = MongoCommandListener(metrics_registry)
+mongo_pool_listener = MongoPoolListener(metrics_registry)
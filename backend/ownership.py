@@ -0,0 +1,107 @@
+import os
+from collections import OrderedDict
+from typing import Optional
+
+# Only live (not soft-deleted) hotels and rooms are indexed
+LIVE = {"deleted_at": None}
+
+
+class OwnershipIndex:
+    """In-memory room -> hotel and hotel -> manager maps for permission checks.
+
+    Both maps are LRU bounded to max_entries and filled lazily from Mongo on a
+    miss (misses are not cached). A hotel's manager and a room's hotel never
+    change after creation, so the only refresh points are create and delete,
+    which call add_* / remove_*.
+    """
+
+    def __init__(self, max_entries: int = 100000):
+        self.max_entries = max_entries
+        self.db = None
+        self._hotel_manager = OrderedDict()
+        self._room_hotel = OrderedDict()
+        self._listeners = []
+
+    def init(self, db):
+        self.db = db
+
+    def add_listener(self, callback):
+        """Called with (kind, id) for every local removal (used to fan out to other workers)"""
+        self._listeners.append(callback)
+
+    def _notify(self, kind: str, entity_id: str):
+        for callback in self._listeners:
+            callback(kind, entity_id)
+
+    def _put(self, mapping: OrderedDict, key: str, value: str):
+        mapping[key] = value
+        mapping.move_to_end(key)
+        while len(mapping) > self.max_entries:
+            mapping.popitem(last=False)
+
+    def add_hotel(self, hotel_id: str, manager_id: str):
+        self._put(self._hotel_manager, hotel_id, manager_id)
+
+    def add_room(self, room_id: str, hotel_id: str):
+        self._put(self._room_hotel, room_id, hotel_id)
+
+    def remove_hotel(self, hotel_id: str, broadcast: bool = True):
+        self._hotel_manager.pop(hotel_id, None)
+        for room_id in [room_id for room_id, owner in self._room_hotel.items() if owner == hotel_id]:
+            del self._room_hotel[room_id]
+        if broadcast:
+            self._notify("hotel", hotel_id)
+
+    def remove_room(self, room_id: str, broadcast: bool = True):
+        self._room_hotel.pop(room_id, None)
+        if broadcast:
+            self._notify("room", room_id)
+
+    async def warm(self, limit: int = None):
+        """Preload the most recently created live hotels and rooms"""
+        limit = min(limit or self.max_entries, self.max_entries)
+        projection = {"_id": 0, "id": 1, "manager_id": 1}
+        async for hotel in self.db.hotels.find(LIVE, projection).sort("created_at", -1).limit(limit):
+            self.add_hotel(hotel["id"], hotel.get("manager_id"))
+        projection = {"_id": 0, "id": 1, "hotel_id": 1}
+        async for room in self.db.conference_rooms.find(LIVE, projection).sort("created_at", -1).limit(limit):
+            self.add_room(room["id"], room["hotel_id"])
+
+    def clear(self):
+        self._hotel_manager.clear()
+        self._room_hotel.clear()
+
+    async def hotel_manager(self, hotel_id: str) -> Optional[str]:
+        """Manager id of a live hotel, None if the hotel does not exist"""
+        manager_id = self._hotel_manager.get(hotel_id)
+        if manager_id is not None:
+            self._hotel_manager.move_to_end(hotel_id)
+            return manager_id
+        hotel = await self.db.hotels.find_one({"id": hotel_id, **LIVE}, {"_id": 0, "manager_id": 1})
+        if not hotel:
+            return None
+        self.add_hotel(hotel_id, hotel.get("manager_id"))
+        return hotel.get("manager_id")
+
+    async def room_hotel(self, room_id: str) -> Optional[str]:
+        """Hotel id of a live room, None if the room does not exist"""
+        hotel_id = self._room_hotel.get(room_id)
+        if hotel_id is not None:
+            self._room_hotel.move_to_end(room_id)
+            return hotel_id
+        room = await self.db.conference_rooms.find_one({"id": room_id, **LIVE}, {"_id": 0, "hotel_id": 1})
+        if not room:
+            return None
+        self.add_room(room_id, room["hotel_id"])
+        return room["hotel_id"]
+
+    async def owns_hotel(self, manager_id: str, hotel_id: str) -> bool:
+        return await self.hotel_manager(hotel_id) == manager_id
+
+    async def owns_room(self, manager_id: str, room_id: str) -> bool:
+        hotel_id = await self.room_hotel(room_id)
+        return hotel_id is not None and await self.owns_hotel(manager_id, hotel_id)
+
+
+# Global ownership index instance
+ownership_index = OwnershipIndex(max_entries=int(os.environ.get("OWNERSHIP_INDEX_MAX_ENTRIES", "100000")))
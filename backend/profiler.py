@@ -0,0 +1,288 @@
+import asyncio
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+APP_DIR = str(Path(__file__).parent)
+
+
+def _env_number(name: str, default, cast=float):
+    """Numeric setting from the environment, the default (with a warning) if it does not parse"""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    try:
+        return cast(value)
+    except ValueError:
+        logger.warning(f"Invalid {name}={value!r}, using {default}")
+        return default
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+def _site_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+
+
+def _is_app_frame(frame) -> bool:
+    """Frames from this backend, excluding the instrumentation middlewares"""
+    filename = frame.f_code.co_filename
+    return filename.startswith(APP_DIR) and os.path.basename(filename) not in ("profiler.py", "metrics.py")
+
+
+def _is_asyncio_frame(frame) -> bool:
+    return f"{os.sep}asyncio{os.sep}" in frame.f_code.co_filename
+
+
+def _await_chain(coro):
+    """Frames of a suspended coroutine chain (outermost first) and what it waits on"""
+    frames = []
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None) or getattr(coro, "ag_frame", None)
+        if frame is None:
+            break
+        frames.append(frame)
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None) or getattr(coro, "ag_await", None)
+    leaf = type(coro).__name__ if coro is not None else None
+    return frames, leaf
+
+
+def _thread_stack(frame):
+    """Frames of the running task, outermost first, without event loop plumbing"""
+    frames = []
+    while frame is not None:
+        frames.append(frame)
+        frame = frame.f_back
+    frames.reverse()
+    # Task steps are driven from asyncio's Handle._run, keep what runs above it
+    for index in range(len(frames) - 1, -1, -1):
+        if frames[index].f_code.co_name == "_run" and _is_asyncio_frame(frames[index]):
+            return frames[index + 1:]
+    return frames
+
+
+class ProfiledRequest:
+    def __init__(self, task, loop_thread_id, method, path, forced):
+        self.id = str(uuid.uuid4())
+        self.task = task
+        self.loop_thread_id = loop_thread_id
+        self.method = method
+        self.path = path
+        self.forced = forced
+        self.started = time.perf_counter()
+        self.stacks = Counter()  # collapsed stack -> samples
+        self.awaits = Counter()  # await site -> samples
+        self.running_samples = 0
+        self.waiting_samples = 0
+
+
+class RequestProfiler:
+    """Sampling profiler for individual requests.
+
+    While at least one profiled request is in flight, a background thread
+    samples every PROFILER_INTERVAL_MS: if the request task is running on the
+    event loop thread the real thread stack is recorded, otherwise the
+    suspended coroutine chain (cr_await) tells which await it is blocked on.
+    Requests slower than PROFILER_SLOW_MS (or forced by header) are written to
+    PROFILER_DIR as a collapsed-stack .folded file plus a .json summary with
+    the per-await breakdown. Work done in other tasks (asyncio.gather children)
+    shows up as a wait on the gathering future.
+    """
+
+    def __init__(self):
+        self.enabled = os.environ.get("PROFILER_ENABLED", "").lower() in ("1", "true", "yes")
+        self.sample_rate = _env_number("PROFILER_SAMPLE_RATE", 0.0)
+        self.header_token = os.environ.get("PROFILER_HEADER_TOKEN")
+        self.interval = _env_number("PROFILER_INTERVAL_MS", 5.0) / 1000
+        self.slow_threshold = _env_number("PROFILER_SLOW_MS", 500.0) / 1000
+        self.max_profiles = _env_number("PROFILER_MAX_PROFILES", 200, int)
+        self.directory = Path(os.environ.get("PROFILER_DIR", Path(APP_DIR) / "profiles"))
+        self._active = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def should_profile(self, headers: dict):
+        """(profile?, forced?) for a request"""
+        if self.header_token and headers.get(b"x-profile-request", b"").decode() == self.header_token:
+            return True, True
+        if self.enabled:
+            return True, False
+        if self.sample_rate and random.random() < self.sample_rate:
+            return True, False
+        return False, False
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._sample_loop, name="request-profiler", daemon=True)
+            self._thread.start()
+
+    def begin(self, method: str, path: str, forced: bool) -> ProfiledRequest:
+        request = ProfiledRequest(asyncio.current_task(), threading.get_ident(), method, path, forced)
+        with self._lock:
+            self._active[request.id] = request
+        self._ensure_thread()
+        self._wakeup.set()
+        return request
+
+    def end(self, request: ProfiledRequest):
+        """Once this returns the sampler no longer touches request"""
+        with self._lock:
+            self._active.pop(request.id, None)
+
+    def _sample(self, request: ProfiledRequest, thread_frames):
+        loop = request.task.get_loop()
+        if asyncio.current_task(loop) is request.task:
+            frame = thread_frames.get(request.loop_thread_id)
+            frames = _thread_stack(frame) if frame else []
+            request.running_samples += 1
+            leaf = None
+        else:
+            frames, leaf = _await_chain(request.task.get_coro())
+            request.waiting_samples += 1
+            app_frames = [f for f in frames if _is_app_frame(f)]
+            site = _site_label(app_frames[-1] if app_frames else frames[-1]) if frames else "<unknown>"
+            request.awaits[f"{site} -> {leaf or 'await'}"] += 1
+
+        stack = ";".join(_frame_label(f) for f in frames)
+        if leaf:
+            stack = f"{stack};<await {leaf}>" if stack else f"<await {leaf}>"
+        request.stacks[stack or "<idle>"] += 1
+
+    def _sample_loop(self):
+        while True:
+            # Sample under the lock so a request never changes after end()
+            with self._lock:
+                active = list(self._active.values())
+                thread_frames = sys._current_frames() if active else None
+                for request in active:
+                    try:
+                        self._sample(request, thread_frames)
+                    except Exception:
+                        # Coroutine state can change under us, skip this sample
+                        pass
+            if not active:
+                self._wakeup.wait()
+                self._wakeup.clear()
+                continue
+            time.sleep(self.interval)
+
+    def finish(self, request: ProfiledRequest, route: str, status_code: int):
+        """(summary, folded stacks) if the profile should be kept, else None"""
+        duration = time.perf_counter() - request.started
+        if not request.forced and duration < self.slow_threshold:
+            return None
+
+        with self._lock:
+            stacks = Counter(request.stacks)
+            awaits = Counter(request.awaits)
+            running_samples, waiting_samples = request.running_samples, request.waiting_samples
+
+        interval_ms = self.interval * 1000
+        summary = {
+            "id": request.id,
+            "method": request.method,
+            "path": request.path,
+            "route": route,
+            "status": status_code,
+            "duration_ms": round(duration * 1000, 2),
+            "created_at": datetime.utcnow().isoformat(),
+            "forced": request.forced,
+            "samples": running_samples + waiting_samples,
+            "interval_ms": interval_ms,
+            "running_ms": round(running_samples * interval_ms, 2),
+            "waiting_ms": round(waiting_samples * interval_ms, 2),
+            "awaits": [
+                {"site": site, "samples": count, "approx_ms": round(count * interval_ms, 2)}
+                for site, count in awaits.most_common(20)
+            ],
+            "top_stacks": [
+                {"stack": stack, "samples": count}
+                for stack, count in stacks.most_common(10)
+            ]
+        }
+        folded = "\n".join(f"{stack} {count}" for stack, count in stacks.items()) + "\n"
+        return summary, folded
+
+    def save(self, summary: dict, folded: str):
+        """Blocking, run it in an executor"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        (self.directory / f"{summary['id']}.folded").write_text(folded)
+        (self.directory / f"{summary['id']}.json").write_text(json.dumps(summary))
+
+        profiles = sorted(self.directory.glob("*.json"), key=lambda path: path.stat().st_mtime)
+        for path in profiles[:max(len(profiles) - self.max_profiles, 0)]:
+            path.unlink(missing_ok=True)
+            path.with_suffix(".folded").unlink(missing_ok=True)
+
+    def list_profiles(self) -> list:
+        """Blocking, run it in an executor"""
+        summaries = []
+        if self.directory.exists():
+            for path in self.directory.glob("*.json"):
+                try:
+                    summaries.append(json.loads(path.read_text()))
+                except (OSError, ValueError):
+                    continue
+        return summaries
+
+    def read_folded(self, profile_id: str):
+        path = self.directory / f"{Path(profile_id).name}.folded"
+        return path.read_text() if path.exists() else None
+
+
+class ProfilingMiddleware:
+    """Pure ASGI middleware that profiles the requests selected by the profiler"""
+
+    def __init__(self, app, profiler: RequestProfiler):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile, forced = self.profiler.should_profile(dict(scope.get("headers") or []))
+        if not profile:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        request = self.profiler.begin(scope["method"], scope["path"], forced)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.profiler.end(request)
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            result = self.profiler.finish(request, route, status_code)
+            if result:
+                try:
+                    await asyncio.get_running_loop().run_in_executor(None, self.profiler.save, *result)
+                except OSError as e:
+                    logger.error(f"Could not save request profile: {e}")
+
+
+# Global request profiler instance
+request_profiler = RequestProfiler()
@@ -0,0 +1,98 @@
+from typing import List, Optional, TypedDict
+
+# Projections per access pattern, shared so every caller reads the same shape
+ID_ONLY = {"_id": 0, "id": 1}
+USER_PRINCIPAL = {"_id": 0, "password": 0}
+USER_LOGIN = {"_id": 0}
+ROOM_REF = {"_id": 0, "id": 1, "hotel_id": 1}
+ROOM_STATS = {"_id": 0, "id": 1, "name": 1, "hotel_id": 1, "currency": 1}
+HOTEL_SUMMARY = {"_id": 0, "id": 1, "name": 1, "manager_id": 1}
+BOOKING_ACCESS = {"_id": 0, "id": 1, "room_id": 1, "customer_id": 1}
+HOTEL_RATING = {"_id": 0, "overall_rating": 1}
+ROOM_RATING = {"_id": 0, "room_rating": 1}
+
+
+class RoomRef(TypedDict):
+    id: str
+    hotel_id: str
+
+
+class RoomStatsRef(RoomRef):
+    name: str
+    currency: str
+
+
+class HotelOwner(TypedDict):
+    id: str
+    manager_id: str
+
+
+class HotelSummary(HotelOwner):
+    name: str
+
+
+class BookingAccess(TypedDict):
+    id: str
+    room_id: str
+    customer_id: str
+
+
+class Queries:
+    """Typed Mongo reads for the hot access patterns.
+
+    Each method declares the projection it needs, so handlers that only
+    compare ids or check ownership never pull descriptions, image arrays or
+    password hashes over the wire.
+    """
+
+    def __init__(self):
+        self.db = None
+
+    def init(self, db):
+        self.db = db
+
+    async def principal(self, email: str) -> Optional[dict]:
+        """User document for an authenticated request, without the password hash"""
+        return await self.db.users.find_one({"email": email}, USER_PRINCIPAL)
+
+    async def login_user(self, email: str) -> Optional[dict]:
+        """Full user document (with password hash) for credential checks"""
+        return await self.db.users.find_one({"email": email}, USER_LOGIN)
+
+    async def email_taken(self, email: str) -> bool:
+        return await self.db.users.find_one({"email": email}, ID_ONLY) is not None
+
+    async def room_ref(self, room_id: str, **filters) -> Optional[RoomRef]:
+        return await self.db.conference_rooms.find_one({"id": room_id, **filters}, ROOM_REF)
+
+    async def hotel_summary(self, hotel_id: str, **filters) -> Optional[HotelSummary]:
+        return await self.db.hotels.find_one({"id": hotel_id, **filters}, HOTEL_SUMMARY)
+
+    async def booking_access(self, booking_id: str) -> Optional[BookingAccess]:
+        return await self.db.bookings.find_one({"id": booking_id}, BOOKING_ACCESS)
+
+    async def hotel_ids(self, query: dict, limit: int = 1000) -> List[str]:
+        hotels = await self.db.hotels.find(query, ID_ONLY).to_list(length=limit)
+        return [hotel["id"] for hotel in hotels]
+
+    async def room_ids(self, query: dict, limit: int = 1000) -> List[str]:
+        rooms = await self.db.conference_rooms.find(query, ID_ONLY).to_list(length=limit)
+        return [room["id"] for room in rooms]
+
+    async def manager_room_ids(self, manager_id: str) -> List[str]:
+        hotel_ids = await self.hotel_ids({"manager_id": manager_id})
+        return await self.room_ids({"hotel_id": {"$in": hotel_ids}})
+
+    async def manager_rooms(self, manager_id: str, limit: int = 1000) -> List[RoomStatsRef]:
+        """Every room (live or not) of the manager's hotels, as booking statistics label them"""
+        hotel_ids = await self.hotel_ids({"manager_id": manager_id})
+        return await self.db.conference_rooms.find({"hotel_id": {"$in": hotel_ids}}, ROOM_STATS).to_list(length=limit)
+
+    async def rating_values(self, query: dict, field: str, limit: int = 1000) -> List[float]:
+        projection = HOTEL_RATING if field == "overall_rating" else ROOM_RATING
+        reviews = await self.db.reviews.find(query, projection).to_list(length=limit)
+        return [review[field] for review in reviews]
+
+
+# Global query layer instance
+queries = Queries()
@@ -0,0 +1,160 @@
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from collections import OrderedDict
+
+from starlette.responses import Response
+
+from fast_json import dumps
+
+logger = logging.getLogger(__name__)
+
+
+class CacheEntry:
+    __slots__ = ("body", "etag", "tags", "expires_at")
+
+    def __init__(self, body: bytes, etag: str, tags, expires_at: float):
+        self.body = body
+        self.etag = etag
+        self.tags = tags
+        self.expires_at = expires_at
+
+
+def render_json(content) -> bytes:
+    """Compact UTF-8 JSON encoded with orjson (see fast_json.dumps).
+
+    Decodes to the same values as FastAPI's default JSONResponse but is not
+    byte-identical: floats use exponents like 1e16 (not 1e+16), UTC datetimes
+    end in +00:00 where pydantic writes Z, NaN/Infinity become null and
+    integers beyond 64 bits raise TypeError.
+    """
+    return dumps(content)
+
+
+class ResponseCache:
+    """In-process cache of encoded JSON responses for public catalog reads.
+
+    Entries are evicted LRU once max_entries is reached and expire after ttl
+    seconds. Every entry carries tags (e.g. "hotel:<id>"); write handlers call
+    invalidate() with the tags they touch. Concurrent misses for the same key
+    share one computation (single-flight), and an entry computed while one of
+    its tags was invalidated is not stored.
+    """
+
+    def __init__(self, max_entries: int = 2000, ttl: float = 60.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._tag_index = {}
+        self._tag_versions = {}
+        self._inflight = {}
+        self._listeners = []
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(name: str, **params) -> str:
+        return name + "?" + "&".join(f"{key}={params[key]}" for key in sorted(params))
+
+    def add_listener(self, callback):
+        """Called with the tags of every local invalidation (used to fan out to other workers)"""
+        self._listeners.append(callback)
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry:
+            for tag in entry.tags:
+                keys = self._tag_index.get(tag)
+                if keys:
+                    keys.discard(key)
+                    if not keys:
+                        del self._tag_index[tag]
+
+    def _store(self, key: str, entry: CacheEntry):
+        self._remove(key)
+        self._entries[key] = entry
+        for tag in entry.tags:
+            self._tag_index.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    def invalidate(self, *tags, broadcast: bool = True):
+        for tag in tags:
+            self._tag_versions[tag] = self._tag_versions.get(tag, 0) + 1
+            for key in list(self._tag_index.get(tag, ())):
+                self._remove(key)
+        if broadcast:
+            for callback in self._listeners:
+                try:
+                    callback(tags)
+                except Exception as e:
+                    logger.error(f"Cache invalidation listener error: {e}")
+
+    def clear(self):
+        self._entries.clear()
+        self._tag_index.clear()
+
+    def _lookup(self, key: str):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at < time.monotonic():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    async def get_or_compute(self, key: str, tags, compute, ttl: float = None):
+        """(entry, hit) for key, compute() returns the response content on a miss"""
+        entry = self._lookup(key)
+        if entry:
+            self.hits += 1
+            return entry, True
+
+        future = self._inflight.get(key)
+        if future:
+            self.hits += 1
+            return await asyncio.shield(future), True
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        versions = {tag: self._tag_versions.get(tag, 0) for tag in tags}
+        try:
+            body = render_json(await compute())
+            entry = CacheEntry(body, '"' + hashlib.sha1(body).hexdigest() + '"', tuple(tags), time.monotonic() + (ttl or self.ttl))
+            if all(self._tag_versions.get(tag, 0) == version for tag, version in versions.items()):
+                self._store(key, entry)
+            future.set_result(entry)
+            return entry, False
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters re-raise it, keep the loop from reporting it as never retrieved
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+    async def respond(self, request, key: str, tags, compute, ttl: float = None) -> Response:
+        """Serve key from cache (computing it if needed) with ETag / 304 support.
+
+        ttl overrides the cache-wide ttl for entries stored by this call.
+        """
+        entry, hit = await self.get_or_compute(key, tags, compute, ttl)
+        headers = {"ETag": entry.etag, "Cache-Control": "no-cache", "X-Cache": "HIT" if hit else "MISS"}
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and (if_none_match.strip() == "*" or entry.etag in [tag.strip() for tag in if_none_match.split(",")]):
+            return Response(status_code=304, headers=headers)
+        return Response(entry.body, media_type="application/json", headers=headers)
+
+
+# Global response cache instance
+response_cache = ResponseCache(
+    max_entries=int(os.environ.get("RESPONSE_CACHE_MAX_ENTRIES", "2000")),
+    ttl=float(os.environ.get("RESPONSE_CACHE_TTL_SECONDS", "60"))
+)
@@ -0,0 +1,285 @@
+import asyncio
+import bisect
+import logging
+import math
+import re
+import unicodedata
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Turkish dotted/dotless i fold to plain "i" so "ISPARTA", "Isparta", "ısparta"
+# and "İstanbul" / "istanbul" all meet; the rest is stripped of diacritics
+_TURKISH_I = str.maketrans({"İ": "i", "I": "i", "ı": "i"})
+_TOKEN = re.compile(r"[^\W_]+")
+
+# Field weights (BM25F-style: term frequencies are summed with these weights)
+HOTEL_FIELDS = {"name": 3.0, "city": 2.0, "facilities": 1.5, "description": 1.0}
+ROOM_FIELDS = {"name": 3.0, "features": 1.5, "hotel_name": 1.0, "city": 2.0}
+
+HOTEL_PROJECTION = {
+    "_id": 0, "id": 1, "name": 1, "city": 1, "description": 1, "facilities": 1, "approval_status": 1
+}
+ROOM_PROJECTION = {"_id": 0, "id": 1, "hotel_id": 1, "name": 1, "features": 1}
+LIVE_HOTELS = {"is_active": True, "deleted_at": None}
+SEARCHABLE_ROOMS = {"approval_status": "approved", "is_available": True, "deleted_at": None}
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+PREFIX_WEIGHT = 0.7  # a prefix expansion scores less than the exact term
+MIN_PREFIX_LENGTH = 2
+MAX_PREFIX_EXPANSIONS = 50
+
+
+def fold(text: Optional[str]) -> str:
+    """Lowercase, Turkish-aware, diacritic-free form used for every comparison"""
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKD", text.translate(_TURKISH_I).lower())
+    return "".join(char for char in text if not unicodedata.combining(char))
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return _TOKEN.findall(fold(text))
+
+
+class SearchIndex:
+    """In-process inverted index over approved hotels and rooms for /api/search.
+
+    Text is folded with fold() and split into tokens; each document keeps its
+    weighted term frequencies and length for BM25 ranking. Every query token
+    also matches indexed terms it is a prefix of, found by bisecting a sorted
+    term list.
+
+    The index is rebuilt at startup and kept current incrementally: writes
+    mark hotels/rooms dirty (mark_dirty, also fanned out to other workers),
+    and the next query reloads only the dirty documents from Mongo. A dirty
+    hotel reloads its rooms too, since rooms are indexed with their hotel's
+    name and city.
+
+    It also keeps folded city -> hotel ids for every live hotel (approved or
+    not), used by the city filters of the list endpoints once ready (built).
+    """
+
+    def __init__(self):
+        self.db = None
+        self.ready = False
+        self._postings = {}  # term -> {doc_key: weighted tf}
+        self._terms = []  # sorted keys of _postings
+        self._docs = {}  # doc_key -> (terms, length, hit)
+        self._total_length = 0.0
+        self._hotels = {}  # hotel_id -> {"name", "city", "approved"}
+        self._hotel_rooms = {}  # hotel_id -> indexed room ids
+        self._cities = {}  # folded city -> hotel ids
+        self._dirty_hotels = set()
+        self._dirty_rooms = set()
+        self._lock = asyncio.Lock()
+        self._listeners = []
+
+    def init(self, db):
+        self.db = db
+
+    def add_listener(self, callback):
+        """Called with (kind, ids) for every local mark_dirty (used to fan out to other workers)"""
+        self._listeners.append(callback)
+
+    def mark_dirty(self, kind: str, *ids: str, broadcast: bool = True):
+        """kind is "hotel" or "room"; the documents are reloaded before the next query"""
+        (self._dirty_hotels if kind == "hotel" else self._dirty_rooms).update(ids)
+        if broadcast:
+            for callback in self._listeners:
+                callback(kind, list(ids))
+
+    # Index maintenance
+
+    def _index(self, doc_key: tuple, fields: dict, weights: dict, hit: dict):
+        self._unindex(doc_key)
+        terms = {}
+        length = 0.0
+        for field, weight in weights.items():
+            value = fields.get(field)
+            tokens = tokenize(" ".join(value) if isinstance(value, list) else value)
+            for token in tokens:
+                terms[token] = terms.get(token, 0.0) + weight
+            length += weight * len(tokens)
+        for term, frequency in terms.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                bisect.insort(self._terms, term)
+            postings[doc_key] = frequency
+        self._docs[doc_key] = (tuple(terms), length, hit)
+        self._total_length += length
+
+    def _unindex(self, doc_key: tuple):
+        doc = self._docs.pop(doc_key, None)
+        if doc is None:
+            return
+        terms, length, _ = doc
+        self._total_length -= length
+        for term in terms:
+            postings = self._postings[term]
+            del postings[doc_key]
+            if not postings:
+                del self._postings[term]
+                del self._terms[bisect.bisect_left(self._terms, term)]
+
+    def _put_hotel(self, hotel: dict):
+        self._drop_hotel(hotel["id"])
+        approved = hotel.get("approval_status") == "approved"
+        self._hotels[hotel["id"]] = {"name": hotel.get("name"), "city": hotel.get("city"), "approved": approved}
+        self._cities.setdefault(fold(hotel.get("city")).strip(), set()).add(hotel["id"])
+        if approved:
+            self._index(("hotel", hotel["id"]), hotel, HOTEL_FIELDS, {
+                "type": "hotel", "id": hotel["id"], "name": hotel.get("name"), "city": hotel.get("city")
+            })
+
+    def _drop_hotel(self, hotel_id: str):
+        hotel = self._hotels.pop(hotel_id, None)
+        if hotel is None:
+            return
+        city_key = fold(hotel["city"]).strip()
+        ids = self._cities.get(city_key)
+        if ids:
+            ids.discard(hotel_id)
+            if not ids:
+                del self._cities[city_key]
+        self._unindex(("hotel", hotel_id))
+
+    def _put_room(self, room: dict) -> bool:
+        hotel = self._hotels.get(room["hotel_id"])
+        if not hotel or not hotel["approved"]:
+            self._drop_room(room["id"], room["hotel_id"])
+            return False
+        fields = dict(room, hotel_name=hotel["name"], city=hotel["city"])
+        self._index(("room", room["id"]), fields, ROOM_FIELDS, {
+            "type": "room", "id": room["id"], "name": room.get("name"), "city": hotel["city"],
+            "hotel_id": room["hotel_id"], "hotel_name": hotel["name"]
+        })
+        self._hotel_rooms.setdefault(room["hotel_id"], set()).add(room["id"])
+        return True
+
+    def _drop_room(self, room_id: str, hotel_id: Optional[str] = None):
+        doc = self._docs.get(("room", room_id))
+        if doc and hotel_id is None:
+            hotel_id = doc[2]["hotel_id"]
+        self._unindex(("room", room_id))
+        room_ids = self._hotel_rooms.get(hotel_id)
+        if room_ids:
+            room_ids.discard(room_id)
+            if not room_ids:
+                del self._hotel_rooms[hotel_id]
+
+    async def rebuild(self):
+        """Load every live hotel and searchable room (startup)"""
+        async with self._lock:
+            self.ready = False
+            self._dirty_hotels.clear()
+            self._dirty_rooms.clear()
+            self._postings, self._terms, self._docs, self._total_length = {}, [], {}, 0.0
+            self._hotels, self._hotel_rooms, self._cities = {}, {}, {}
+            async for hotel in self.db.hotels.find(LIVE_HOTELS, HOTEL_PROJECTION):
+                self._put_hotel(hotel)
+            async for room in self.db.conference_rooms.find(SEARCHABLE_ROOMS, ROOM_PROJECTION):
+                self._put_room(room)
+            self.ready = True
+        logger.info(f"Search index built: {len(self._docs)} documents, {len(self._terms)} terms")
+
+    async def sync(self):
+        """Reload the documents marked dirty since the last query"""
+        if not self._dirty_hotels and not self._dirty_rooms:
+            return
+        async with self._lock:
+            hotel_ids, self._dirty_hotels = list(self._dirty_hotels), set()
+            room_ids, self._dirty_rooms = set(self._dirty_rooms), set()
+            try:
+                await self._reload(hotel_ids, room_ids)
+            except Exception:
+                # Retry them on the next query
+                self._dirty_hotels.update(hotel_ids)
+                self._dirty_rooms.update(room_ids)
+                raise
+
+    async def _reload(self, hotel_ids: List[str], room_ids: set):
+        """Reindex hotels (with their rooms) and rooms from Mongo, dropping the ones no longer live"""
+        if hotel_ids:
+            found = set()
+            async for hotel in self.db.hotels.find({"id": {"$in": hotel_ids}, **LIVE_HOTELS}, HOTEL_PROJECTION):
+                self._put_hotel(hotel)
+                found.add(hotel["id"])
+            for hotel_id in hotel_ids:
+                if hotel_id not in found:
+                    self._drop_hotel(hotel_id)
+                room_ids.update(self._hotel_rooms.get(hotel_id, ()))
+
+        if room_ids or hotel_ids:
+            query = {"$or": [{"id": {"$in": list(room_ids)}}, {"hotel_id": {"$in": hotel_ids}}], **SEARCHABLE_ROOMS}
+            found = set()
+            async for room in self.db.conference_rooms.find(query, ROOM_PROJECTION):
+                if self._put_room(room):
+                    found.add(room["id"])
+            for room_id in room_ids - found:
+                self._drop_room(room_id)
+
+    # Queries
+
+    def _expand(self, token: str) -> List[tuple]:
+        """(term, weight) pairs a query token matches"""
+        matches = [(token, 1.0)] if token in self._postings else []
+        if len(token) < MIN_PREFIX_LENGTH:
+            return matches
+        start = bisect.bisect_right(self._terms, token)
+        for term in self._terms[start:start + MAX_PREFIX_EXPANSIONS]:
+            if not term.startswith(token):
+                break
+            matches.append((term, PREFIX_WEIGHT))
+        return matches
+
+    def search(self, query: str, kind: Optional[str] = None, limit: int = 20) -> List[dict]:
+        """Hits matching every query token (as a word or word prefix), best BM25 score first"""
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens or not self._docs:
+            return []
+        total_docs = len(self._docs)
+        average_length = self._total_length / total_docs or 1.0
+
+        scores = None
+        for token in tokens:
+            token_scores = {}
+            for term, weight in self._expand(token):
+                postings = self._postings[term]
+                idf = math.log(1 + (total_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_key, frequency in postings.items():
+                    if kind and doc_key[0] != kind:
+                        continue
+                    if scores is not None and doc_key not in scores:
+                        continue
+                    length = self._docs[doc_key][1]
+                    score = weight * idf * frequency * (BM25_K1 + 1) / (
+                        frequency + BM25_K1 * (1 - BM25_B + BM25_B * length / average_length)
+                    )
+                    # A token scores through its best matching term only
+                    if score > token_scores.get(doc_key, 0.0):
+                        token_scores[doc_key] = score
+            if scores is None:
+                scores = token_scores
+            else:
+                scores = {doc_key: scores[doc_key] + score for doc_key, score in token_scores.items()}
+            if not scores:
+                return []
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        return [dict(self._docs[doc_key][2], score=round(score, 4)) for doc_key, score in ranked]
+
+    def city_hotel_ids(self, city: str) -> List[str]:
+        """Live hotels whose folded city contains the folded query (case/diacritic-insensitive substring)"""
+        needle = fold(city).strip()
+        return [hotel_id for city_key, ids in self._cities.items() if needle in city_key for hotel_id in ids]
+
+    @property
+    def size(self) -> int:
+        return len(self._docs)
+
+
+# Global search index instance
+search_index = SearchIndex()
@@ -1,11 +1,16 @@
 from fastapi import FastAPI, APIRouter, HTTPException, Depends, status, Request, UploadFile, File
+from fastapi.responses import ORJSONResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
 import os
+import re
+import hmac
 import logging
 from pathlib import Path
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 from pydantic import BaseModel, Field, EmailStr
 from typing import List, Optional, Dict, Any
 import uuid
@@ -16,10 +21,32 @@ from enum import Enum
 # Stripe imports disabled - basic models used
 import httpx
 import asyncio
+import time
 from decimal import Decimal, ROUND_HALF_UP
 import smtplib
+import base64
+import json
+import calendar
+from collections import OrderedDict
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from ad_scheduler import ad_scheduler, compute_ad_status
+from ad_analytics import ad_analytics
+from job_tracker import job_tracker
+from cascade_delete import cascade_deleter
+from metrics import metrics_registry, mongo_command_listener, mongo_pool_listener, MetricsMiddleware
+from profiler import request_profiler, ProfilingMiddleware
+from response_cache import response_cache
+from fast_json import projection_for, sparse_fields, trusted_documents, trusted_response
+from queries import queries, ID_ONLY
+from ownership import ownership_index, OwnershipIndex
+from worker_bus import worker_bus
+from search_index import search_index, fold
+from geo_index import geo_index, haversine_km
+from feature_index import feature_index, bit_positions, to_binary
+from autocomplete import autocomplete_index
+from catalog import catalog_snapshot, SORT_ORDERS
+from contextlib import asynccontextmanager
 
 # Configure logging first
 logging.basicConfig(
@@ -31,10 +58,48 @@ logger = logging.getLogger(__name__)
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-# MongoDB connection
+# MongoDB connection pool settings, unset ones keep the driver / connection string defaults.
+# Pool limits apply per worker process and per server in the replica set.
+MONGO_CLIENT_OPTIONS = {
+    "maxPoolSize": ("MONGO_MAX_POOL_SIZE", int),
+    "minPoolSize": ("MONGO_MIN_POOL_SIZE", int),
+    "maxIdleTimeMS": ("MONGO_MAX_IDLE_TIME_MS", int),
+    "waitQueueTimeoutMS": ("MONGO_WAIT_QUEUE_TIMEOUT_MS", int),
+    "serverSelectionTimeoutMS": ("MONGO_SERVER_SELECTION_TIMEOUT_MS", int),
+    "connectTimeoutMS": ("MONGO_CONNECT_TIMEOUT_MS", int),
+    "socketTimeoutMS": ("MONGO_SOCKET_TIMEOUT_MS", int),
+    # e.g. "zstd,zlib" (snappy also needs python-snappy installed)
+    "compressors": ("MONGO_COMPRESSORS", str),
+    "readPreference": ("MONGO_READ_PREFERENCE", str),
+}
+
+def mongo_client_options() -> dict:
+    options = {}
+    for option, (env_name, cast) in MONGO_CLIENT_OPTIONS.items():
+        value = os.environ.get(env_name)
+        if value:
+            options[option] = cast(value)
+    return options
+
+# Pre-opened at startup; defaults to minPoolSize so those connections are not cold on the first requests
+MONGO_WARMUP_CONNECTIONS = int(os.environ.get('MONGO_WARMUP_CONNECTIONS', os.environ.get('MONGO_MIN_POOL_SIZE', 1)))
+
+# MongoDB connection, connect=False so no sockets or monitor threads are opened at import time
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncIOMotorClient(
+    mongo_url,
+    connect=False,
+    event_listeners=[mongo_command_listener, mongo_pool_listener],
+    **mongo_client_options()
+)
+metrics_registry.pool_max_size = client.options.pool_options.max_pool_size
 db = client[os.environ['DB_NAME']]
+queries.init(db)
+ownership_index.init(db)
+search_index.init(db)
+geo_index.init(db)
+feature_index.init(db)
+autocomplete_index.init(db)
 
 # JWT Settings
 SECRET_KEY = os.environ.get('JWT_SECRET_KEY', 'your-super-secret-jwt-key-for-hotel-booking-platform-2025')
@@ -58,8 +123,22 @@ SMTP_FROM_NAME = os.environ.get('SMTP_FROM_NAME', 'MeetDelux')
 if not all([SMTP_HOST, SMTP_USER, SMTP_PASSWORD]):
     logger.warning("SMTP settings not configured - Email features will be disabled")
 
+# Worker lifecycle settings
+WORKER_BUS_DIR = os.environ.get('WORKER_BUS_DIR', f"/tmp/meetdelux-{os.environ['DB_NAME']}")
+SHUTDOWN_DRAIN_SECONDS = float(os.environ.get('SHUTDOWN_DRAIN_SECONDS', 20))
+LEADER_RETRY_SECONDS = 30
+OWNERSHIP_WARM_LIMIT = 20000
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await on_startup()
+    try:
+        yield
+    finally:
+        await on_shutdown()
+
 # Create the main app
-app = FastAPI(title="MeetDelux - Lüks Seminer Salonu Rezervasyon API", version="1.0.0")
+app = FastAPI(title="MeetDelux - Lüks Seminer Salonu Rezervasyon API", version="1.0.0", lifespan=lifespan)
 
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
@@ -107,6 +186,14 @@ class ApprovalStatus(str, Enum):
     APPROVED = "approved"
     REJECTED = "rejected"
 
+class ApprovalEntity(str, Enum):
+    HOTEL = "hotel"
+    ROOM = "room"
+
+class ApprovalAction(str, Enum):
+    APPROVE = "approve"
+    REJECT = "reject"
+
 # Pydantic Models
 class UserBase(BaseModel):
     email: EmailStr
@@ -396,6 +483,208 @@ class CreateCheckoutRequest(BaseModel):
     success_url: str
     cancel_url: str
 
+# Default Service Seeding Models
+DEFAULT_SERVICE_SEED_BATCH_SIZE = 50  # hotels per bulk_write (x20 templates)
+
+class DefaultServiceSeedRequest(BaseModel):
+    hotel_ids: Optional[List[str]] = None  # None = every active hotel
+    manager_id: Optional[str] = None  # limit to one manager's hotel chain
+    update_existing: bool = False  # refresh template fields of already seeded services
+
+# Admin Approval Models
+MAX_APPROVAL_BATCH_SIZE = 500
+
+class ApprovalOperation(BaseModel):
+    entity: ApprovalEntity
+    id: str
+    action: ApprovalAction
+    reason: Optional[str] = None
+
+class ApprovalBatchRequest(BaseModel):
+    operations: List[ApprovalOperation]
+
+class ApprovalOperationResult(BaseModel):
+    entity: ApprovalEntity
+    id: str
+    action: ApprovalAction
+    success: bool
+    approval_status: Optional[ApprovalStatus] = None
+    error: Optional[str] = None
+
+# Hotel Detail Models
+HOTEL_DETAIL_REVIEWS = 20  # newest reviews included, same as the first page of /hotels/{id}/reviews
+
+class HotelDetailResponse(BaseModel):
+    hotel: HotelResponse
+    rooms: List[ConferenceRoomResponse]
+    services: List[ExtraServiceResponse]
+    reviews: List[ReviewResponse]
+    currency: CurrencyCode  # display currency of every pricing_info
+
+# Room Search Models
+MAX_ROOM_SEARCH_RESULTS = 100
+MAX_FEATURE_ID_FILTER = 5000  # above this many feature matches, filter by $bitsAllSet in Mongo
+# Stored room fields kept by the catalog snapshot (pricing_info is computed per request)
+catalog_snapshot.init(db, [name for name in ConferenceRoomResponse.model_fields if name != "pricing_info"])
+ROOM_PRICING_FIELDS = ["price_per_day", "price_per_hour", "currency"]
+# Mongo fallback until the snapshot is built; price sorts on the stored price_per_day there
+ROOM_SORT_FIELDS = {
+    None: [("created_at", 1)],
+    "price": [("price_per_day", 1), ("created_at", 1)],
+    "-price": [("price_per_day", -1), ("created_at", 1)],
+    "capacity": [("capacity", 1), ("created_at", 1)],
+    "-capacity": [("capacity", -1), ("created_at", 1)],
+    "rating": [("average_rating", -1), ("created_at", 1)],
+}
+
+# Room Batch Models
+MAX_BATCH_ROOMS = 20
+BATCH_HOTEL_PROJECTION = {
+    "_id": 0, "id": 1, "name": 1, "city": 1, "address": 1, "star_rating": 1, "average_rating": 1,
+    "images": {"$slice": 1}
+}
+
+class RoomHotelSummary(BaseModel):
+    id: str
+    name: str
+    city: str
+    address: str
+    star_rating: Optional[int] = None
+    average_rating: float = 0.0
+    image: Optional[str] = None
+
+class RoomDetails(ConferenceRoomResponse):
+    hotel: Optional[RoomHotelSummary] = None
+    services: List[ExtraServiceResponse] = []
+
+# Room Facet Models
+CAPACITY_BUCKETS = [1, 20, 50, 100, 200, 500]
+PRICE_BUCKETS = {  # per day, in the display currency
+    CurrencyCode.EUR: [0, 100, 250, 500, 1000, 2500],
+    CurrencyCode.USD: [0, 100, 250, 500, 1000, 2500],
+    CurrencyCode.TRY: [0, 2500, 5000, 10000, 25000, 50000],
+}
+MAX_FEATURE_FACETS = 30  # most common features listed, plus any named in count_features
+
+class FacetCount(BaseModel):
+    value: str
+    count: int
+
+class RangeFacetCount(BaseModel):
+    min: float
+    max: Optional[float] = None  # None = open-ended
+    count: int
+
+class RoomFacetsResponse(BaseModel):
+    currency: CurrencyCode
+    total: int
+    cities: List[FacetCount]
+    capacity: List[RangeFacetCount]
+    price: List[RangeFacetCount]
+    features: List[FacetCount]
+    room_types: List[FacetCount]
+    star_ratings: List[FacetCount]  # "unrated" for hotels without a star rating
+
+# Search Models
+MAX_SEARCH_RESULTS = 50
+
+class SearchHit(BaseModel):
+    type: str  # "hotel", "room"
+    id: str
+    name: Optional[str] = None
+    city: Optional[str] = None
+    hotel_id: Optional[str] = None  # rooms only
+    hotel_name: Optional[str] = None  # rooms only
+    score: float
+
+class SearchResponse(BaseModel):
+    query: str
+    results: List[SearchHit]
+
+# Autocomplete Models
+MAX_AUTOCOMPLETE_RESULTS = 20
+
+class AutocompleteSuggestion(BaseModel):
+    type: str  # "city", "hotel"
+    value: str  # display name
+    id: Optional[str] = None  # hotels only
+    city: Optional[str] = None  # hotels only
+    hotel_count: Optional[int] = None  # cities only
+    popularity: int  # non-cancelled bookings
+
+# Map Models
+MAX_NEARBY_RADIUS_KM = 500
+MAX_NEARBY_RESULTS = 100
+MAX_IN_BOUNDS_RESULTS = 1000
+MAX_MAP_ZOOM = 22
+
+class GeoHotel(BaseModel):
+    id: str
+    name: str
+    city: str
+    star_rating: Optional[int] = None
+    average_rating: float = 0.0
+    image: Optional[str] = None
+    latitude: float
+    longitude: float
+    distance_km: Optional[float] = None
+
+class GeoCluster(BaseModel):
+    latitude: float  # centroid
+    longitude: float
+    count: int
+    south: float
+    west: float
+    north: float
+    east: float
+
+class HotelsInBoundsResponse(BaseModel):
+    total: int
+    hotels: List[GeoHotel]
+    clusters: List[GeoCluster] = []
+
+# Manager Statistics Models
+MANAGER_STATS_TTL_SECONDS = float(os.environ.get('MANAGER_STATS_TTL_SECONDS', 30))
+MANAGER_STATS_MAX_MONTHS = 24
+MANAGER_STATS_TOP_SERVICES = 10
+
+class StatusRevenue(BaseModel):
+    status: BookingStatus
+    bookings: int
+    revenue: float
+
+class CurrencyRevenue(BaseModel):
+    currency: str
+    revenue: float  # every status except cancelled
+    by_status: List[StatusRevenue]
+
+class RoomOccupancy(BaseModel):
+    room_id: str
+    room_name: Optional[str] = None
+    year: int
+    month: int
+    booked_days: int
+    occupancy_rate: float  # booked_days / days in month, capped at 1
+
+class TopExtraService(BaseModel):
+    service_id: str
+    name: Optional[str] = None
+    currency: Optional[str] = None
+    quantity: int
+    bookings: int
+    revenue: float
+
+class ManagerStatsResponse(BaseModel):
+    manager_id: str
+    bookings: int
+    bookings_by_status: Dict[str, int]
+    bookings_by_payment_status: Dict[str, int]
+    revenue_by_currency: List[CurrencyRevenue]
+    occupancy: List[RoomOccupancy]
+    average_lead_time_days: Optional[float] = None
+    top_extra_services: List[TopExtraService]
+    generated_at: datetime
+
 # Utility Functions
 def hash_password(password: str) -> str:
     return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
@@ -588,24 +877,45 @@ def generate_booking_confirmation_email(booking: dict, room: dict, hotel: dict,
     
     return html, text
 
+# Shared outbound HTTP client for GeoIP and exchange rate lookups (keeps connections alive)
+OUTBOUND_TIMEOUT_SECONDS = 5.0
+http_client = None
+
+def get_http_client():
+    global http_client
+    if http_client is None:
+        http_client = httpx.AsyncClient(timeout=OUTBOUND_TIMEOUT_SECONDS)
+    return http_client
+
+# Per-worker copy of exchange rates in front of the exchange_rates collection
+EXCHANGE_RATE_MEMORY_TTL = 3600
+exchange_rate_memory = {}  # (base, target) -> (rate, expires_at)
+
+# Per-worker CurrencyContext per client IP (GeoIP lookup + rates), least recently used dropped first
+CURRENCY_CONTEXT_TTL_SECONDS = float(os.environ.get('CURRENCY_CONTEXT_TTL_SECONDS', 300))
+CURRENCY_CONTEXT_MAX_CLIENTS = int(os.environ.get('CURRENCY_CONTEXT_MAX_CLIENTS', 10000))
+# Contexts built on a fallback (unknown country or a 1:1 rate) are retried soon instead
+CURRENCY_CONTEXT_FALLBACK_TTL_SECONDS = float(os.environ.get('CURRENCY_CONTEXT_FALLBACK_TTL_SECONDS', 10))
+currency_contexts = OrderedDict()  # client ip -> (CurrencyContext, expires_at)
+
 # Currency and Location Utility Functions
-async def get_client_country_from_ip(client_ip: str) -> str:
-    """Get country code from client IP address"""
+async def get_client_country_from_ip(client_ip: str, default: Optional[str] = "TR") -> Optional[str]:
+    """Get country code from client IP address, default if the lookup fails"""
     try:
         # Eğer localhost ise Türkiye varsay
         if client_ip in ["127.0.0.1", "localhost", "::1"]:
             return "TR"
         
         # IP geolocation servisini kullan
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"http://ip-api.com/json/{client_ip}")
-            if response.status_code == 200:
-                data = response.json()
-                return data.get("countryCode", "TR")
+        response = await get_http_client().get(f"http://ip-api.com/json/{client_ip}")
+        if response.status_code == 200:
+            data = response.json()
+            if data.get("countryCode"):
+                return data["countryCode"]
     except Exception as e:
         logger.error(f"IP geolocation error: {e}")
     
-    return "TR"  # Default to Turkey
+    return default
 
 async def get_display_currency(country_code: str) -> CurrencyCode:
     """Get display currency based on country code"""
@@ -616,8 +926,13 @@ async def get_display_currency(country_code: str) -> CurrencyCode:
     else:
         return CurrencyCode.EUR
 
-async def get_exchange_rate(base_currency: str, target_currency: str) -> float:
-    """Get exchange rate from exchangerate-api.com"""
+async def get_exchange_rate(base_currency: str, target_currency: str, default: Optional[float] = 1.0) -> Optional[float]:
+    """Get exchange rate from exchangerate-api.com, default (1:1) if it is unavailable"""
+    memory_key = (base_currency, target_currency)
+    remembered = exchange_rate_memory.get(memory_key)
+    if remembered and remembered[1] > time.monotonic():
+        return remembered[0]
+    
     try:
         # Cache kontrolü - exchange rate'leri günlük cache'leyelim
         cache_key = f"exchange_rate_{base_currency}_{target_currency}"
@@ -627,29 +942,30 @@ async def get_exchange_rate(base_currency: str, target_currency: str) -> float:
         })
         
         if cached_rate:
+            exchange_rate_memory[memory_key] = (cached_rate["rate"], time.monotonic() + EXCHANGE_RATE_MEMORY_TTL)
             return cached_rate["rate"]
         
         # API'den kur bilgisi al
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"https://api.exchangerate-api.com/v4/latest/{base_currency}")
-            if response.status_code == 200:
-                data = response.json()
-                rate = data["rates"].get(target_currency, 1.0)
-                
-                # Cache'e kaydet
-                await db.exchange_rates.insert_one({
-                    "cache_key": cache_key,
-                    "base_currency": base_currency,
-                    "target_currency": target_currency,
-                    "rate": rate,
-                    "created_at": datetime.utcnow()
-                })
-                
-                return rate
+        response = await get_http_client().get(f"https://api.exchangerate-api.com/v4/latest/{base_currency}")
+        if response.status_code == 200:
+            data = response.json()
+            rate = data["rates"].get(target_currency, 1.0)
+            
+            # Cache'e kaydet
+            await db.exchange_rates.insert_one({
+                "cache_key": cache_key,
+                "base_currency": base_currency,
+                "target_currency": target_currency,
+                "rate": rate,
+                "created_at": datetime.utcnow()
+            })
+            exchange_rate_memory[memory_key] = (rate, time.monotonic() + EXCHANGE_RATE_MEMORY_TTL)
+            
+            return rate
     except Exception as e:
         logger.error(f"Exchange rate fetch error: {e}")
     
-    return 1.0  # Fallback to 1:1 rate
+    return default
 
 def calculate_display_price(base_price: float, base_currency: str, target_currency: str, exchange_rate: float) -> PricingInfo:
     """Calculate display price with currency conversion"""
@@ -671,7 +987,69 @@ def calculate_display_price(base_price: float, base_currency: str, target_curren
         exchange_rate=rate
     )
 
+class CurrencyContext:
+    """A client's country, display currency and the rate from every other currency into it"""
+    __slots__ = ("country", "display_currency", "rates")
+
+    def __init__(self, country: str, display_currency: CurrencyCode, rates: Dict[str, float]):
+        self.country = country
+        self.display_currency = display_currency
+        self.rates = rates  # base currency -> rate into display_currency
+
+    def rate(self, base_currency: str) -> float:
+        return 1.0 if base_currency == self.display_currency.value else self.rates.get(base_currency, 1.0)
+
+    def pricing_info(self, base_price: float, base_currency: str, price_per_hour: Optional[float] = None) -> Optional[dict]:
+        """pricing_info of a price stored in base_currency, None if that already is the display currency"""
+        if base_currency == self.display_currency.value:
+            return None
+        exchange_rate = self.rate(base_currency)
+        pricing_info = calculate_display_price(base_price, base_currency, self.display_currency.value, exchange_rate).dict()
+        if price_per_hour:
+            pricing_info["display_price_per_hour"] = float(
+                Decimal(str(price_per_hour * exchange_rate)).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+            )
+        return pricing_info
+
+async def get_currency_context(request: Request) -> CurrencyContext:
+    """Dependency resolving the client's currency once per request, remembered per client IP"""
+    client_ip = request.client.host
+    now = time.monotonic()
+    remembered = currency_contexts.get(client_ip)
+    if remembered and remembered[1] > now:
+        currency_contexts.move_to_end(client_ip)
+        return remembered[0]
+    
+    country_code = await get_client_country_from_ip(client_ip, default=None)
+    display_currency = await get_display_currency(country_code or "TR")
+    bases = [base.value for base in CurrencyCode if base != display_currency]
+    rates = await asyncio.gather(*(get_exchange_rate(base, display_currency.value, default=None) for base in bases))
+    context = CurrencyContext(
+        country_code or "TR", display_currency,
+        {base: 1.0 if rate is None else rate for base, rate in zip(bases, rates)}
+    )
+    
+    # A lookup that fell back is served for a short while only, so the real answer replaces it soon
+    fell_back = country_code is None or None in rates
+    ttl = CURRENCY_CONTEXT_FALLBACK_TTL_SECONDS if fell_back else CURRENCY_CONTEXT_TTL_SECONDS
+    currency_contexts[client_ip] = (context, now + ttl)
+    currency_contexts.move_to_end(client_ip)
+    while len(currency_contexts) > CURRENCY_CONTEXT_MAX_CLIENTS:
+        currency_contexts.popitem(last=False)
+    return context
+
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    started = time.perf_counter()
+    try:
+        return await _get_current_user(credentials)
+    finally:
+        metrics_registry.observe_span("get_current_user", time.perf_counter() - started)
+
+def get_ownership() -> OwnershipIndex:
+    """Room/hotel ownership lookups for manager permission checks"""
+    return ownership_index
+
+async def _get_current_user(credentials: HTTPAuthorizationCredentials):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -694,7 +1072,7 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
         logger.error(f"JWT decode error: {e}")
         raise credentials_exception
     
-    user = await db.users.find_one({"email": email})
+    user = await queries.principal(email)
     if user is None:
         logger.error(f"User not found: {email}")
         raise credentials_exception
@@ -704,8 +1082,7 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
 @api_router.post("/auth/register", response_model=UserResponse)
 async def register(user_data: UserCreate):
     # Check if user already exists
-    existing_user = await db.users.find_one({"email": user_data.email})
-    if existing_user:
+    if await queries.email_taken(user_data.email):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
@@ -726,7 +1103,7 @@ async def register(user_data: UserCreate):
 
 @api_router.post("/auth/login", response_model=Token)
 async def login(user_credentials: UserLogin):
-    user = await db.users.find_one({"email": user_credentials.email})
+    user = await queries.login_user(user_credentials.email)
     if not user or not verify_password(user_credentials.password, user["password"]):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -772,52 +1149,219 @@ async def create_hotel(hotel_data: HotelCreate, current_user: dict = Depends(get
     hotel_dict["total_reviews"] = 0
     
     await db.hotels.insert_one(hotel_dict)
+    ownership_index.add_hotel(hotel_dict["id"], hotel_dict["manager_id"])
+    # City filters cover pending hotels too
+    search_index.mark_dirty("hotel", hotel_dict["id"])
     
     return HotelResponse(**hotel_dict)
 
+def invalidate_hotel_cache(hotel_id: str):
+    """Drop cached public reads and search entries that include this hotel"""
+    response_cache.invalidate("hotels", f"hotel:{hotel_id}", "room_facets")
+    search_index.mark_dirty("hotel", hotel_id)
+    geo_index.mark_dirty(hotel_id)
+    autocomplete_index.mark_dirty(hotel_id)
+    catalog_snapshot.mark_dirty("hotel", hotel_id)
+
+def invalidate_room_cache(room_id: str, hotel_id: Optional[str] = None):
+    """Drop cached public reads that include this room (every hotel room list if hotel_id is unknown)"""
+    response_cache.invalidate(f"room:{room_id}", f"hotel_rooms:{hotel_id}" if hotel_id else "rooms", "room_facets")
+    search_index.mark_dirty("room", room_id)
+    feature_index.mark_dirty(room_id)
+    catalog_snapshot.mark_dirty("room", room_id)
+
+def requested_fields(model, fields: Optional[str]) -> Optional[List[str]]:
+    """Fields of model picked by a ?fields= parameter (None = all), 400 for unknown names"""
+    try:
+        return sparse_fields(model, fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Unknown field: {e}")
+
+async def city_hotel_ids(city: str) -> List[str]:
+    """Ids of live hotels in a ?city= query.
+
+    Folded match from the search index, so "istanbul" finds "İstanbul" and vice
+    versa; until the index is built, the plain case-insensitive Mongo match.
+    """
+    if search_index.ready:
+        await search_index.sync()
+        return search_index.city_hotel_ids(city)
+    return await queries.hotel_ids({"city": {"$regex": re.escape(city), "$options": "i"}}, limit=None)
+
 @api_router.get("/hotels", response_model=List[HotelResponse])
 async def get_hotels(
+    request: Request,
     city: Optional[str] = None,
     star_rating: Optional[int] = None,
+    fields: Optional[str] = None,  # comma-separated response fields (id is always included), all by default
     skip: int = 0,
     limit: int = 20
 ):
-    filter_query = {"is_active": True, "approval_status": ApprovalStatus.APPROVED}  # Sadece onaylanmış oteller
+    selected = requested_fields(HotelResponse, fields)
     
-    if city:
-        filter_query["city"] = {"$regex": city, "$options": "i"}
-    if star_rating:
-        filter_query["star_rating"] = star_rating
+    async def compute():
+        filter_query = {"is_active": True, "approval_status": ApprovalStatus.APPROVED}  # Sadece onaylanmış oteller
+        
+        if city:
+            filter_query["id"] = {"$in": await city_hotel_ids(city)}
+        if star_rating:
+            filter_query["star_rating"] = star_rating
+        
+        if selected is not None:
+            hotels = await db.hotels.find(
+                filter_query, projection_for(HotelResponse, selected)
+            ).skip(skip).limit(limit).to_list(length=limit)
+            return trusted_documents(HotelResponse, hotels, selected)
+        
+        hotels = await db.hotels.find(filter_query).skip(skip).limit(limit).to_list(length=limit)
+        return [HotelResponse(**hotel) for hotel in hotels]
     
-    hotels = await db.hotels.find(filter_query).skip(skip).limit(limit).to_list(length=limit)
-    return [HotelResponse(**hotel) for hotel in hotels]
+    cache_key = response_cache.make_key(
+        "hotels", city=city, star_rating=star_rating, fields=",".join(selected or ()), skip=skip, limit=limit
+    )
+    return await response_cache.respond(request, cache_key, ["hotels"], compute)
+
+def validate_coordinates(**coordinates):
+    for name, value in coordinates.items():
+        limit = 90 if name in ("lat", "south", "north") else 180
+        if not -limit <= value <= limit:
+            raise HTTPException(status_code=400, detail=f"{name} must be between -{limit} and {limit}")
+
+@api_router.get("/hotels/nearby", response_model=List[GeoHotel])
+async def get_nearby_hotels(lat: float, lng: float, radius_km: float = 25, limit: int = 20):
+    """Approved hotels within radius_km of a point, nearest first"""
+    validate_coordinates(lat=lat, lng=lng)
+    if not 0 < radius_km <= MAX_NEARBY_RADIUS_KM:
+        raise HTTPException(status_code=400, detail=f"radius_km must be between 0 and {MAX_NEARBY_RADIUS_KM}")
+    await geo_index.sync()
+    hotels = geo_index.nearby(lat, lng, radius_km, max(1, min(limit, MAX_NEARBY_RESULTS)))
+    return trusted_response(GeoHotel, hotels)
+
+@api_router.get("/hotels/in-bounds", response_model=HotelsInBoundsResponse)
+async def get_hotels_in_bounds(
+    south: float,
+    west: float,
+    north: float,
+    east: float,
+    zoom: Optional[int] = None,
+    limit: int = 500
+):
+    """Approved hotels inside a map viewport (west > east crosses the antimeridian).
+
+    With zoom, hotels that share a cell a quarter map tile wide are returned as
+    clusters instead; the remaining single hotels are nearest to the viewport
+    center first.
+    """
+    validate_coordinates(south=south, north=north, west=west, east=east)
+    if south > north:
+        raise HTTPException(status_code=400, detail="south must not be greater than north")
+    if zoom is not None and not 0 <= zoom <= MAX_MAP_ZOOM:
+        raise HTTPException(status_code=400, detail=f"zoom must be between 0 and {MAX_MAP_ZOOM}")
+    await geo_index.sync()
+    
+    hotels = list(geo_index.in_bounds(south, west, north, east))
+    total = len(hotels)
+    clusters = []
+    if zoom is not None:
+        hotels, clusters = geo_index.clustered(hotels, zoom)
+    
+    center_lat = (south + north) / 2
+    center_lng = (west + east) / 2 if west <= east else ((west + east + 360) / 2 + 180) % 360 - 180
+    hotels.sort(key=lambda hotel: (haversine_km(center_lat, center_lng, hotel["latitude"], hotel["longitude"]), hotel["id"]))
+    # Copies: the dicts belong to geo_index and trusted_documents fills defaults in place
+    page = [dict(hotel) for hotel in hotels[:max(1, min(limit, MAX_IN_BOUNDS_RESULTS))]]
+    return ORJSONResponse({
+        "total": total,
+        "hotels": trusted_documents(GeoHotel, page),
+        "clusters": clusters
+    })
 
 @api_router.get("/hotels/{hotel_id}", response_model=HotelResponse)
-async def get_hotel(hotel_id: str):
-    hotel = await db.hotels.find_one({"id": hotel_id, "is_active": True})
-    if not hotel:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Hotel not found"
+async def get_hotel(hotel_id: str, request: Request):
+    async def compute():
+        hotel = await db.hotels.find_one({"id": hotel_id, "is_active": True})
+        if not hotel:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Hotel not found"
+            )
+        return HotelResponse(**hotel)
+    
+    cache_key = response_cache.make_key("hotel", hotel_id=hotel_id)
+    return await response_cache.respond(request, cache_key, [f"hotel:{hotel_id}"], compute)
+
+@api_router.get("/hotels/{hotel_id}/full", response_model=HotelDetailResponse)
+async def get_hotel_full(
+    hotel_id: str,
+    request: Request,
+    currency: CurrencyContext = Depends(get_currency_context)
+):
+    """Hotel, rooms, services and newest reviews in one payload for the hotel page.
+
+    The four reads run concurrently and share one display currency; the
+    ETag covers the whole payload, so it changes when any part does.
+    """
+    async def compute():
+        hotel, rooms, services, reviews = await asyncio.gather(
+            db.hotels.find_one({"id": hotel_id, "is_active": True}),
+            priced_hotel_rooms(hotel_id, currency),
+            priced_hotel_services(hotel_id, currency),
+            db.reviews.find({"hotel_id": hotel_id}).sort("created_at", -1).limit(HOTEL_DETAIL_REVIEWS).to_list(length=HOTEL_DETAIL_REVIEWS)
         )
-    return HotelResponse(**hotel)
+        if not hotel:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Hotel not found"
+            )
+        return HotelDetailResponse(
+            hotel=HotelResponse(**hotel),
+            rooms=rooms,
+            services=services,
+            reviews=[ReviewResponse(**review) for review in reviews],
+            currency=currency.display_currency
+        )
+    
+    cache_key = response_cache.make_key("hotel_full", hotel_id=hotel_id, currency=currency.display_currency.value)
+    tags = [
+        f"hotel:{hotel_id}", "rooms", f"hotel_rooms:{hotel_id}", "services", f"hotel_services:{hotel_id}",
+        f"hotel_reviews:{hotel_id}"
+    ]
+    return await response_cache.respond(request, cache_key, tags, compute)
+
+@api_router.get("/search", response_model=SearchResponse)
+async def search(q: str, type: Optional[str] = None, limit: int = 20):
+    """Ranked full-text search over approved hotels and rooms (prefix matching on every word)"""
+    if type not in (None, "hotel", "room"):
+        raise HTTPException(status_code=400, detail="type must be hotel or room")
+    await search_index.sync()
+    hits = search_index.search(q, kind=type, limit=max(1, min(limit, MAX_SEARCH_RESULTS)))
+    return SearchResponse(query=q, results=[SearchHit(**hit) for hit in hits])
+
+@api_router.get("/autocomplete", response_model=List[AutocompleteSuggestion])
+async def autocomplete(prefix: str, limit: int = 8):
+    """City and hotel name suggestions for the search box, most booked first"""
+    await autocomplete_index.sync()
+    return trusted_response(
+        AutocompleteSuggestion, autocomplete_index.suggest(prefix, max(1, min(limit, MAX_AUTOCOMPLETE_RESULTS)))
+    )
 
 # Conference Room Routes
 @api_router.post("/hotels/{hotel_id}/rooms", response_model=ConferenceRoomResponse)
 async def create_conference_room(
     hotel_id: str,
     room_data: ConferenceRoomCreate,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user),
+    ownership: OwnershipIndex = Depends(get_ownership)
 ):
     # Check if hotel exists and user has permission
-    hotel = await db.hotels.find_one({"id": hotel_id, "is_active": True})
-    if not hotel:
+    manager_id = await ownership.hotel_manager(hotel_id)
+    if manager_id is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Hotel not found"
         )
     
-    if current_user["role"] == UserRole.HOTEL_MANAGER and hotel["manager_id"] != current_user["id"]:
+    if current_user["role"] == UserRole.HOTEL_MANAGER and manager_id != current_user["id"]:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You can only manage your own hotel's rooms"
@@ -835,61 +1379,62 @@ async def create_conference_room(
     room_dict["approval_status"] = ApprovalStatus.PENDING  # Yönetici onayı bekliyor
     room_dict["average_rating"] = 0.0
     room_dict["total_bookings"] = 0
+    feature_mask = await feature_index.encode(room_dict["features"], room_dict["layout_options"])
+    room_dict["feature_mask"] = to_binary(feature_mask)
     
     await db.conference_rooms.insert_one(room_dict)
+    ownership_index.add_room(room_dict["id"], hotel_id)
+    feature_index.add(room_dict["id"], feature_mask)
     
     return ConferenceRoomResponse(**room_dict)
 
-@api_router.get("/hotels/{hotel_id}/rooms", response_model=List[ConferenceRoomResponse])
-async def get_hotel_rooms(hotel_id: str, request: Request):
+async def priced_hotel_rooms(hotel_id: str, currency: CurrencyContext) -> List[ConferenceRoomResponse]:
+    """A hotel's approved, available rooms priced in the display currency"""
     rooms = await db.conference_rooms.find({
         "hotel_id": hotel_id,
         "is_available": True,
         "approval_status": ApprovalStatus.APPROVED  # Sadece onaylanmış odalar
     }).to_list(length=100)
     
-    # Kur bilgisi hesapla
-    client_ip = request.client.host
-    country_code = await get_client_country_from_ip(client_ip)
-    display_currency = await get_display_currency(country_code)
-    
     # Her oda için fiyat hesapla
     for room in rooms:
-        base_currency = room.get("currency", "EUR")
-        if base_currency != display_currency.value:
-            exchange_rate = await get_exchange_rate(base_currency, display_currency.value)
-            room["pricing_info"] = calculate_display_price(
-                room["price_per_day"], base_currency, display_currency.value, exchange_rate
-            ).dict()
-            
-            if room.get("price_per_hour"):
-                room["pricing_info"]["display_price_per_hour"] = float(
-                    Decimal(str(room["price_per_hour"] * exchange_rate)).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
-                )
+        room["pricing_info"] = currency.pricing_info(
+            room["price_per_day"], room.get("currency", "EUR"), room.get("price_per_hour")
+        )
     
     return [ConferenceRoomResponse(**room) for room in rooms]
 
-@api_router.get("/rooms", response_model=List[ConferenceRoomResponse])
-async def search_rooms(
+@api_router.get("/hotels/{hotel_id}/rooms", response_model=List[ConferenceRoomResponse])
+async def get_hotel_rooms(
+    hotel_id: str,
     request: Request,
-    city: Optional[str] = None,
-    min_capacity: Optional[int] = None,
-    max_price: Optional[float] = None,
-    features: Optional[str] = None,  # comma-separated features
-    skip: int = 0,
-    limit: int = 20
+    currency: CurrencyContext = Depends(get_currency_context)
 ):
+    async def compute():
+        return await priced_hotel_rooms(hotel_id, currency)
+    
+    cache_key = response_cache.make_key("hotel_rooms", hotel_id=hotel_id, currency=currency.display_currency.value)
+    return await response_cache.respond(request, cache_key, ["rooms", f"hotel_rooms:{hotel_id}"], compute)
+
+async def room_search_filter(
+    city: Optional[str],
+    min_capacity: Optional[int],
+    max_price: Optional[float],
+    features: Optional[str],
+    layouts: Optional[str]
+) -> Optional[dict]:
+    """Room filter shared by the room search and its facet counts, None if nothing can match"""
     # First get hotels matching city filter if provided
-    hotel_filter = {"is_active": True}
+    hotel_filter = {"is_active": True, "approval_status": ApprovalStatus.APPROVED}
     if city:
-        hotel_filter["city"] = {"$regex": city, "$options": "i"}
+        hotel_filter["id"] = {"$in": await city_hotel_ids(city)}
     
-    hotels = await db.hotels.find(hotel_filter).to_list(length=1000)
-    hotel_ids = [hotel["id"] for hotel in hotels]
+    hotel_ids = await queries.hotel_ids(hotel_filter)
     
     # Build room filter
     room_filter = {
         "is_available": True,
+        "approval_status": ApprovalStatus.APPROVED,
         "hotel_id": {"$in": hotel_ids}
     }
     
@@ -897,77 +1442,285 @@ async def search_rooms(
         room_filter["capacity"] = {"$gte": min_capacity}
     if max_price:
         room_filter["price_per_day"] = {"$lte": max_price}
-    if features:
-        feature_list = [f.strip() for f in features.split(",")]
-        room_filter["features"] = {"$in": feature_list}
-    
-    rooms = await db.conference_rooms.find(room_filter).skip(skip).limit(limit).to_list(length=limit)
+    if features or layouts:
+        await feature_index.sync()
+        required = feature_index.mask_of(
+            features.split(",") if features else (), layouts.split(",") if layouts else ()
+        )
+        room_ids = feature_index.matching(required) if required is not None else []
+        if not room_ids:
+            return None
+        if len(room_ids) <= MAX_FEATURE_ID_FILTER:
+            room_filter["id"] = {"$in": room_ids}
+        else:
+            # Too many to pass as ids, let Mongo test the stored masks instead
+            room_filter["feature_mask"] = {"$bitsAllSet": bit_positions(required)}
     
-    # Kur bilgisi hesapla
-    client_ip = request.client.host
-    country_code = await get_client_country_from_ip(client_ip)
-    display_currency = await get_display_currency(country_code)
+    return room_filter
+
+@api_router.get("/rooms", response_model=List[ConferenceRoomResponse])
+async def search_rooms(
+    city: Optional[str] = None,
+    min_capacity: Optional[int] = None,
+    max_price: Optional[float] = None,
+    features: Optional[str] = None,  # comma-separated features, rooms must have all of them
+    layouts: Optional[str] = None,  # comma-separated layout options, rooms must offer all of them
+    sort: Optional[str] = None,  # price / -price (in the display currency), capacity / -capacity, rating; oldest first by default
+    fields: Optional[str] = None,  # comma-separated response fields (id is always included), all by default
+    skip: int = 0,
+    limit: int = 20,
+    currency: CurrencyContext = Depends(get_currency_context)
+):
+    if sort is not None and sort not in SORT_ORDERS:
+        raise HTTPException(status_code=400, detail=f"sort must be one of {', '.join(SORT_ORDERS)}")
+    selected = requested_fields(ConferenceRoomResponse, fields)
+    skip = max(skip, 0)
+    limit = max(1, min(limit, MAX_ROOM_SEARCH_RESULTS))
+    with_prices = selected is None or "pricing_info" in selected
+    # Stored fields to read: the selected ones plus what pricing_info is computed from
+    loaded = None if selected is None else list(dict.fromkeys(selected + (ROOM_PRICING_FIELDS if with_prices else [])))
+    
+    if catalog_snapshot.ready:
+        # Filter, sort and page over the in-memory columns, hydrating only the page
+        await catalog_snapshot.sync()
+        hotel_ids = None
+        if city:
+            hotel_ids = await city_hotel_ids(city)
+        required = 0
+        if features or layouts:
+            await feature_index.sync()
+            required = feature_index.mask_of(
+                features.split(",") if features else (), layouts.split(",") if layouts else ()
+            )
+            if required is None:
+                return trusted_response(ConferenceRoomResponse, [])
+        rows = catalog_snapshot.search(hotel_ids, min_capacity, max_price, required, sort, currency.rates)
+        rooms = catalog_snapshot.page(rows, skip, limit, loaded)
+    else:
+        room_filter = await room_search_filter(city, min_capacity, max_price, features, layouts)
+        if room_filter is None:
+            return trusted_response(ConferenceRoomResponse, [])
+        
+        rooms = await db.conference_rooms.find(
+            room_filter, projection_for(ConferenceRoomResponse, loaded)
+        ).sort(ROOM_SORT_FIELDS[sort]).skip(skip).limit(limit).to_list(length=limit)
     
     # Her oda için fiyat hesapla
-    for room in rooms:
-        base_currency = room.get("currency", "EUR")
-        if base_currency != display_currency.value:
-            exchange_rate = await get_exchange_rate(base_currency, display_currency.value)
-            room["pricing_info"] = calculate_display_price(
-                room["price_per_day"], base_currency, display_currency.value, exchange_rate
-            ).dict()
+    for room in rooms if with_prices else ():
+        room["pricing_info"] = currency.pricing_info(
+            room["price_per_day"], room.get("currency", "EUR"), room.get("price_per_hour")
+        )
+    
+    return trusted_response(ConferenceRoomResponse, rooms, selected)
+
+def range_facet(rows: list, boundaries: list) -> List[RangeFacetCount]:
+    """$bucket rows as every range of boundaries (empty ones included) plus the open-ended top range"""
+    counts = {row["_id"]: row["count"] for row in rows}
+    ranges = [
+        RangeFacetCount(min=low, max=high, count=counts.get(low, 0))
+        for low, high in zip(boundaries, boundaries[1:])
+    ]
+    ranges.append(RangeFacetCount(min=boundaries[-1], count=counts.get("overflow", 0)))
+    return ranges
+
+@api_router.get("/rooms/facets", response_model=RoomFacetsResponse)
+async def get_room_facets(
+    request: Request,
+    city: Optional[str] = None,
+    min_capacity: Optional[int] = None,
+    max_price: Optional[float] = None,
+    features: Optional[str] = None,
+    layouts: Optional[str] = None,
+    count_features: Optional[str] = None,  # comma-separated features always counted (0 included), e.g. the ones a UI lists
+    currency: CurrencyContext = Depends(get_currency_context)
+):
+    """Counts per city, capacity, price (display currency), feature, room type and star rating
+    for the rooms a /rooms search with the same filters would return"""
+    display_currency = currency.display_currency
+    # Features match case-insensitively, as in the filters (feature_index), and are reported lowercased
+    counted = list(dict.fromkeys(
+        value.strip().lower() for value in (count_features or "").split(",") if value.strip()
+    ))[:MAX_FEATURE_FACETS]
+    
+    async def compute():
+        price_buckets = PRICE_BUCKETS[display_currency]
+        room_filter = await room_search_filter(city, min_capacity, max_price, features, layouts)
+        if room_filter is None:
+            facets = {}
+        else:
+            # Price in the display currency, one branch per other base currency
+            branches = []
+            for base, rate in currency.rates.items():
+                branches.append({"case": {"$eq": [{"$ifNull": ["$currency", "EUR"]}, base]}, "then": rate})
+            display_price = {"$multiply": ["$price_per_day", {"$switch": {"branches": branches, "default": 1}}]}
             
-            if room.get("price_per_hour"):
-                room["pricing_info"]["display_price_per_hour"] = float(
-                    Decimal(str(room["price_per_hour"] * exchange_rate)).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
-                )
+            pipeline = [
+                {"$match": room_filter},
+                {"$facet": {
+                    "hotels": [{"$group": {"_id": "$hotel_id", "count": {"$sum": 1}}}],
+                    "capacity": [{"$bucket": {
+                        "groupBy": "$capacity", "boundaries": CAPACITY_BUCKETS,
+                        "default": "overflow", "output": {"count": {"$sum": 1}}
+                    }}],
+                    "price": [{"$bucket": {
+                        "groupBy": display_price, "boundaries": price_buckets,
+                        "default": "overflow", "output": {"count": {"$sum": 1}}
+                    }}],
+                    "features": [
+                        {"$unwind": "$features"},
+                        {"$group": {"_id": {"$toLower": "$features"}, "rooms": {"$addToSet": "$_id"}}},
+                        {"$project": {"count": {"$size": "$rooms"}}},
+                        {"$sort": {"count": -1, "_id": 1}},
+                        {"$limit": MAX_FEATURE_FACETS}
+                    ],
+                    "counted_features": [
+                        {"$unwind": "$features"},
+                        {"$project": {"feature": {"$toLower": "$features"}}},
+                        {"$match": {"feature": {"$in": counted}}},
+                        {"$group": {"_id": "$feature", "rooms": {"$addToSet": "$_id"}}},
+                        {"$project": {"count": {"$size": "$rooms"}}}
+                    ],
+                    "room_types": [
+                        {"$group": {"_id": "$room_type", "count": {"$sum": 1}}},
+                        {"$sort": {"count": -1, "_id": 1}}
+                    ]
+                }}
+            ]
+            results = await db.conference_rooms.aggregate(pipeline).to_list(length=1)
+            facets = results[0] if results else {}
+        
+        feature_counts = [FacetCount(value=row["_id"], count=row["count"]) for row in facets.get("features", [])]
+        listed = {facet.value for facet in feature_counts}
+        counted_rows = {row["_id"]: row["count"] for row in facets.get("counted_features", [])}
+        feature_counts += [
+            FacetCount(value=value, count=counted_rows.get(value, 0)) for value in counted if value not in listed
+        ]
+        
+        # Rooms are counted per hotel in Mongo, city and star rating are folded in from the hotels here
+        per_hotel = {row["_id"]: row["count"] for row in facets.get("hotels", [])}
+        cities = {}
+        star_ratings = {}
+        if per_hotel:
+            async for hotel in db.hotels.find(
+                {"id": {"$in": list(per_hotel)}}, {"_id": 0, "id": 1, "city": 1, "star_rating": 1}
+            ):
+                count = per_hotel[hotel["id"]]
+                # Spellings of one city ("İstanbul", "istanbul") share a bucket named by the first seen
+                city_entry = cities.setdefault(fold(hotel.get("city")).strip(), [hotel.get("city"), 0])
+                city_entry[1] += count
+                stars = str(hotel["star_rating"]) if hotel.get("star_rating") else "unrated"
+                star_ratings[stars] = star_ratings.get(stars, 0) + count
+        
+        return RoomFacetsResponse(
+            currency=display_currency,
+            total=sum(per_hotel.values()),
+            cities=[
+                FacetCount(value=name, count=count)
+                for name, count in sorted(cities.values(), key=lambda entry: (-entry[1], entry[0]))
+            ],
+            capacity=range_facet(facets.get("capacity", []), CAPACITY_BUCKETS),
+            price=range_facet(facets.get("price", []), price_buckets),
+            features=feature_counts,
+            room_types=[
+                FacetCount(value=row["_id"] or "conference", count=row["count"]) for row in facets.get("room_types", [])
+            ],
+            star_ratings=[
+                FacetCount(value=stars, count=count)
+                for stars, count in sorted(star_ratings.items(), key=lambda item: -int(item[0]) if item[0] != "unrated" else 1)
+            ]
+        )
     
-    return [ConferenceRoomResponse(**room) for room in rooms]
+    # Filter signature: list filters are order- and case-insensitive
+    def normalized(values: Optional[str]) -> str:
+        return ",".join(sorted({value.strip().lower() for value in values.split(",") if value.strip()})) if values else ""
+    
+    cache_key = response_cache.make_key(
+        "room_facets", city=fold(city).strip(), min_capacity=min_capacity, max_price=max_price,
+        features=normalized(features), layouts=normalized(layouts), counted=",".join(sorted(counted)),
+        currency=display_currency.value
+    )
+    return await response_cache.respond(request, cache_key, ["room_facets"], compute)
 
-@api_router.get("/rooms/{room_id}", response_model=ConferenceRoomResponse)
-async def get_room(room_id: str, request: Request):
-    room = await db.conference_rooms.find_one({"id": room_id, "is_available": True})
-    if not room:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Conference room not found"
+@api_router.get("/rooms/batch", response_model=List[RoomDetails])
+async def get_rooms_batch(ids: str, currency: CurrencyContext = Depends(get_currency_context)):
+    """Several rooms with their hotel summary and services in one round trip (room comparison).
+
+    ids is comma-separated; rooms come back in that order, unknown or unavailable ones are left out.
+    """
+    room_ids = list(dict.fromkeys(room_id.strip() for room_id in ids.split(",") if room_id.strip()))
+    if len(room_ids) > MAX_BATCH_ROOMS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_ROOMS} rooms can be fetched at once")
+    if not room_ids:
+        return trusted_response(RoomDetails, [])
+    
+    rooms = await db.conference_rooms.find(
+        {"id": {"$in": room_ids}, "is_available": True}, projection_for(ConferenceRoomResponse)
+    ).to_list(length=len(room_ids))
+    hotel_ids = list({room["hotel_id"] for room in rooms})
+    hotels, services = await asyncio.gather(
+        db.hotels.find({"id": {"$in": hotel_ids}}, BATCH_HOTEL_PROJECTION).to_list(length=len(hotel_ids)),
+        db.extra_services.find(
+            {"hotel_id": {"$in": hotel_ids}, "is_available": True}, projection_for(ExtraServiceResponse)
+        ).to_list(length=100 * len(hotel_ids))
+    )
+    
+    services_by_hotel = {}
+    for service in trusted_documents(ExtraServiceResponse, services):
+        service["pricing_info"] = currency.pricing_info(service["price"], service.get("currency", "EUR"))
+        services_by_hotel.setdefault(service["hotel_id"], []).append(service)
+    
+    hotels_by_id = {}
+    for hotel in trusted_documents(RoomHotelSummary, hotels):
+        images = hotel.pop("images", None)
+        hotel["image"] = images[0] if images else None
+        hotels_by_id[hotel["id"]] = hotel
+    
+    for room in rooms:
+        room["pricing_info"] = currency.pricing_info(
+            room["price_per_day"], room.get("currency", "EUR"), room.get("price_per_hour")
         )
+        room["hotel"] = hotels_by_id.get(room["hotel_id"])
+        room["services"] = services_by_hotel.get(room["hotel_id"], [])
     
-    # Kur bilgisi hesapla
-    client_ip = request.client.host
-    country_code = await get_client_country_from_ip(client_ip)
-    display_currency = await get_display_currency(country_code)
-    
-    base_currency = room.get("currency", "EUR")
-    if base_currency != display_currency.value:
-        exchange_rate = await get_exchange_rate(base_currency, display_currency.value)
-        room["pricing_info"] = calculate_display_price(
-            room["price_per_day"], base_currency, display_currency.value, exchange_rate
-        ).dict()
-        
-        if room.get("price_per_hour"):
-            room["pricing_info"]["display_price_per_hour"] = float(
-                Decimal(str(room["price_per_hour"] * exchange_rate)).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+    position = {room_id: index for index, room_id in enumerate(room_ids)}
+    rooms.sort(key=lambda room: position[room["id"]])
+    return trusted_response(RoomDetails, rooms)
+
+@api_router.get("/rooms/{room_id}", response_model=ConferenceRoomResponse)
+async def get_room(room_id: str, request: Request, currency: CurrencyContext = Depends(get_currency_context)):
+    async def compute():
+        room = await db.conference_rooms.find_one({"id": room_id, "is_available": True})
+        if not room:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Conference room not found"
             )
+        
+        room["pricing_info"] = currency.pricing_info(
+            room["price_per_day"], room.get("currency", "EUR"), room.get("price_per_hour")
+        )
+        return ConferenceRoomResponse(**room)
     
-    return ConferenceRoomResponse(**room)
+    cache_key = response_cache.make_key("room", room_id=room_id, currency=currency.display_currency.value)
+    return await response_cache.respond(request, cache_key, ["rooms", f"room:{room_id}"], compute)
 
 # Extra Services Routes
 @api_router.post("/hotels/{hotel_id}/services", response_model=ExtraServiceResponse)
 async def create_extra_service(
     hotel_id: str,
     service_data: ExtraServiceCreate,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user),
+    ownership: OwnershipIndex = Depends(get_ownership)
 ):
     # Check permissions
-    hotel = await db.hotels.find_one({"id": hotel_id, "is_active": True})
-    if not hotel:
+    manager_id = await ownership.hotel_manager(hotel_id)
+    if manager_id is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Hotel not found"
         )
     
-    if current_user["role"] == UserRole.HOTEL_MANAGER and hotel["manager_id"] != current_user["id"]:
+    if current_user["role"] == UserRole.HOTEL_MANAGER and manager_id != current_user["id"]:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You can only manage your own hotel's services"
@@ -983,10 +1736,277 @@ async def create_extra_service(
     service_dict["hotel_id"] = hotel_id
     service_dict["created_at"] = datetime.utcnow()
     
-    await db.extra_services.insert_one(service_dict)
+    try:
+        await db.extra_services.insert_one(service_dict)
+    except DuplicateKeyError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"This hotel already has a service named '{service_data.name}'"
+        )
+    response_cache.invalidate(f"hotel_services:{hotel_id}")
     
     return ExtraServiceResponse(**service_dict)
 
+# Default catering, transfer and event services seeded for new hotels (prices in EUR)
+DEFAULT_EXTRA_SERVICES = [
+    # Catering Services
+    {
+        "name": "Sabah Kahvaltısı",
+        "description": "Açık büfe kahvaltı, sıcak ve soğuk içecekler, reçel, peynir çeşitleri",
+        "price": 15.0,
+        "currency": "EUR",
+        "unit": "person",
+        "category": "catering",
+        "service_type": "breakfast",
+        "capacity_per_service": 1
+    },
+    {
+        "name": "Öğle Yemeği",
+        "description": "2 çorba, 4 ana yemek, salata büfesi, tatlı, sıcak ve soğuk içecekler",
+        "price": 28.0,
+        "currency": "EUR",
+        "unit": "person",
+        "category": "catering",
+        "service_type": "lunch",
+        "capacity_per_service": 1
+    },
+    {
+        "name": "Akşam Yemeği",
+        "description": "Premium menü, çorba, ana yemek, tatlı, limitsiz içecek servisi",
+        "price": 40.0,
+        "currency": "EUR",
+        "unit": "person",
+        "category": "catering",
+        "service_type": "dinner",
+        "capacity_per_service": 1
+    },
+    {
+        "name": "Kahve Molası",
+        "description": "Türk kahvesi, çay, kurabiye, küçük tatlılar",
+        "price": 8.0,
+        "currency": "EUR",
+        "unit": "person",
+        "category": "refreshment",
+        "service_type": "coffee_break",
+        "capacity_per_service": 1
+    },
+    {
+        "name": "Premium Kahve & Atıştırmalık",
+        "description": "Espresso, cappuccino, taze sandviçler, meyve, kuruyemiş",
+        "price": 12.0,
+        "currency": "EUR",
+        "unit": "person",
+        "category": "refreshment",
+        "service_type": "coffee_break",
+        "capacity_per_service": 1
+    },
+    
+    # Personel & Destek Hizmetleri
+    {
+        "name": "Hostesin Desteği",
+        "description": "Profesyonel hostesle etkinlik desteği, karşılama ve yönlendirme",
+        "price": 25.0,
+        "currency": "EUR",
+        "unit": "hour",
+        "category": "service",
+        "service_type": "hostess_support",
+        "capacity_per_service": 1
+    },
+    {
+        "name": "Teknik Destek",
+        "description": "Profesyonel ses ve görüntü teknisyeni desteği",
+        "price": 35.0,
+        "currency": "EUR",
+        "unit": "hour",
+        "category": "service",
+        "service_type": "technical_support",
+        "capacity_per_service": 1
+    },
+    {
+        "name": "Çevirmen Desteği",
+        "description": "İngilizce/Türkçe simultane çevirmen hizmeti",
+        "price": 50.0,
+        "currency": "EUR",
+        "unit": "hour",
+        "category": "service",
+        "service_type": "interpreter",
+        "capacity_per_service": 1
+    },
+    
+    # Transfer Services
+    {
+        "name": "Havalimanı Transfer",
+        "description": "İstanbul Havalimanı ↔ Otel arası transfer hizmeti (lüks araç)",
+        "price": 80.0,
+        "currency": "EUR",
+        "unit": "trip",
+        "category": "transport",
+        "service_type": "airport_transfer",
+        "duration_minutes": 60,
+        "capacity_per_service": 4
+    },
+    {
+        "name": "Sabiha Gökçen Transfer",
+        "description": "Sabiha Gökçen Havalimanı ↔ Otel arası transfer hizmeti",
+        "price": 95.0,
+        "currency": "EUR",
+        "unit": "trip",
+        "category": "transport",
+        "service_type": "airport_transfer",
+        "duration_minutes": 90,
+        "capacity_per_service": 4
+    },
+    {
+        "name": "Şehir İçi Transfer",
+        "description": "İstanbul şehir merkezindeki önemli noktalara transfer",
+        "price": 50.0,
+        "currency": "EUR",
+        "unit": "trip",
+        "category": "transport",
+        "service_type": "city_transfer",
+        "duration_minutes": 30,
+        "capacity_per_service": 4
+    },
+    {
+        "name": "Grup Transfer (Minibüs)",
+        "description": "8-15 kişilik grup transferi için minibüs hizmeti",
+        "price": 130.0,
+        "currency": "EUR",
+        "unit": "trip",
+        "category": "transport",
+        "service_type": "group_transfer",
+        "duration_minutes": 45,
+        "capacity_per_service": 15
+    },
+    
+    # Etkinlik & Eğlence Hizmetleri
+    {
+        "name": "Koktey Servisi",
+        "description": "Premium içecek servisi, özel kokteyller, profesyonel barista",
+        "price": 18.0,
+        "currency": "EUR",
+        "unit": "person",
+        "category": "catering",
+        "service_type": "cocktail_service",
+        "capacity_per_service": 1
+    },
+    {
+        "name": "Doğum Günü Pastası",
+        "description": "Özel tasarım doğum günü pastası, kişiye özel mesaj",
+        "price": 150.0,
+        "currency": "EUR",
+        "unit": "piece",
+        "category": "catering",
+        "service_type": "birthday_cake",
+        "capacity_per_service": 20
+    },
+    {
+        "name": "Çiçek Düzenleme",
+        "description": "Profesyonel çiçek aranjmanı, masa ve sahne dekorasyonu",
+        "price": 250.0,
+        "currency": "EUR",
+        "unit": "set",
+        "category": "decoration",
+        "service_type": "flower_arrangement",
+        "capacity_per_service": 1
+    },
+    {
+        "name": "Fotoğrafçı Hizmeti",
+        "description": "Profesyonel fotoğrafçı, etkinlik çekimi, dijital albüm",
+        "price": 80.0,
+        "currency": "EUR",
+        "unit": "hour",
+        "category": "service",
+        "service_type": "photographer",
+        "capacity_per_service": 1
+    },
+    {
+        "name": "Müzik Grubu",
+        "description": "Canlı müzik performansı, DJ veya akustik grup seçenekleri",
+        "price": 200.0,
+        "currency": "EUR",
+        "unit": "hour",
+        "category": "entertainment",
+        "service_type": "live_music",
+        "capacity_per_service": 1
+    },
+    {
+        "name": "Sahne Düzenlemesi",
+        "description": "Profesyonel sahne kurulumu, podyum, dekorasyon",
+        "price": 350.0,
+        "currency": "EUR",
+        "unit": "set",
+        "category": "equipment",
+        "service_type": "stage_setup",
+        "capacity_per_service": 1
+    },
+    {
+        "name": "LED Ekran Kiralama",
+        "description": "Büyük boy LED ekran, full HD görüntü, teknik destek dahil",
+        "price": 120.0,
+        "currency": "EUR",
+        "unit": "day",
+        "category": "equipment",
+        "service_type": "led_screen",
+        "capacity_per_service": 1
+    },
+    {
+        "name": "Ekstra Ses Sistemi",
+        "description": "Güçlendirilmiş ses sistemi, ekstra hoparlörler, mikrofon seti",
+        "price": 80.0,
+        "currency": "EUR",
+        "unit": "day",
+        "category": "equipment",
+        "service_type": "extra_sound_system",
+        "capacity_per_service": 1
+    }
+]
+
+async def seed_default_services(hotel_ids: List[str], update_existing: bool = False) -> dict:
+    """Upsert DEFAULT_EXTRA_SERVICES for the given hotels with a single bulk_write.
+
+    Upserts are keyed on the unique (hotel_id, name) index, so repeated or
+    concurrent calls never create duplicates (see create_service_name_index). With update_existing the template
+    fields of already seeded services are refreshed too.
+    """
+    operations = []
+    keys = []
+    now = datetime.utcnow()
+    for hotel_id in hotel_ids:
+        for template in DEFAULT_EXTRA_SERVICES:
+            insert_only = {"id": str(uuid.uuid4()), "hotel_id": hotel_id, "created_at": now, "is_available": True}
+            fields = {k: v for k, v in template.items() if k != "name"}
+            if update_existing:
+                update = {"$set": fields, "$setOnInsert": insert_only}
+            else:
+                update = {"$setOnInsert": {**fields, **insert_only}}
+            operations.append(UpdateOne({"hotel_id": hotel_id, "name": template["name"]}, update, upsert=True))
+            keys.append((hotel_id, template["name"]))
+    
+    if not operations:
+        return {"created_services": [], "created": 0, "updated": 0}
+    
+    try:
+        result = await db.extra_services.bulk_write(operations, ordered=False)
+        upserted = result.upserted_ids
+        modified = result.modified_count
+    except BulkWriteError as e:
+        # A concurrent seed won the race for some keys, those already exist
+        if any(error.get("code") != 11000 for error in e.details.get("writeErrors", [])):
+            raise
+        upserted = {item["index"]: item["_id"] for item in e.details.get("upserted", [])}
+        modified = e.details.get("nModified", 0)
+    
+    if upserted or modified:
+        response_cache.invalidate(*(f"hotel_services:{hotel_id}" for hotel_id in hotel_ids))
+    
+    created = [keys[index] for index in sorted(upserted)]
+    return {
+        "created_services": [name for _, name in created],
+        "created": len(created),
+        "updated": modified
+    }
+
 @api_router.post("/hotels/{hotel_id}/services/default")
 async def create_default_services(
     hotel_id: str,
@@ -994,7 +2014,7 @@ async def create_default_services(
 ):
     """Create default catering and transfer services for a hotel"""
     # Check permissions
-    hotel = await db.hotels.find_one({"id": hotel_id, "is_active": True})
+    hotel = await queries.hotel_summary(hotel_id, is_active=True)
     if not hotel:
         raise HTTPException(status_code=404, detail="Hotel not found")
     
@@ -1003,238 +2023,8 @@ async def create_default_services(
     elif current_user["role"] == UserRole.CUSTOMER:
         raise HTTPException(status_code=403, detail="Customers cannot create services")
     
-    # Default catering services (prices in EUR)
-    default_services = [
-        # Catering Services
-        {
-            "name": "Sabah Kahvaltısı",
-            "description": "Açık büfe kahvaltı, sıcak ve soğuk içecekler, reçel, peynir çeşitleri",
-            "price": 15.0,
-            "currency": "EUR",
-            "unit": "person",
-            "category": "catering",
-            "service_type": "breakfast",
-            "capacity_per_service": 1
-        },
-        {
-            "name": "Öğle Yemeği",
-            "description": "2 çorba, 4 ana yemek, salata büfesi, tatlı, sıcak ve soğuk içecekler",
-            "price": 28.0,
-            "currency": "EUR",
-            "unit": "person",
-            "category": "catering",
-            "service_type": "lunch",
-            "capacity_per_service": 1
-        },
-        {
-            "name": "Akşam Yemeği",
-            "description": "Premium menü, çorba, ana yemek, tatlı, limitsiz içecek servisi",
-            "price": 40.0,
-            "currency": "EUR",
-            "unit": "person",
-            "category": "catering",
-            "service_type": "dinner",
-            "capacity_per_service": 1
-        },
-        {
-            "name": "Kahve Molası",
-            "description": "Türk kahvesi, çay, kurabiye, küçük tatlılar",
-            "price": 8.0,
-            "currency": "EUR",
-            "unit": "person",
-            "category": "refreshment",
-            "service_type": "coffee_break",
-            "capacity_per_service": 1
-        },
-        {
-            "name": "Premium Kahve & Atıştırmalık",
-            "description": "Espresso, cappuccino, taze sandviçler, meyve, kuruyemiş",
-            "price": 12.0,
-            "currency": "EUR",
-            "unit": "person",
-            "category": "refreshment",
-            "service_type": "coffee_break",
-            "capacity_per_service": 1
-        },
-        
-        # Personel & Destek Hizmetleri
-        {
-            "name": "Hostesin Desteği",
-            "description": "Profesyonel hostesle etkinlik desteği, karşılama ve yönlendirme",
-            "price": 25.0,
-            "currency": "EUR",
-            "unit": "hour",
-            "category": "service",
-            "service_type": "hostess_support",
-            "capacity_per_service": 1
-        },
-        {
-            "name": "Teknik Destek",
-            "description": "Profesyonel ses ve görüntü teknisyeni desteği",
-            "price": 35.0,
-            "currency": "EUR",
-            "unit": "hour",
-            "category": "service",
-            "service_type": "technical_support",
-            "capacity_per_service": 1
-        },
-        {
-            "name": "Çevirmen Desteği",
-            "description": "İngilizce/Türkçe simultane çevirmen hizmeti",
-            "price": 50.0,
-            "currency": "EUR",
-            "unit": "hour",
-            "category": "service",
-            "service_type": "interpreter",
-            "capacity_per_service": 1
-        },
-        
-        # Transfer Services
-        {
-            "name": "Havalimanı Transfer",
-            "description": "İstanbul Havalimanı ↔ Otel arası transfer hizmeti (lüks araç)",
-            "price": 80.0,
-            "currency": "EUR",
-            "unit": "trip",
-            "category": "transport",
-            "service_type": "airport_transfer",
-            "duration_minutes": 60,
-            "capacity_per_service": 4
-        },
-        {
-            "name": "Sabiha Gökçen Transfer",
-            "description": "Sabiha Gökçen Havalimanı ↔ Otel arası transfer hizmeti",
-            "price": 95.0,
-            "currency": "EUR",
-            "unit": "trip",
-            "category": "transport",
-            "service_type": "airport_transfer",
-            "duration_minutes": 90,
-            "capacity_per_service": 4
-        },
-        {
-            "name": "Şehir İçi Transfer",
-            "description": "İstanbul şehir merkezindeki önemli noktalara transfer",
-            "price": 50.0,
-            "currency": "EUR",
-            "unit": "trip",
-            "category": "transport",
-            "service_type": "city_transfer",
-            "duration_minutes": 30,
-            "capacity_per_service": 4
-        },
-        {
-            "name": "Grup Transfer (Minibüs)",
-            "description": "8-15 kişilik grup transferi için minibüs hizmeti",
-            "price": 130.0,
-            "currency": "EUR",
-            "unit": "trip",
-            "category": "transport",
-            "service_type": "group_transfer",
-            "duration_minutes": 45,
-            "capacity_per_service": 15
-        },
-        
-        # Etkinlik & Eğlence Hizmetleri
-        {
-            "name": "Koktey Servisi",
-            "description": "Premium içecek servisi, özel kokteyller, profesyonel barista",
-            "price": 18.0,
-            "currency": "EUR",
-            "unit": "person",
-            "category": "catering",
-            "service_type": "cocktail_service",
-            "capacity_per_service": 1
-        },
-        {
-            "name": "Doğum Günü Pastası",
-            "description": "Özel tasarım doğum günü pastası, kişiye özel mesaj",
-            "price": 150.0,
-            "currency": "EUR",
-            "unit": "piece",
-            "category": "catering",
-            "service_type": "birthday_cake",
-            "capacity_per_service": 20
-        },
-        {
-            "name": "Çiçek Düzenleme",
-            "description": "Profesyonel çiçek aranjmanı, masa ve sahne dekorasyonu",
-            "price": 250.0,
-            "currency": "EUR",
-            "unit": "set",
-            "category": "decoration",
-            "service_type": "flower_arrangement",
-            "capacity_per_service": 1
-        },
-        {
-            "name": "Fotoğrafçı Hizmeti",
-            "description": "Profesyonel fotoğrafçı, etkinlik çekimi, dijital albüm",
-            "price": 80.0,
-            "currency": "EUR",
-            "unit": "hour",
-            "category": "service",
-            "service_type": "photographer",
-            "capacity_per_service": 1
-        },
-        {
-            "name": "Müzik Grubu",
-            "description": "Canlı müzik performansı, DJ veya akustik grup seçenekleri",
-            "price": 200.0,
-            "currency": "EUR",
-            "unit": "hour",
-            "category": "entertainment",
-            "service_type": "live_music",
-            "capacity_per_service": 1
-        },
-        {
-            "name": "Sahne Düzenlemesi",
-            "description": "Profesyonel sahne kurulumu, podyum, dekorasyon",
-            "price": 350.0,
-            "currency": "EUR",
-            "unit": "set",
-            "category": "equipment",
-            "service_type": "stage_setup",
-            "capacity_per_service": 1
-        },
-        {
-            "name": "LED Ekran Kiralama",
-            "description": "Büyük boy LED ekran, full HD görüntü, teknik destek dahil",
-            "price": 120.0,
-            "currency": "EUR",
-            "unit": "day",
-            "category": "equipment",
-            "service_type": "led_screen",
-            "capacity_per_service": 1
-        },
-        {
-            "name": "Ekstra Ses Sistemi",
-            "description": "Güçlendirilmiş ses sistemi, ekstra hoparlörler, mikrofon seti",
-            "price": 80.0,
-            "currency": "EUR",
-            "unit": "day",
-            "category": "equipment",
-            "service_type": "extra_sound_system",
-            "capacity_per_service": 1
-        }
-    ]
-    
-    created_services = []
-    for service_data in default_services:
-        # Check if service already exists
-        existing = await db.extra_services.find_one({
-            "hotel_id": hotel_id,
-            "name": service_data["name"]
-        })
-        
-        if not existing:
-            service_dict = service_data.copy()
-            service_dict["id"] = str(uuid.uuid4())
-            service_dict["hotel_id"] = hotel_id
-            service_dict["created_at"] = datetime.utcnow()
-            service_dict["is_available"] = True
-            
-            await db.extra_services.insert_one(service_dict)
-            created_services.append(service_dict["name"])
+    seed_result = await seed_default_services([hotel_id])
+    created_services = seed_result["created_services"]
     
     return {
         "success": True,
@@ -1242,29 +2032,132 @@ async def create_default_services(
         "message": f"{len(created_services)} default service created for {hotel['name']}"
     }
 
-@api_router.get("/hotels/{hotel_id}/services", response_model=List[ExtraServiceResponse])
-async def get_hotel_services(hotel_id: str, request: Request):
+async def seed_default_services_for_fleet(job_id: str, hotel_filter: dict, update_existing: bool) -> dict:
+    """Seed default services hotel batch by hotel batch, reporting progress on the job"""
+    created = 0
+    updated = 0
+    batch = []
+    
+    async def flush():
+        nonlocal created, updated
+        seed_result = await seed_default_services(batch, update_existing)
+        created += seed_result["created"]
+        updated += seed_result["updated"]
+        await job_tracker.progress(job_id, processed=len(batch), created=created, updated=updated)
+        batch.clear()
+    
+    async for hotel in db.hotels.find(hotel_filter, {"_id": 0, "id": 1}):
+        batch.append(hotel["id"])
+        if len(batch) >= DEFAULT_SERVICE_SEED_BATCH_SIZE:
+            await flush()
+    if batch:
+        await flush()
+    
+    return {"created": created, "updated": updated}
+
+@api_router.post("/admin/services/default/seed")
+async def seed_default_services_fleet(
+    seed_request: DefaultServiceSeedRequest,
+    current_user: dict = Depends(get_current_user)
+):
+    """Seed or update default services for many hotels as one background job"""
+    if current_user["role"] != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins can seed services for multiple hotels"
+        )
+    
+    hotel_filter = {"is_active": True}
+    if seed_request.hotel_ids is not None:
+        hotel_filter["id"] = {"$in": seed_request.hotel_ids}
+    if seed_request.manager_id:
+        hotel_filter["manager_id"] = seed_request.manager_id
+    
+    total = await db.hotels.count_documents(hotel_filter)
+    job = await job_tracker.create("default_service_seed", total=total, meta={
+        "update_existing": seed_request.update_existing,
+        "templates": len(DEFAULT_EXTRA_SERVICES)
+    }, requested_by=current_user["id"])
+    job_tracker.run(job["id"], seed_default_services_for_fleet(job["id"], hotel_filter, seed_request.update_existing))
+    
+    return {"success": True, "job_id": job["id"], "total_hotels": total}
+
+@api_router.get("/admin/services/duplicates")
+async def get_duplicate_services(current_user: dict = Depends(get_current_user)):
+    """Services sharing a name within a hotel (oldest first); the unique name index waits for them to be resolved"""
+    if current_user["role"] != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins can access this endpoint"
+        )
+    
+    return {"duplicates": await find_duplicate_services()}
+
+@api_router.post("/admin/services/duplicates/rename")
+async def rename_duplicate_services_job(current_user: dict = Depends(get_current_user)):
+    """One-off migration: number the duplicate service names and build the unique index, as a background job"""
+    if current_user["role"] != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins can rename services"
+        )
+    
+    job = await job_tracker.create("duplicate_service_rename", requested_by=current_user["id"])
+    job_tracker.run(job["id"], rename_duplicate_services(job["id"]))
+    return {"success": True, "job_id": job["id"]}
+
+@api_router.get("/admin/jobs/{job_id}")
+async def get_admin_job_status(job_id: str, current_user: dict = Depends(get_current_user)):
+    if current_user["role"] != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins can access this endpoint"
+        )
+    
+    job = await job_tracker.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@api_router.get("/jobs/{job_id}")
+async def get_job_status(job_id: str, current_user: dict = Depends(get_current_user)):
+    job = await job_tracker.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    # Admins see every job, others only the jobs they started
+    if current_user["role"] != UserRole.ADMIN and job.get("requested_by") != current_user["id"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You can only view your own jobs"
+        )
+    return job
+
+async def priced_hotel_services(hotel_id: str, currency: CurrencyContext) -> List[ExtraServiceResponse]:
+    """A hotel's available extra services priced in the display currency"""
     services = await db.extra_services.find({
         "hotel_id": hotel_id,
         "is_available": True
     }).to_list(length=100)
     
-    # Kur bilgisi hesapla
-    client_ip = request.client.host
-    country_code = await get_client_country_from_ip(client_ip)
-    display_currency = await get_display_currency(country_code)
-    
     # Her servis için fiyat hesapla
     for service in services:
-        base_currency = service.get("currency", "EUR")
-        if base_currency != display_currency.value:
-            exchange_rate = await get_exchange_rate(base_currency, display_currency.value)
-            service["pricing_info"] = calculate_display_price(
-                service["price"], base_currency, display_currency.value, exchange_rate
-            ).dict()
+        service["pricing_info"] = currency.pricing_info(service["price"], service.get("currency", "EUR"))
     
     return [ExtraServiceResponse(**service) for service in services]
 
+@api_router.get("/hotels/{hotel_id}/services", response_model=List[ExtraServiceResponse])
+async def get_hotel_services(
+    hotel_id: str,
+    request: Request,
+    currency: CurrencyContext = Depends(get_currency_context)
+):
+    async def compute():
+        return await priced_hotel_services(hotel_id, currency)
+    
+    cache_key = response_cache.make_key("hotel_services", hotel_id=hotel_id, currency=currency.display_currency.value)
+    return await response_cache.respond(request, cache_key, ["services", f"hotel_services:{hotel_id}"], compute)
+
 # Booking Routes
 @api_router.post("/bookings", response_model=BookingResponse)
 async def create_booking(booking_data: BookingCreate, current_user: dict = Depends(get_current_user)):
@@ -1322,6 +2215,8 @@ async def create_booking(booking_data: BookingCreate, current_user: dict = Depen
     })
     
     await db.bookings.insert_one(booking_dict)
+    await invalidate_manager_stats(room["hotel_id"])
+    autocomplete_index.record_booking(room["hotel_id"])
     
     # Send confirmation email
     try:
@@ -1352,29 +2247,33 @@ async def create_booking(booking_data: BookingCreate, current_user: dict = Depen
     return BookingResponse(**booking_dict)
 
 @api_router.get("/bookings", response_model=List[BookingResponse])
-async def get_user_bookings(current_user: dict = Depends(get_current_user)):
+async def get_user_bookings(
+    fields: Optional[str] = None,  # comma-separated response fields (id is always included), all by default
+    current_user: dict = Depends(get_current_user)
+):
+    selected = requested_fields(BookingResponse, fields)
+    projection = projection_for(BookingResponse, selected)
     if current_user["role"] == UserRole.CUSTOMER:
         # Customer sees only their bookings
-        bookings = await db.bookings.find({"customer_id": current_user["id"]}).to_list(1000)
+        bookings = await db.bookings.find({"customer_id": current_user["id"]}, projection).to_list(1000)
     elif current_user["role"] == UserRole.HOTEL_MANAGER:
         # Hotel manager sees bookings for their hotels
-        user_hotels = await db.hotels.find({"manager_id": current_user["id"]}).to_list(1000)
-        hotel_ids = [hotel["id"] for hotel in user_hotels]
-        
-        # Get rooms for user's hotels
-        rooms = await db.conference_rooms.find({"hotel_id": {"$in": hotel_ids}}).to_list(1000)
-        room_ids = [room["id"] for room in rooms]
-        
-        bookings = await db.bookings.find({"room_id": {"$in": room_ids}}).to_list(1000)
+        room_ids = await queries.manager_room_ids(current_user["id"])
+        bookings = await db.bookings.find({"room_id": {"$in": room_ids}}, projection).to_list(1000)
     else:  # Admin
         # Admin sees all bookings
-        bookings = await db.bookings.find().to_list(1000)
+        bookings = await db.bookings.find({}, projection).to_list(1000)
     
-    return [BookingResponse(**booking) for booking in bookings]
+    # Bookings are written by create_booking from BookingResponse fields, no need to validate them again
+    return trusted_response(BookingResponse, bookings, selected)
 
 @api_router.get("/bookings/{booking_id}", response_model=BookingResponse)
-async def get_booking(booking_id: str, current_user: dict = Depends(get_current_user)):
-    booking = await db.bookings.find_one({"id": booking_id})
+async def get_booking(
+    booking_id: str,
+    current_user: dict = Depends(get_current_user),
+    ownership: OwnershipIndex = Depends(get_ownership)
+):
+    booking = await db.bookings.find_one({"id": booking_id}, projection_for(BookingResponse))
     if not booking:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -1389,10 +2288,9 @@ async def get_booking(booking_id: str, current_user: dict = Depends(get_current_
         )
     elif current_user["role"] == UserRole.HOTEL_MANAGER:
         # Check if this booking is for manager's hotel
-        room = await db.conference_rooms.find_one({"id": booking["room_id"]})
-        if room:
-            hotel = await db.hotels.find_one({"id": room["hotel_id"], "manager_id": current_user["id"]})
-            if not hotel:
+        hotel_id = await ownership.room_hotel(booking["room_id"])
+        if hotel_id:
+            if not await ownership.owns_hotel(current_user["id"], hotel_id):
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail="You can only view bookings for your hotels"
@@ -1404,9 +2302,10 @@ async def get_booking(booking_id: str, current_user: dict = Depends(get_current_
 async def update_booking_status(
     booking_id: str, 
     status_update: BookingUpdateStatus, 
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user),
+    ownership: OwnershipIndex = Depends(get_ownership)
 ):
-    booking = await db.bookings.find_one({"id": booking_id})
+    booking = await queries.booking_access(booking_id)
     if not booking:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -1423,10 +2322,9 @@ async def update_booking_status(
             )
     elif current_user["role"] == UserRole.HOTEL_MANAGER:
         # Check if this booking is for manager's hotel
-        room = await db.conference_rooms.find_one({"id": booking["room_id"]})
-        if room:
-            hotel = await db.hotels.find_one({"id": room["hotel_id"], "manager_id": current_user["id"]})
-            if not hotel:
+        hotel_id = await ownership.room_hotel(booking["room_id"])
+        if hotel_id:
+            if not await ownership.owns_hotel(current_user["id"], hotel_id):
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail="You can only manage bookings for your hotels"
@@ -1440,12 +2338,181 @@ async def update_booking_status(
     if status_update.notes:
         update_data["notes"] = status_update.notes
     
-    await db.bookings.update_one({"id": booking_id}, {"$set": update_data})
+    previous = await db.bookings.find_one_and_update(
+        {"id": booking_id}, {"$set": update_data}, projection={"_id": 0, "status": 1}
+    )
+    hotel_id = await ownership.room_hotel(booking["room_id"])
+    if hotel_id:
+        await invalidate_manager_stats(hotel_id)
+        # Autocomplete popularity counts non-cancelled bookings
+        was_cancelled = previous is not None and previous.get("status") == BookingStatus.CANCELLED
+        if status_update.status == BookingStatus.CANCELLED and not was_cancelled:
+            autocomplete_index.record_cancellation(hotel_id)
+        elif status_update.status != BookingStatus.CANCELLED and was_cancelled:
+            autocomplete_index.record_booking(hotel_id)
     
     # Get updated booking
-    updated_booking = await db.bookings.find_one({"id": booking_id})
+    updated_booking = await db.bookings.find_one({"id": booking_id}, projection_for(BookingResponse))
     return BookingResponse(**updated_booking)
 
+def months_back(moment: datetime, months: int) -> datetime:
+    """First day of the month `months` before moment's month"""
+    index = moment.year * 12 + moment.month - 1 - months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+def manager_stats_pipeline(room_ids: List[str], occupancy_since: datetime) -> list:
+    """One pass over the manager's bookings, every dashboard figure is a $facet branch"""
+    return [
+        {"$match": {"room_id": {"$in": room_ids}}},
+        {"$facet": {
+            "revenue": [
+                {"$group": {
+                    "_id": {"room_id": "$room_id", "status": "$status"},
+                    "bookings": {"$sum": 1},
+                    "revenue": {"$sum": "$total_price"}
+                }}
+            ],
+            "payments": [
+                {"$group": {"_id": "$payment_status", "bookings": {"$sum": 1}}}
+            ],
+            "occupancy": [
+                {"$match": {
+                    "status": {"$in": [BookingStatus.CONFIRMED.value, BookingStatus.COMPLETED.value]},
+                    "start_date": {"$gte": occupancy_since}
+                }},
+                {"$group": {
+                    "_id": {"room_id": "$room_id", "year": {"$year": "$start_date"}, "month": {"$month": "$start_date"}},
+                    "booked_days": {"$sum": "$total_days"}
+                }}
+            ],
+            "lead_time": [
+                {"$match": {"status": {"$ne": BookingStatus.CANCELLED.value}}},
+                {"$group": {"_id": None, "average_ms": {"$avg": {"$subtract": ["$start_date", "$created_at"]}}}}
+            ],
+            "top_services": [
+                {"$match": {"status": {"$ne": BookingStatus.CANCELLED.value}}},
+                {"$unwind": "$extra_services"},
+                {"$group": {
+                    "_id": "$extra_services.service_id",
+                    "quantity": {"$sum": "$extra_services.quantity"},
+                    "bookings": {"$sum": 1},
+                    "revenue": {"$sum": "$extra_services.total_price"}
+                }},
+                {"$sort": {"quantity": -1, "_id": 1}},
+                {"$limit": MANAGER_STATS_TOP_SERVICES}
+            ]
+        }}
+    ]
+
+async def compute_manager_stats(manager_id: str, months: int) -> ManagerStatsResponse:
+    now = datetime.utcnow()
+    rooms = {room["id"]: room for room in await queries.manager_rooms(manager_id)}
+    facets = await db.bookings.aggregate(
+        manager_stats_pipeline(list(rooms), months_back(now, months - 1))
+    ).to_list(length=1)
+    facets = facets[0] if facets else {}
+
+    # Bookings carry no currency, revenue is folded per room currency here (rooms x statuses rows)
+    bookings_by_status = {}
+    currencies = {}
+    for row in facets.get("revenue", []):
+        booking_status = row["_id"]["status"]
+        bookings_by_status[booking_status] = bookings_by_status.get(booking_status, 0) + row["bookings"]
+        currency = rooms.get(row["_id"]["room_id"], {}).get("currency", CurrencyCode.EUR.value)
+        by_status = currencies.setdefault(currency, {})
+        totals = by_status.setdefault(booking_status, [0, 0.0])
+        totals[0] += row["bookings"]
+        totals[1] += row["revenue"]
+    revenue_by_currency = [
+        CurrencyRevenue(
+            currency=currency,
+            revenue=round(sum(revenue for booking_status, (_, revenue) in by_status.items()
+                              if booking_status != BookingStatus.CANCELLED), 2),
+            by_status=[
+                StatusRevenue(status=booking_status, bookings=count, revenue=round(revenue, 2))
+                for booking_status, (count, revenue) in sorted(by_status.items())
+            ]
+        )
+        for currency, by_status in sorted(currencies.items())
+    ]
+
+    occupancy = []
+    for row in facets.get("occupancy", []):
+        key = row["_id"]
+        days_in_month = calendar.monthrange(key["year"], key["month"])[1]
+        occupancy.append(RoomOccupancy(
+            room_id=key["room_id"],
+            room_name=rooms.get(key["room_id"], {}).get("name"),
+            year=key["year"],
+            month=key["month"],
+            booked_days=row["booked_days"],
+            occupancy_rate=round(min(row["booked_days"] / days_in_month, 1.0), 4)
+        ))
+    occupancy.sort(key=lambda item: (item.year, item.month, item.room_id))
+
+    lead_time = facets.get("lead_time") or [{}]
+    average_ms = lead_time[0].get("average_ms")
+
+    top_rows = facets.get("top_services", [])
+    services = {}
+    if top_rows:
+        async for service in db.extra_services.find(
+            {"id": {"$in": [row["_id"] for row in top_rows]}}, {"_id": 0, "id": 1, "name": 1, "currency": 1}
+        ):
+            services[service["id"]] = service
+    top_extra_services = [
+        TopExtraService(
+            service_id=row["_id"],
+            name=services.get(row["_id"], {}).get("name"),
+            currency=services.get(row["_id"], {}).get("currency"),
+            quantity=row["quantity"],
+            bookings=row["bookings"],
+            revenue=round(row["revenue"], 2)
+        )
+        for row in top_rows
+    ]
+
+    return ManagerStatsResponse(
+        manager_id=manager_id,
+        bookings=sum(bookings_by_status.values()),
+        bookings_by_status=bookings_by_status,
+        bookings_by_payment_status={row["_id"]: row["bookings"] for row in facets.get("payments", [])},
+        revenue_by_currency=revenue_by_currency,
+        occupancy=occupancy,
+        average_lead_time_days=round(average_ms / 86400000, 2) if average_ms is not None else None,
+        top_extra_services=top_extra_services,
+        generated_at=now
+    )
+
+async def invalidate_manager_stats(hotel_id: str):
+    manager_id = await ownership_index.hotel_manager(hotel_id)
+    if manager_id:
+        response_cache.invalidate(f"manager_stats:{manager_id}")
+
+@api_router.get("/manager/stats", response_model=ManagerStatsResponse)
+async def get_manager_stats(
+    request: Request,
+    months: int = 6,
+    manager_id: Optional[str] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    if current_user["role"] == UserRole.HOTEL_MANAGER:
+        manager_id = current_user["id"]
+    elif current_user["role"] != UserRole.ADMIN or not manager_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only hotel managers can view their statistics, admins must pass manager_id"
+        )
+    months = max(1, min(months, MANAGER_STATS_MAX_MONTHS))
+
+    async def compute():
+        return await compute_manager_stats(manager_id, months)
+
+    cache_key = response_cache.make_key("manager_stats", manager_id=manager_id, months=months)
+    return await response_cache.respond(
+        request, cache_key, [f"manager_stats:{manager_id}"], compute, ttl=MANAGER_STATS_TTL_SECONDS
+    )
+
 @api_router.post("/rooms/{room_id}/availability", response_model=AvailabilityResponse)
 async def check_room_availability_endpoint(room_id: str, availability_check: AvailabilityCheck):
     result = await check_room_availability(room_id, availability_check.start_date, availability_check.end_date)
@@ -1456,19 +2523,19 @@ async def get_room_bookings(
     room_id: str, 
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user),
+    ownership: OwnershipIndex = Depends(get_ownership)
 ):
     # Check if user has permission to view this room's bookings
-    room = await db.conference_rooms.find_one({"id": room_id})
-    if not room:
+    hotel_id = await ownership.room_hotel(room_id)
+    if not hotel_id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Room not found"
         )
     
     if current_user["role"] == UserRole.HOTEL_MANAGER:
-        hotel = await db.hotels.find_one({"id": room["hotel_id"], "manager_id": current_user["id"]})
-        if not hotel:
+        if not await ownership.owns_hotel(current_user["id"], hotel_id):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="You can only view bookings for your hotels"
@@ -1489,7 +2556,7 @@ async def get_room_bookings(
             {"start_date": {"$lte": end_dt}, "end_date": {"$gte": start_dt}}
         ]
     
-    bookings = await db.bookings.find(query).to_list(1000)
+    bookings = await db.bookings.find(query, projection_for(BookingResponse)).to_list(1000)
     return [BookingResponse(**booking) for booking in bookings]
 
 # Utility function for availability checking
@@ -1501,7 +2568,7 @@ async def check_room_availability(room_id: str, start_date: datetime, end_date:
         "$or": [
             {"start_date": {"$lte": end_date}, "end_date": {"$gte": start_date}}
         ]
-    }).to_list(1000)
+    }, ID_ONLY).to_list(1000)
     
     is_available = len(conflicting_bookings) == 0
     
@@ -1730,23 +2797,24 @@ UPLOAD_DIR = Path("/home/kenanadm/uploads")
 HOTEL_IMAGES_DIR = UPLOAD_DIR / "hotels"
 ROOM_IMAGES_DIR = UPLOAD_DIR / "rooms"
 
-# Create directories if they don't exist
-UPLOAD_DIR.mkdir(exist_ok=True)
-HOTEL_IMAGES_DIR.mkdir(exist_ok=True)
-ROOM_IMAGES_DIR.mkdir(exist_ok=True)
+def ensure_upload_dirs():
+    """Create directories if they don't exist (called at startup)"""
+    HOTEL_IMAGES_DIR.mkdir(parents=True, exist_ok=True)
+    ROOM_IMAGES_DIR.mkdir(parents=True, exist_ok=True)
 
 @api_router.post("/hotels/{hotel_id}/upload-image")
 async def upload_hotel_image(
     hotel_id: str,
     file: UploadFile = File(...),
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user),
+    ownership: OwnershipIndex = Depends(get_ownership)
 ):
     # Check permissions
-    hotel = await db.hotels.find_one({"id": hotel_id})
-    if not hotel:
+    manager_id = await ownership.hotel_manager(hotel_id)
+    if manager_id is None:
         raise HTTPException(status_code=404, detail="Hotel not found")
     
-    if current_user["role"] == UserRole.HOTEL_MANAGER and hotel["manager_id"] != current_user["id"]:
+    if current_user["role"] == UserRole.HOTEL_MANAGER and manager_id != current_user["id"]:
         raise HTTPException(status_code=403, detail="You can only manage your own hotel's images")
     elif current_user["role"] == UserRole.CUSTOMER:
         raise HTTPException(status_code=403, detail="Customers cannot upload images")
@@ -1773,6 +2841,7 @@ async def upload_hotel_image(
             {"id": hotel_id},
             {"$push": {"images": image_url}}
         )
+        invalidate_hotel_cache(hotel_id)
         
         return {"success": True, "image_url": image_url}
         
@@ -1783,15 +2852,15 @@ async def upload_hotel_image(
 async def upload_room_image(
     room_id: str,
     file: UploadFile = File(...),
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user),
+    ownership: OwnershipIndex = Depends(get_ownership)
 ):
     # Check permissions
-    room = await db.conference_rooms.find_one({"id": room_id})
-    if not room:
+    hotel_id = await ownership.room_hotel(room_id)
+    if not hotel_id:
         raise HTTPException(status_code=404, detail="Room not found")
     
-    hotel = await db.hotels.find_one({"id": room["hotel_id"]})
-    if current_user["role"] == UserRole.HOTEL_MANAGER and hotel["manager_id"] != current_user["id"]:
+    if current_user["role"] == UserRole.HOTEL_MANAGER and not await ownership.owns_hotel(current_user["id"], hotel_id):
         raise HTTPException(status_code=403, detail="You can only manage your own hotel's room images")
     elif current_user["role"] == UserRole.CUSTOMER:
         raise HTTPException(status_code=403, detail="Customers cannot upload images")
@@ -1818,6 +2887,7 @@ async def upload_room_image(
             {"id": room_id},
             {"$push": {"images": image_url}}
         )
+        invalidate_room_cache(room_id, hotel_id)
         
         return {"success": True, "image_url": image_url}
         
@@ -1826,7 +2896,7 @@ async def upload_room_image(
 
 # Serve uploaded images
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, PlainTextResponse
 
 @api_router.get("/images/hotels/{filename}")
 async def get_hotel_image(filename: str):
@@ -1858,12 +2928,12 @@ async def create_review(review_data: ReviewCreate, current_user: dict = Depends(
         raise HTTPException(status_code=400, detail="Can only review completed bookings")
     
     # Check if review already exists
-    existing_review = await db.reviews.find_one({"booking_id": review_data.booking_id})
+    existing_review = await db.reviews.find_one({"booking_id": review_data.booking_id}, ID_ONLY)
     if existing_review:
         raise HTTPException(status_code=400, detail="Review already exists for this booking")
     
     # Get room and hotel info
-    room = await db.conference_rooms.find_one({"id": booking["room_id"]})
+    room = await queries.room_ref(booking["room_id"])
     
     # Create review
     review_dict = review_data.dict()
@@ -1880,6 +2950,7 @@ async def create_review(review_data: ReviewCreate, current_user: dict = Depends(
     })
     
     await db.reviews.insert_one(review_dict)
+    response_cache.invalidate(f"hotel_reviews:{room['hotel_id']}")
     
     # Update hotel and room ratings
     await update_ratings(room["hotel_id"], booking["room_id"])
@@ -1887,25 +2958,43 @@ async def create_review(review_data: ReviewCreate, current_user: dict = Depends(
     return ReviewResponse(**review_dict)
 
 @api_router.get("/hotels/{hotel_id}/reviews", response_model=List[ReviewResponse])
-async def get_hotel_reviews(hotel_id: str, skip: int = 0, limit: int = 20):
+async def get_hotel_reviews(hotel_id: str, fields: Optional[str] = None, skip: int = 0, limit: int = 20):
+    selected = requested_fields(ReviewResponse, fields)
+    if selected is not None:
+        reviews = await db.reviews.find(
+            {"hotel_id": hotel_id}, projection_for(ReviewResponse, selected)
+        ).sort("created_at", -1).skip(skip).limit(limit).to_list(length=limit)
+        return trusted_response(ReviewResponse, reviews, selected)
+    
     reviews = await db.reviews.find({"hotel_id": hotel_id}).sort("created_at", -1).skip(skip).limit(limit).to_list(length=limit)
     return [ReviewResponse(**review) for review in reviews]
 
 @api_router.get("/rooms/{room_id}/reviews", response_model=List[ReviewResponse])
-async def get_room_reviews(room_id: str, skip: int = 0, limit: int = 20):
+async def get_room_reviews(room_id: str, fields: Optional[str] = None, skip: int = 0, limit: int = 20):
+    selected = requested_fields(ReviewResponse, fields)
+    if selected is not None:
+        reviews = await db.reviews.find(
+            {"room_id": room_id}, projection_for(ReviewResponse, selected)
+        ).sort("created_at", -1).skip(skip).limit(limit).to_list(length=limit)
+        return trusted_response(ReviewResponse, reviews, selected)
+    
     reviews = await db.reviews.find({"room_id": room_id}).sort("created_at", -1).skip(skip).limit(limit).to_list(length=limit)
     return [ReviewResponse(**review) for review in reviews]
 
 @api_router.post("/reviews/{review_id}/response")
-async def respond_to_review(review_id: str, response_data: HotelReviewResponse, current_user: dict = Depends(get_current_user)):
+async def respond_to_review(
+    review_id: str,
+    response_data: HotelReviewResponse,
+    current_user: dict = Depends(get_current_user),
+    ownership: OwnershipIndex = Depends(get_ownership)
+):
     # Get review
     review = await db.reviews.find_one({"id": review_id})
     if not review:
         raise HTTPException(status_code=404, detail="Review not found")
     
     # Check permissions - only hotel manager can respond
-    hotel = await db.hotels.find_one({"id": review["hotel_id"]})
-    if current_user["role"] != UserRole.HOTEL_MANAGER or hotel["manager_id"] != current_user["id"]:
+    if current_user["role"] != UserRole.HOTEL_MANAGER or not await ownership.owns_hotel(current_user["id"], review["hotel_id"]):
         raise HTTPException(status_code=403, detail="Only hotel managers can respond to reviews")
     
     # Update review with hotel response
@@ -1918,70 +3007,71 @@ async def respond_to_review(review_id: str, response_data: HotelReviewResponse,
             }
         }
     )
+    response_cache.invalidate(f"hotel_reviews:{review['hotel_id']}")
     
     return {"success": True, "message": "Response added successfully"}
 
 async def update_ratings(hotel_id: str, room_id: str):
     """Update average ratings for hotel and room"""
     # Hotel ratings
-    hotel_reviews = await db.reviews.find({"hotel_id": hotel_id}).to_list(length=1000)
+    hotel_reviews = await queries.rating_values({"hotel_id": hotel_id}, "overall_rating")
     if hotel_reviews:
-        avg_rating = sum(review["overall_rating"] for review in hotel_reviews) / len(hotel_reviews)
+        avg_rating = sum(hotel_reviews) / len(hotel_reviews)
         await db.hotels.update_one(
             {"id": hotel_id},
             {"$set": {"average_rating": round(avg_rating, 1), "total_reviews": len(hotel_reviews)}}
         )
+        invalidate_hotel_cache(hotel_id)
     
     # Room ratings
-    room_reviews = await db.reviews.find({"room_id": room_id}).to_list(length=1000)
+    room_reviews = await queries.rating_values({"room_id": room_id}, "room_rating")
     if room_reviews:
-        avg_rating = sum(review["room_rating"] for review in room_reviews) / len(room_reviews)
+        avg_rating = sum(room_reviews) / len(room_reviews)
         await db.conference_rooms.update_one(
             {"id": room_id},
             {"$set": {"average_rating": round(avg_rating, 1)}}
         )
+        invalidate_room_cache(room_id, hotel_id)
 
 # Currency System APIs
 @api_router.get("/currency/rates")
-async def get_exchange_rates(request: Request):
+async def get_exchange_rates(currency: CurrencyContext = Depends(get_currency_context)):
     """Get current exchange rates for all supported currencies"""
-    client_ip = request.client.host
-    country_code = await get_client_country_from_ip(client_ip)
-    display_currency = await get_display_currency(country_code)
-    
+    display_currency = currency.display_currency
     rates = {}
     base_currencies = [CurrencyCode.USD, CurrencyCode.EUR]
     
     for base in base_currencies:
         if base != display_currency:
-            rate = await get_exchange_rate(base.value, display_currency.value)
-            rates[f"{base.value}_to_{display_currency.value}"] = rate
+            rates[f"{base.value}_to_{display_currency.value}"] = currency.rate(base.value)
     
     return {
-        "country": country_code,
+        "country": currency.country,
         "display_currency": display_currency.value,
         "rates": rates,
         "updated_at": datetime.utcnow()
     }
 
 @api_router.get("/currency/detect")
-async def detect_user_currency(request: Request):
+async def detect_user_currency(request: Request, currency: CurrencyContext = Depends(get_currency_context)):
     """Detect user's currency based on IP location"""
-    client_ip = request.client.host
-    country_code = await get_client_country_from_ip(client_ip)
-    display_currency = await get_display_currency(country_code)
-    
     return {
-        "ip": client_ip,
-        "country": country_code,
-        "currency": display_currency.value
+        "ip": request.client.host,
+        "country": currency.country,
+        "currency": currency.display_currency.value
     }
 
 # Advertisement Routes
+def notify_ad_scheduler():
+    """Wake the status scheduler, which only runs in the leader worker"""
+    ad_scheduler.notify()
+    worker_bus.publish("ad_scheduler")
+
 @api_router.post("/advertisements", response_model=AdvertisementResponse)
 async def create_advertisement(
     ad_data: AdvertisementCreate,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user),
+    ownership: OwnershipIndex = Depends(get_ownership)
 ):
     # Only hotel managers and admins can create ads
     if current_user["role"] == UserRole.CUSTOMER:
@@ -1993,14 +3083,12 @@ async def create_advertisement(
     # If hotel manager, verify target_id belongs to their hotel
     if current_user["role"] == UserRole.HOTEL_MANAGER and ad_data.target_id:
         if ad_data.ad_type == AdvertisementType.FEATURED_HOTEL:
-            hotel = await db.hotels.find_one({"id": ad_data.target_id, "manager_id": current_user["id"]})
-            if not hotel:
+            if not await ownership.owns_hotel(current_user["id"], ad_data.target_id):
                 raise HTTPException(status_code=403, detail="You can only advertise your own hotels")
         elif ad_data.ad_type == AdvertisementType.SPONSORED_ROOM:
-            room = await db.conference_rooms.find_one({"id": ad_data.target_id})
-            if room:
-                hotel = await db.hotels.find_one({"id": room["hotel_id"], "manager_id": current_user["id"]})
-                if not hotel:
+            hotel_id = await ownership.room_hotel(ad_data.target_id)
+            if hotel_id:
+                if not await ownership.owns_hotel(current_user["id"], hotel_id):
                     raise HTTPException(status_code=403, detail="You can only advertise rooms from your own hotels")
     
     ad_dict = ad_data.dict()
@@ -2011,20 +3099,14 @@ async def create_advertisement(
     ad_dict["total_views"] = 0
     ad_dict["total_clicks"] = 0
     
-    # Set status based on dates
-    now = datetime.now(timezone.utc)
-    start_date = ad_data.start_date.replace(tzinfo=None) if ad_data.start_date.tzinfo else ad_data.start_date
-    end_date = ad_data.end_date.replace(tzinfo=None) if ad_data.end_date.tzinfo else ad_data.end_date
-    now_naive = now.replace(tzinfo=None)
-    
-    if start_date <= now_naive <= end_date and ad_data.is_active:
-        ad_dict["status"] = AdvertisementStatus.ACTIVE
-    elif now_naive > end_date:
-        ad_dict["status"] = AdvertisementStatus.EXPIRED
-    else:
-        ad_dict["status"] = AdvertisementStatus.INACTIVE
+    # Set status based on dates, the scheduler flips it at later boundaries
+    ad_dict["status"] = AdvertisementStatus(
+        compute_ad_status(ad_data.start_date, ad_data.end_date, ad_data.is_active)
+    )
     
     await db.advertisements.insert_one(ad_dict)
+    notify_ad_scheduler()
+    response_cache.invalidate("advertisements")
     return AdvertisementResponse(**ad_dict)
 
 @api_router.get("/advertisements", response_model=List[AdvertisementResponse])
@@ -2052,28 +3134,31 @@ async def get_advertisements(
 
 @api_router.get("/advertisements/public", response_model=List[AdvertisementResponse])
 async def get_public_advertisements(
+    request: Request,
     ad_type: Optional[AdvertisementType] = None,
     limit: int = 10
 ):
     """Public endpoint to get active advertisements for homepage"""
-    now = datetime.now(timezone.utc).replace(tzinfo=None)
-    filter_query = {
-        "status": AdvertisementStatus.ACTIVE,
-        "is_active": True,
-        "start_date": {"$lte": now},
-        "end_date": {"$gte": now}
-    }
-    
-    if ad_type:
-        filter_query["ad_type"] = ad_type
-    
-    # Sort by priority (higher first), then by created date
-    ads = await db.advertisements.find(filter_query).sort([
-        ("priority", -1),
-        ("created_at", -1)
-    ]).limit(limit).to_list(length=limit)
+    async def compute():
+        # Status is kept current by ad_scheduler, no need to re-check dates here
+        filter_query = {
+            "status": AdvertisementStatus.ACTIVE,
+            "is_active": True
+        }
+        
+        if ad_type:
+            filter_query["ad_type"] = ad_type
+        
+        # Sort by priority (higher first), then by created date
+        ads = await db.advertisements.find(filter_query).sort([
+            ("priority", -1),
+            ("created_at", -1)
+        ]).limit(limit).to_list(length=limit)
+        
+        return [AdvertisementResponse(**ad) for ad in ads]
     
-    return [AdvertisementResponse(**ad) for ad in ads]
+    cache_key = response_cache.make_key("public_ads", ad_type=ad_type.value if ad_type else None, limit=limit)
+    return await response_cache.respond(request, cache_key, ["advertisements"], compute)
 
 @api_router.post("/advertisements/{ad_id}/view")
 async def track_ad_view(ad_id: str, track_data: AdViewTrack, request: Request):
@@ -2101,6 +3186,33 @@ async def track_ad_view(ad_id: str, track_data: AdViewTrack, request: Request):
     await db.ad_views.insert_one(view_log)
     return {"success": True}
 
+@api_router.get("/advertisements/{ad_id}/stats")
+async def get_advertisement_stats(
+    ad_id: str,
+    granularity: str = "day",
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    """Views, clicks, CTR and unique visitors per hour or day from the rollup buckets"""
+    if granularity not in ["hour", "day"]:
+        raise HTTPException(status_code=400, detail="granularity must be 'hour' or 'day'")
+    
+    ad = await db.advertisements.find_one({"id": ad_id}, {"_id": 0, "advertiser_id": 1})
+    if not ad:
+        raise HTTPException(status_code=404, detail="Advertisement not found")
+    
+    # Check permissions
+    if current_user["role"] == UserRole.HOTEL_MANAGER and ad["advertiser_id"] != current_user["id"]:
+        raise HTTPException(status_code=403, detail="You can only view stats of your own advertisements")
+    elif current_user["role"] == UserRole.CUSTOMER:
+        raise HTTPException(status_code=403, detail="Access denied")
+    
+    end = end_date.replace(tzinfo=None) if end_date and end_date.tzinfo else (end_date or datetime.utcnow())
+    start = start_date.replace(tzinfo=None) if start_date and start_date.tzinfo else (start_date or end - timedelta(days=30))
+    
+    return await ad_analytics.get_stats(ad_id, granularity, start, end)
+
 @api_router.put("/advertisements/{ad_id}", response_model=AdvertisementResponse)
 async def update_advertisement(
     ad_id: str,
@@ -2124,25 +3236,16 @@ async def update_advertisement(
     
     # Update status if needed
     if "start_date" in update_data or "end_date" in update_data or "is_active" in update_data:
-        now = datetime.now(timezone.utc).replace(tzinfo=None)
-        start_date = update_data.get("start_date", ad["start_date"])
-        end_date = update_data.get("end_date", ad["end_date"])
-        is_active = update_data.get("is_active", ad["is_active"])
-        
-        # Handle timezone conversion
-        if hasattr(start_date, 'tzinfo') and start_date.tzinfo:
-            start_date = start_date.replace(tzinfo=None)
-        if hasattr(end_date, 'tzinfo') and end_date.tzinfo:
-            end_date = end_date.replace(tzinfo=None)
-        
-        if start_date <= now <= end_date and is_active:
-            update_data["status"] = AdvertisementStatus.ACTIVE
-        elif now > end_date:
-            update_data["status"] = AdvertisementStatus.EXPIRED
-        else:
-            update_data["status"] = AdvertisementStatus.INACTIVE
+        update_data["status"] = AdvertisementStatus(compute_ad_status(
+            update_data.get("start_date", ad["start_date"]),
+            update_data.get("end_date", ad["end_date"]),
+            update_data.get("is_active", ad["is_active"])
+        ))
     
     await db.advertisements.update_one({"id": ad_id}, {"$set": update_data})
+    if "status" in update_data:
+        notify_ad_scheduler()
+    response_cache.invalidate("advertisements")
     
     # Get updated ad
     updated_ad = await db.advertisements.find_one({"id": ad_id})
@@ -2162,6 +3265,7 @@ async def delete_advertisement(ad_id: str, current_user: dict = Depends(get_curr
         raise HTTPException(status_code=403, detail="Access denied")
     
     await db.advertisements.delete_one({"id": ad_id})
+    response_cache.invalidate("advertisements")
     return {"success": True, "message": "Advertisement deleted successfully"}
 
 # Health check
@@ -2200,6 +3304,7 @@ async def approve_hotel(hotel_id: str, current_user: dict = Depends(get_current_
             detail="Hotel not found"
         )
     
+    invalidate_hotel_cache(hotel_id)
     return {"message": "Hotel approved successfully", "hotel_id": hotel_id}
 
 @api_router.put("/admin/hotels/{hotel_id}/reject")
@@ -2225,6 +3330,7 @@ async def reject_hotel(hotel_id: str, reason: Optional[str] = None, current_user
             detail="Hotel not found"
         )
     
+    invalidate_hotel_cache(hotel_id)
     return {"message": "Hotel rejected", "hotel_id": hotel_id}
 
 @api_router.get("/admin/rooms/pending", response_model=List[ConferenceRoomResponse])
@@ -2257,6 +3363,7 @@ async def approve_room(room_id: str, current_user: dict = Depends(get_current_us
             detail="Room not found"
         )
     
+    invalidate_room_cache(room_id)
     return {"message": "Room approved successfully", "room_id": room_id}
 
 @api_router.put("/admin/rooms/{room_id}/reject")
@@ -2282,8 +3389,192 @@ async def reject_room(room_id: str, reason: Optional[str] = None, current_user:
             detail="Room not found"
         )
     
+    invalidate_room_cache(room_id)
     return {"message": "Room rejected", "room_id": room_id}
 
+def encode_pending_cursor(item: dict) -> str:
+    raw = json.dumps({"created_at": item["created_at"].isoformat(), "id": item["id"]})
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('utf-8')
+
+def decode_pending_cursor(cursor: str) -> dict:
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode('utf-8')))
+        return {"created_at": datetime.fromisoformat(data["created_at"]), "id": data["id"]}
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+@api_router.get("/admin/approvals/pending")
+async def get_pending_approvals(
+    entity: ApprovalEntity = ApprovalEntity.HOTEL,
+    cursor: Optional[str] = None,
+    limit: int = 50,
+    current_user: dict = Depends(get_current_user)
+):
+    """Pending hotels or rooms, oldest first, paginated with an opaque cursor"""
+    if current_user["role"] != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins can access this endpoint"
+        )
+    
+    limit = max(1, min(limit, 200))
+    collection = db.hotels if entity == ApprovalEntity.HOTEL else db.conference_rooms
+    query = {"approval_status": ApprovalStatus.PENDING}
+    if cursor:
+        position = decode_pending_cursor(cursor)
+        query["$or"] = [
+            {"created_at": {"$gt": position["created_at"]}},
+            {"created_at": position["created_at"], "id": {"$gt": position["id"]}}
+        ]
+    
+    # Fetch one extra document to know whether another page exists
+    items = await collection.find(query).sort([("created_at", 1), ("id", 1)]).limit(limit + 1).to_list(length=limit + 1)
+    has_more = len(items) > limit
+    items = items[:limit]
+    
+    model = HotelResponse if entity == ApprovalEntity.HOTEL else ConferenceRoomResponse
+    return {
+        "entity": entity,
+        "items": [model(**item) for item in items],
+        "next_cursor": encode_pending_cursor(items[-1]) if has_more else None
+    }
+
+@api_router.post("/admin/approvals/batch", response_model=List[ApprovalOperationResult])
+async def batch_approvals(batch: ApprovalBatchRequest, current_user: dict = Depends(get_current_user)):
+    """Approve or reject many hotels and rooms at once.
+
+    Writes are grouped into one bulk_write per collection (hotels, conference_rooms).
+    """
+    if current_user["role"] != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins can approve or reject"
+        )
+    
+    if not batch.operations:
+        raise HTTPException(status_code=400, detail="No operations given")
+    if len(batch.operations) > MAX_APPROVAL_BATCH_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {MAX_APPROVAL_BATCH_SIZE} operations are allowed per batch"
+        )
+    
+    collections = {ApprovalEntity.HOTEL: db.hotels, ApprovalEntity.ROOM: db.conference_rooms}
+    results = []
+    writes = {ApprovalEntity.HOTEL: [], ApprovalEntity.ROOM: []}
+    seen = set()
+    
+    # Look up which ids exist (and the hotel of each room) with one query per collection
+    existing = {}
+    for entity, collection in collections.items():
+        ids = [op.id for op in batch.operations if op.entity == entity]
+        found = []
+        if ids:
+            found = await collection.find({"id": {"$in": ids}}, {"_id": 0, "id": 1, "hotel_id": 1}).to_list(length=len(ids))
+        existing[entity] = {item["id"]: item.get("hotel_id") for item in found}
+    
+    for op in batch.operations:
+        result = ApprovalOperationResult(entity=op.entity, id=op.id, action=op.action, success=False)
+        results.append(result)
+        
+        if (op.entity, op.id) in seen:
+            result.error = "Duplicate operation in batch"
+            continue
+        seen.add((op.entity, op.id))
+        
+        if op.id not in existing[op.entity]:
+            result.error = "Hotel not found" if op.entity == ApprovalEntity.HOTEL else "Room not found"
+            continue
+        
+        if op.action == ApprovalAction.APPROVE:
+            update_data = {"approval_status": ApprovalStatus.APPROVED}
+        else:
+            update_data = {"approval_status": ApprovalStatus.REJECTED}
+            if op.reason:
+                update_data["rejection_reason"] = op.reason
+        
+        writes[op.entity].append((result, update_data["approval_status"], UpdateOne({"id": op.id}, {"$set": update_data})))
+    
+    for entity, pending in writes.items():
+        if not pending:
+            continue
+        failed = {}
+        try:
+            outcome = await collections[entity].bulk_write([update for _, _, update in pending], ordered=False)
+            matched = outcome.matched_count
+        except BulkWriteError as e:
+            failed = {error["index"]: error.get("errmsg", "Write failed") for error in e.details.get("writeErrors", [])}
+            matched = e.details.get("nMatched", 0)
+        
+        remaining = None
+        if matched < len(pending) - len(failed):
+            # Some were deleted after the lookup, find out which
+            ids = [result.id for result, _, _ in pending]
+            found = await collections[entity].find({"id": {"$in": ids}}, {"_id": 0, "id": 1}).to_list(length=len(ids))
+            remaining = {item["id"] for item in found}
+        
+        for index, (result, approval_status, _) in enumerate(pending):
+            if index in failed:
+                result.error = failed[index]
+            elif remaining is not None and result.id not in remaining:
+                result.error = "Hotel not found" if entity == ApprovalEntity.HOTEL else "Room not found"
+            else:
+                result.success = True
+                result.approval_status = approval_status
+                if entity == ApprovalEntity.HOTEL:
+                    invalidate_hotel_cache(result.id)
+                else:
+                    invalidate_room_cache(result.id, existing[entity][result.id])
+    
+    return results
+
+# Request profiles saved by the slow-request profiler
+@api_router.get("/admin/profiles")
+async def get_request_profiles(
+    route: Optional[str] = None,
+    limit: int = 20,
+    current_user: dict = Depends(get_current_user)
+):
+    """Slowest profiled requests and per-route aggregates"""
+    if current_user["role"] != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins can access this endpoint"
+        )
+    
+    profiles = await asyncio.get_running_loop().run_in_executor(None, request_profiler.list_profiles)
+    if route:
+        profiles = [profile for profile in profiles if profile["route"] == route]
+    
+    routes = {}
+    for profile in profiles:
+        entry = routes.setdefault(profile["route"], {"route": profile["route"], "count": 0, "total_ms": 0.0, "max_ms": 0.0})
+        entry["count"] += 1
+        entry["total_ms"] += profile["duration_ms"]
+        entry["max_ms"] = max(entry["max_ms"], profile["duration_ms"])
+    for entry in routes.values():
+        entry["avg_ms"] = round(entry.pop("total_ms") / entry["count"], 2)
+    
+    profiles.sort(key=lambda profile: profile["duration_ms"], reverse=True)
+    return {
+        "routes": sorted(routes.values(), key=lambda entry: entry["max_ms"], reverse=True),
+        "profiles": profiles[:limit]
+    }
+
+@api_router.get("/admin/profiles/{profile_id}/folded")
+async def get_request_profile_folded(profile_id: str, current_user: dict = Depends(get_current_user)):
+    """Collapsed stacks of one profile, ready for flamegraph.pl or speedscope"""
+    if current_user["role"] != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins can access this endpoint"
+        )
+    
+    folded = request_profiler.read_folded(profile_id)
+    if folded is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return PlainTextResponse(folded)
+
 # Include the router in the main app
 # Delete Hotel Endpoint
 @api_router.delete('/hotels/{hotel_id}')
@@ -2294,13 +3585,16 @@ async def delete_hotel(hotel_id: str, current_user: dict = Depends(get_current_u
         raise HTTPException(status_code=404, detail='Hotel not found')
     if user['role'] not in ['admin', 'hotel_manager']:
         raise HTTPException(status_code=403, detail='Not authorized')
-    if user['role'] == 'hotel_manager' and hotel['manager_id'] != user['user_id']:
+    if user['role'] == 'hotel_manager' and hotel['manager_id'] != user['id']:
         raise HTTPException(status_code=403, detail='Not authorized to delete this hotel')
-    await db.conference_rooms.delete_many({'hotel_id': hotel_id})
-    result = await db.hotels.delete_one({'id': hotel_id})
-    if result.deleted_count == 0:
-        raise HTTPException(status_code=404, detail='Hotel not found')
-    return {'message': 'Hotel deleted successfully'}
+    if hotel.get('deleted_at'):
+        return {'message': 'Hotel deletion already in progress', 'job_id': hotel.get('deletion_job_id')}
+    # Hide immediately, dependent documents and images are purged in the background
+    job = await cascade_deleter.soft_delete_hotel(hotel_id, user['id'])
+    ownership_index.remove_hotel(hotel_id)
+    invalidate_hotel_cache(hotel_id)
+    response_cache.invalidate('rooms', f'hotel_services:{hotel_id}')
+    return {'message': 'Hotel deleted successfully', 'job_id': job['id']}
 
 # Delete Room Endpoint
 @api_router.delete('/rooms/{room_id}')
@@ -2314,12 +3608,15 @@ async def delete_room(room_id: str, current_user: dict = Depends(get_current_use
         raise HTTPException(status_code=404, detail='Hotel not found')
     if user['role'] not in ['admin', 'hotel_manager']:
         raise HTTPException(status_code=403, detail='Not authorized')
-    if user['role'] == 'hotel_manager' and hotel['manager_id'] != user['user_id']:
+    if user['role'] == 'hotel_manager' and hotel['manager_id'] != user['id']:
         raise HTTPException(status_code=403, detail='Not authorized to delete this room')
-    result = await db.conference_rooms.delete_one({'id': room_id})
-    if result.deleted_count == 0:
-        raise HTTPException(status_code=404, detail='Room not found')
-    return {'message': 'Room deleted successfully'}
+    if room.get('deleted_at'):
+        return {'message': 'Room deletion already in progress', 'job_id': room.get('deletion_job_id')}
+    # Hide immediately, dependent documents and images are purged in the background
+    job = await cascade_deleter.soft_delete_room(room_id, user['id'])
+    ownership_index.remove_room(room_id)
+    invalidate_room_cache(room_id, room['hotel_id'])
+    return {'message': 'Room deleted successfully', 'job_id': job['id']}
 
 app.include_router(api_router)
 
@@ -2331,10 +3628,216 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-@app.on_event("shutdown")
-async def shutdown_db_client():
+app.add_middleware(ProfilingMiddleware, profiler=request_profiler)
+# Added last so it wraps everything, including CORS
+app.add_middleware(MetricsMiddleware, registry=metrics_registry)
+
+# Bearer token the Prometheus scraper must send; /metrics is not served without one
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+if not METRICS_TOKEN:
+    logger.warning("METRICS_TOKEN not set - /metrics is disabled")
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics(request: Request):
+    """Prometheus scrape endpoint (outside /api), only for requests carrying METRICS_TOKEN"""
+    if not METRICS_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    supplied = request.headers.get("authorization", "")
+    if not hmac.compare_digest(supplied.encode(), f"Bearer {METRICS_TOKEN}".encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+    return PlainTextResponse(metrics_registry.render(), media_type="text/plain; version=0.0.4")
+
+
+async def find_duplicate_services() -> List[dict]:
+    """Services sharing a (hotel_id, name), which keep the unique service name index from being built"""
+    groups = await db.extra_services.aggregate([
+        {"$sort": {"created_at": 1}},
+        {"$group": {"_id": {"hotel_id": "$hotel_id", "name": "$name"}, "service_ids": {"$push": "$id"}}},
+        {"$match": {"service_ids.1": {"$exists": True}}}
+    ]).to_list(length=None)
+    return [
+        {"hotel_id": group["_id"]["hotel_id"], "name": group["_id"]["name"], "service_ids": group["service_ids"]}
+        for group in groups
+    ]
+
+async def rename_duplicate_services(job_id: str) -> dict:
+    """Give duplicate services a numbered name ("Name (2)"), then build the unique index.
+
+    The oldest service keeps its name; bookings reference services by id, so
+    renaming the others keeps them intact. Every rename is reported in the job
+    result so it can be reviewed or reverted.
+    """
+    duplicates = await find_duplicate_services()
+    await job_tracker.progress(job_id, total=len(duplicates))
+    renamed = []
+    for group in duplicates:
+        hotel_id, name = group["hotel_id"], group["name"]
+        taken = set(await db.extra_services.distinct("name", {"hotel_id": hotel_id}))
+        number = 1
+        for service_id in group["service_ids"][1:]:
+            number += 1
+            while f"{name} ({number})" in taken:
+                number += 1
+            taken.add(f"{name} ({number})")
+            await db.extra_services.update_one({"id": service_id}, {"$set": {"name": f"{name} ({number})"}})
+            renamed.append({"id": service_id, "hotel_id": hotel_id, "old_name": name, "new_name": f"{name} ({number})"})
+        response_cache.invalidate(f"hotel_services:{hotel_id}")
+        await job_tracker.progress(job_id, processed=1)
+    
+    return {"renamed": renamed, "unique_index": await create_service_name_index()}
+
+async def create_service_name_index() -> bool:
+    """Build the unique (hotel_id, name) service index, skipped while duplicates exist"""
+    duplicates = await find_duplicate_services()
+    if duplicates:
+        sample = ", ".join(f"{group['hotel_id']}/{group['name']}" for group in duplicates[:10])
+        logger.warning(
+            f"Unique service name index not built: {len(duplicates)} duplicate service name(s) ({sample}). "
+            "Review them with GET /api/admin/services/duplicates"
+        )
+        return False
+    await db.extra_services.create_index([("hotel_id", 1), ("name", 1)], unique=True)
+    return True
+
+async def create_indexes():
+    try:
+        await db.hotels.create_index([("approval_status", 1), ("created_at", 1), ("id", 1)])
+    except Exception as e:
+        logger.error(f"Hotel index creation failed: {e}")
+    try:
+        await db.conference_rooms.create_index([("approval_status", 1), ("created_at", 1), ("id", 1)])
+    except Exception as e:
+        logger.error(f"Room index creation failed: {e}")
+    try:
+        await create_service_name_index()
+    except Exception as e:
+        logger.error(f"Service index creation failed: {e}")
+
+# Per-worker caches are invalidated in every worker through the worker bus
+response_cache.add_listener(lambda tags: worker_bus.publish("response_cache", list(tags)))
+ownership_index.add_listener(lambda kind, entity_id: worker_bus.publish("ownership", {"kind": kind, "id": entity_id}))
+worker_bus.subscribe("response_cache", lambda tags: response_cache.invalidate(*tags, broadcast=False))
+worker_bus.subscribe("ownership", lambda message: (
+    ownership_index.remove_hotel(message["id"], broadcast=False) if message["kind"] == "hotel"
+    else ownership_index.remove_room(message["id"], broadcast=False)
+))
+worker_bus.subscribe("ad_scheduler", lambda payload: ad_scheduler.notify())
+feature_index.add_listener(lambda room_ids: worker_bus.publish("feature_index", room_ids))
+worker_bus.subscribe("feature_index", lambda room_ids: feature_index.mark_dirty(*room_ids, broadcast=False))
+autocomplete_index.add_listener(lambda kind, ids: worker_bus.publish("autocomplete", {"kind": kind, "ids": ids}))
+worker_bus.subscribe("autocomplete", lambda message: autocomplete_index.apply(message["kind"], message["ids"]))
+catalog_snapshot.add_listener(lambda kind, ids: worker_bus.publish("catalog", {"kind": kind, "ids": ids}))
+worker_bus.subscribe("catalog", lambda message: catalog_snapshot.mark_dirty(message["kind"], *message["ids"], broadcast=False))
+geo_index.add_listener(lambda hotel_ids: worker_bus.publish("geo_index", hotel_ids))
+worker_bus.subscribe("geo_index", lambda hotel_ids: geo_index.mark_dirty(*hotel_ids, broadcast=False))
+search_index.add_listener(lambda kind, ids: worker_bus.publish("search_index", {"kind": kind, "ids": ids}))
+worker_bus.subscribe("search_index", lambda message: search_index.mark_dirty(message["kind"], *message["ids"], broadcast=False))
+def invalidate_purged_room_hotel(hotel_id: str):
+    """A purged room's reviews no longer count towards its hotel's reviews and rating"""
+    response_cache.invalidate(f"hotel_reviews:{hotel_id}")
+    invalidate_hotel_cache(hotel_id)
+
+cascade_deleter.add_listener(invalidate_purged_room_hotel)
+# Scheduled status flips change what the public ad listing returns
+ad_scheduler.add_listener(lambda changes: response_cache.invalidate("advertisements"))
+
+leadership_task = None
+
+async def warm_mongo_pool():
+    """Open MONGO_WARMUP_CONNECTIONS pooled connections with concurrent pings"""
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(client.admin.command("ping") for _ in range(max(MONGO_WARMUP_CONNECTIONS, 1))))
+        logger.info(f"Mongo pool warmed with {MONGO_WARMUP_CONNECTIONS} connection(s) in {time.perf_counter() - started:.3f}s")
+    except Exception as e:
+        logger.error(f"Mongo pool warmup failed: {e}")
+
+async def warm_caches():
+    """Open outbound connections and preload rates, ownership and the in-memory indexes before taking traffic"""
+    get_http_client()
+    pairs = [(base.value, target.value) for base in CurrencyCode for target in CurrencyCode if base != target]
+    await asyncio.gather(*(get_exchange_rate(base, target) for base, target in pairs))
+    try:
+        await ownership_index.warm(OWNERSHIP_WARM_LIMIT)
+    except Exception as e:
+        logger.error(f"Ownership index warmup failed: {e}")
+    try:
+        await search_index.rebuild()
+    except Exception as e:
+        logger.error(f"Search index build failed: {e}")
+    try:
+        await geo_index.rebuild()
+    except Exception as e:
+        logger.error(f"Geo index build failed: {e}")
+    try:
+        await feature_index.rebuild()
+    except Exception as e:
+        logger.error(f"Feature index build failed: {e}")
+    try:
+        await autocomplete_index.rebuild()
+    except Exception as e:
+        logger.error(f"Autocomplete index build failed: {e}")
+    try:
+        await catalog_snapshot.rebuild()
+    except Exception as e:
+        logger.error(f"Catalog snapshot build failed: {e}")
+
+async def start_singleton_jobs():
+    """Jobs that must run in exactly one worker"""
+    await cascade_deleter.resume_pending()
+    await ad_scheduler.start(db)
+    await ad_analytics.start(db)
+
+async def wait_for_leadership():
+    while not worker_bus.try_acquire_leadership():
+        await asyncio.sleep(LEADER_RETRY_SECONDS)
+    logger.info(f"Worker {os.getpid()} took over background jobs")
+    await start_singleton_jobs()
+
+async def on_startup():
+    global leadership_task
+    ensure_upload_dirs()
+    await warm_mongo_pool()
+    await create_indexes()
+    job_tracker.init(db)
+    cascade_deleter.init(db, job_tracker, HOTEL_IMAGES_DIR, ROOM_IMAGES_DIR)
+    await worker_bus.start(WORKER_BUS_DIR)
+    await warm_caches()
+    
+    if worker_bus.try_acquire_leadership():
+        await start_singleton_jobs()
+    else:
+        leadership_task = asyncio.create_task(wait_for_leadership())
+
+async def on_shutdown():
+    global leadership_task, http_client
+    if leadership_task:
+        leadership_task.cancel()
+        leadership_task = None
+    if worker_bus.is_leader:
+        await ad_scheduler.stop()
+        await ad_analytics.stop()
+    # Let in-flight background jobs finish (purges resume on the next startup if cut short)
+    await job_tracker.drain(SHUTDOWN_DRAIN_SECONDS)
+    await worker_bus.stop()
+    if http_client is not None:
+        await http_client.aclose()
+        http_client = None
     client.close()
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8001)
+    # WEB_CONCURRENCY > 1 runs that many worker processes, each with its own
+    # event loop, Mongo pool and in-memory caches
+    uvicorn.run(
+        "server:app",
+        app_dir=str(ROOT_DIR),
+        host=os.environ.get("HOST", "0.0.0.0"),
+        port=int(os.environ.get("PORT", 8001)),
+        workers=int(os.environ.get("WEB_CONCURRENCY", 1)),
+        timeout_graceful_shutdown=int(SHUTDOWN_DRAIN_SECONDS) + 10
+    )
@@ -0,0 +1,126 @@
+import asyncio
+import fcntl
+import json
+import logging
+import os
+import socket
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Unix datagrams are reliable and ordered on one host, but keep messages small
+MAX_MESSAGE_BYTES = 64 * 1024
+
+
+class _BusProtocol(asyncio.DatagramProtocol):
+    def __init__(self, bus):
+        self.bus = bus
+
+    def datagram_received(self, data, addr):
+        self.bus._dispatch(data)
+
+
+class WorkerBus:
+    """Best-effort pub/sub between the worker processes of one host.
+
+    Every worker binds a Unix datagram socket named after its pid in a shared
+    directory; publish() sends the message to every other socket found there.
+    Sockets left behind by dead workers are removed on the first failed send.
+    Used to fan out invalidations of per-worker in-memory caches.
+
+    The same directory holds a lock file, and the worker that holds the lock
+    is the leader and runs the singleton background jobs.
+    """
+
+    def __init__(self):
+        self.directory = None
+        self.path = None
+        self._transport = None
+        self._sender = None
+        self._subscribers = {}
+        self._leader_file = None
+
+    def subscribe(self, channel: str, callback):
+        """callback(payload) runs on the event loop for messages from other workers"""
+        self._subscribers.setdefault(channel, []).append(callback)
+
+    async def start(self, directory: str):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.path = self.directory / f"{os.getpid()}.sock"
+        self.path.unlink(missing_ok=True)
+
+        receiver = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        receiver.bind(str(self.path))
+        receiver.setblocking(False)
+        self._transport, _ = await asyncio.get_running_loop().create_datagram_endpoint(
+            lambda: _BusProtocol(self), sock=receiver
+        )
+        self._sender = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._sender.setblocking(False)
+
+    def publish(self, channel: str, payload=None):
+        if self._sender is None:
+            return
+        data = json.dumps({"channel": channel, "payload": payload}).encode()
+        if len(data) > MAX_MESSAGE_BYTES:
+            logger.error(f"Worker bus message on {channel} too large ({len(data)} bytes), dropped")
+            return
+        for peer in self.directory.glob("*.sock"):
+            if peer == self.path:
+                continue
+            try:
+                self._sender.sendto(data, str(peer))
+            except (ConnectionRefusedError, FileNotFoundError):
+                # The worker that owned it is gone
+                peer.unlink(missing_ok=True)
+            except BlockingIOError:
+                logger.warning(f"Worker bus peer {peer.name} is not reading, message on {channel} dropped")
+            except OSError as e:
+                logger.error(f"Worker bus send to {peer.name} failed: {e}")
+
+    def _dispatch(self, data: bytes):
+        try:
+            message = json.loads(data)
+        except ValueError:
+            return
+        for callback in self._subscribers.get(message.get("channel"), []):
+            try:
+                callback(message.get("payload"))
+            except Exception as e:
+                logger.error(f"Worker bus subscriber error on {message.get('channel')}: {e}")
+
+    def try_acquire_leadership(self) -> bool:
+        """Non-blocking; the lock is released when this process exits"""
+        if self._leader_file is not None:
+            return True
+        lock_file = open(self.directory / "leader.lock", "w")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._leader_file = lock_file
+        return True
+
+    @property
+    def is_leader(self) -> bool:
+        return self._leader_file is not None
+
+    async def stop(self):
+        if self._transport:
+            self._transport.close()
+            self._transport = None
+        if self._sender:
+            self._sender.close()
+            self._sender = None
+        if self.path:
+            self.path.unlink(missing_ok=True)
+        if self._leader_file:
+            fcntl.flock(self._leader_file, fcntl.LOCK_UN)
+            self._leader_file.close()
+            self._leader_file = None
+
+
+# Global worker bus instance
+worker_bus = WorkerBus()
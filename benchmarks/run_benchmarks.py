@@ -0,0 +1,441 @@
+"""Load-test and benchmark suite for the MeetDelux booking API.
+
+Seeds a database with synthetic hotels, rooms, bookings, reviews and ads, then
+drives the real FastAPI app in-process through httpx.ASGITransport and reports
+throughput and p50/p95/p99 latency per scenario. Outbound HTTP (GeoIP and
+exchange rates) is stubbed so runs are reproducible and offline.
+
+By default the data lives in mongomock-motor (in backend/requirements.txt);
+pass --mongo-url to benchmark against a real MongoDB (the --db-name database
+is dropped and reseeded). Results are written as JSON so runs from different
+commits can be diffed with --compare.
+
+    python benchmarks/run_benchmarks.py --hotels 50 --requests 300
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/<old>.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import types
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import httpx
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+BACKEND_DIR = ROOT_DIR / "backend"
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+CITIES = ["İstanbul", "Ankara", "İzmir", "Antalya", "Bursa", "Muğla"]
+FEATURES = ["projector", "sound_system", "whiteboard", "wifi", "air_conditioning", "stage", "video_conference"]
+LAYOUTS = ["theater", "classroom", "u_shape", "boardroom", "banquet"]
+BENCH_PASSWORD = "benchmark-password"
+CLIENT_IP = "203.0.113.10"  # documentation range, resolved by the GeoIP stub
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hotels", type=int, default=50)
+    parser.add_argument("--rooms-per-hotel", type=int, default=4)
+    parser.add_argument("--bookings", type=int, default=2000)
+    parser.add_argument("--reviews", type=int, default=500)
+    parser.add_argument("--ads", type=int, default=30)
+    parser.add_argument("--requests", type=int, default=200, help="measured requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=10, help="unmeasured requests per scenario")
+    parser.add_argument("--scenario", action="append", help="run only these scenarios (repeatable)")
+    parser.add_argument("--seed", type=int, default=42, help="random seed for the synthetic data")
+    parser.add_argument("--mongo-url", help="benchmark against this MongoDB instead of mongomock-motor")
+    parser.add_argument("--db-name", default="meetdelux_benchmark")
+    parser.add_argument("--output", help="result file (default benchmarks/results/<timestamp>_<commit>.json)")
+    parser.add_argument("--compare", help="previous result file to diff against")
+    return parser.parse_args()
+
+
+def load_app(args):
+    """Import server.py against the benchmark database"""
+    os.environ["MONGO_URL"] = args.mongo_url or "mongodb://localhost:27017"
+    os.environ["DB_NAME"] = args.db_name
+    if not args.mongo_url:
+        try:
+            import mongomock_motor
+        except ImportError:
+            sys.exit("mongomock-motor is not installed: pip install mongomock-motor, or pass --mongo-url")
+        import motor.motor_asyncio
+        motor.motor_asyncio.AsyncIOMotorClient = mongomock_motor.AsyncMongoMockClient
+
+    sys.path.insert(0, str(BACKEND_DIR))
+    import server
+    return server
+
+
+class StubResponse:
+    def __init__(self, payload):
+        self.status_code = 200
+        self._payload = payload
+
+    def json(self):
+        return self._payload
+
+
+class StubAsyncClient:
+    """Stands in for httpx.AsyncClient in server.py: GeoIP and exchange rates only"""
+    RATES = {"EUR": {"EUR": 1.0, "USD": 1.08, "TRY": 35.2}, "USD": {"USD": 1.0, "EUR": 0.93, "TRY": 32.6}}
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def aclose(self):
+        pass
+
+    async def get(self, url, *args, **kwargs):
+        if "ip-api.com" in url:
+            return StubResponse({"countryCode": "TR"})
+        base = url.rstrip("/").rsplit("/", 1)[-1]
+        return StubResponse({"rates": self.RATES.get(base, {})})
+
+
+async def seed(server, args) -> dict:
+    """Insert the synthetic data set, returns ids and credentials the scenarios need"""
+    rng = random.Random(args.seed)
+    db = server.db
+    now = datetime.utcnow()
+    for name in await db.list_collection_names():
+        await db.drop_collection(name)
+
+    password_hash = server.hash_password(BENCH_PASSWORD)
+
+    def new_id():
+        # Derived from the seed so ids are identical between runs
+        return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+    def user(role, index):
+        return {
+            "id": new_id(),
+            "email": f"{role}{index}@benchmark.meetdelux.com",
+            "full_name": f"{role.title()} {index}",
+            "phone": None,
+            "role": role,
+            "password": password_hash,
+            "created_at": now,
+            "is_active": True
+        }
+
+    admin = user("admin", 0)
+    managers = [user("hotel_manager", i) for i in range(max(1, args.hotels // 10))]
+    customers = [user("customer", i) for i in range(20)]
+    await db.users.insert_many([admin] + managers + customers)
+
+    hotels = []
+    for i in range(args.hotels):
+        hotels.append({
+            "id": new_id(),
+            "name": f"Benchmark Hotel {i}",
+            "description": "Synthetic hotel for benchmarks. " * 10,
+            "address": f"Benchmark Cad. No:{i}",
+            "city": rng.choice(CITIES),
+            "phone": "+90 212 000 00 00",
+            "email": f"hotel{i}@benchmark.meetdelux.com",
+            "website": None,
+            "star_rating": rng.randint(3, 5),
+            "facilities": rng.sample(["spa", "pool", "parking", "restaurant", "gym"], 3),
+            "images": [f"https://img.example/hotel{i}_{k}.jpg" for k in range(5)],
+            "latitude": 36 + rng.random() * 6,
+            "longitude": 26 + rng.random() * 18,
+            "manager_id": managers[i % len(managers)]["id"],
+            "created_at": now - timedelta(days=rng.randint(1, 365)),
+            "is_active": True,
+            "approval_status": "approved",
+            "average_rating": round(rng.uniform(3, 5), 1),
+            "total_reviews": 0
+        })
+    await db.hotels.insert_many(hotels)
+
+    rooms = []
+    for hotel in hotels:
+        for k in range(args.rooms_per_hotel):
+            rooms.append({
+                "id": new_id(),
+                "hotel_id": hotel["id"],
+                "name": f"{hotel['name']} Salon {k}",
+                "description": "Synthetic conference room. " * 8,
+                "capacity": rng.choice([20, 50, 100, 200, 500]),
+                "area_sqm": rng.randint(40, 800),
+                "price_per_day": rng.randint(200, 5000),
+                "price_per_hour": rng.randint(50, 600),
+                "currency": rng.choice(["EUR", "USD"]),
+                "room_type": rng.choice(["conference", "meeting", "ballroom"]),
+                "features": rng.sample(FEATURES, 4),
+                "layout_options": rng.sample(LAYOUTS, 2),
+                "images": [f"https://img.example/room_{hotel['id'][:8]}_{k}_{n}.jpg" for n in range(4)],
+                "is_available": True,
+                "created_at": now - timedelta(days=rng.randint(1, 365)),
+                "approval_status": "approved",
+                "average_rating": round(rng.uniform(3, 5), 1),
+                "total_bookings": 0
+            })
+    await db.conference_rooms.insert_many(rooms)
+
+    bookings = []
+    for i in range(args.bookings):
+        room = rng.choice(rooms)
+        customer = customers[0] if i % 2 == 0 else rng.choice(customers)  # customer0 is the heavy user
+        start = now + timedelta(days=rng.randint(-180, 180))
+        days = rng.randint(1, 3)
+        bookings.append({
+            "id": new_id(),
+            "room_id": room["id"],
+            "customer_id": customer["id"],
+            "start_date": start,
+            "end_date": start + timedelta(days=days),
+            "guest_count": rng.randint(10, room["capacity"]),
+            "booking_type": "daily",
+            "total_days": days,
+            "total_hours": None,
+            "room_price": room["price_per_day"] * days,
+            "services_price": 0.0,
+            "total_price": room["price_per_day"] * days,
+            "status": rng.choice(["pending", "confirmed", "completed", "cancelled"]),
+            "payment_status": "pending",
+            "special_requests": None,
+            "extra_services": [],
+            "contact_person": customer["full_name"],
+            "contact_phone": "+90 555 000 00 00",
+            "contact_email": customer["email"],
+            "company_name": "Benchmark A.Ş.",
+            "created_at": start - timedelta(days=rng.randint(1, 60)),
+            "updated_at": start
+        })
+    if bookings:
+        await db.bookings.insert_many(bookings)
+
+    reviews = []
+    for i in range(args.reviews):
+        booking = rng.choice(bookings) if bookings else None
+        room = next((r for r in rooms if booking and r["id"] == booking["room_id"]), rng.choice(rooms))
+        rating = rng.randint(1, 5)
+        reviews.append({
+            "id": new_id(),
+            "booking_id": booking["id"] if booking else new_id(),
+            "customer_id": customers[i % len(customers)]["id"],
+            "customer_name": customers[i % len(customers)]["full_name"],
+            "hotel_id": room["hotel_id"],
+            "room_id": room["id"],
+            "hotel_rating": rating,
+            "room_rating": rating,
+            "service_rating": rating,
+            "catering_rating": None,
+            "overall_rating": rating,
+            "title": "Benchmark review",
+            "comment": "Synthetic review text. " * 5,
+            "would_recommend": rating >= 3,
+            "event_type": rng.choice(["seminer", "toplanti", "gala", "workshop"]),
+            "attendee_count": rng.randint(10, 200),
+            "created_at": now - timedelta(days=rng.randint(1, 365)),
+            "is_verified": True,
+            "hotel_response": None,
+            "hotel_response_date": None
+        })
+    if reviews:
+        await db.reviews.insert_many(reviews)
+
+    ads = []
+    for i in range(args.ads):
+        ads.append({
+            "id": new_id(),
+            "title": f"Benchmark ad {i}",
+            "description": "Synthetic advertisement",
+            "ad_type": rng.choice(["hero_banner", "featured_hotel", "sponsored_room", "side_banner", "bottom_promotion"]),
+            "target_id": rng.choice(hotels)["id"],
+            "target_url": None,
+            "image_url": f"https://img.example/ad{i}.jpg",
+            "start_date": now - timedelta(days=10),
+            "end_date": now + timedelta(days=30),
+            "priority": rng.randint(0, 10),
+            "max_daily_views": None,
+            "is_active": True,
+            "advertiser_id": admin["id"],
+            "created_at": now,
+            "updated_at": now,
+            "total_views": 0,
+            "total_clicks": 0,
+            "status": "active"
+        })
+    if ads:
+        await db.advertisements.insert_many(ads)
+
+    return {
+        "customer_email": customers[0]["email"],
+        "manager_email": managers[0]["email"],
+        "cities": CITIES,
+        "room_ids": [room["id"] for room in rooms],
+        "ad_ids": [ad["id"] for ad in ads],
+        "counts": {
+            "hotels": len(hotels),
+            "rooms": len(rooms),
+            "bookings": len(bookings),
+            "reviews": len(reviews),
+            "ads": len(ads)
+        }
+    }
+
+
+async def login(client, email) -> dict:
+    response = await client.post("/api/auth/login", json={"email": email, "password": BENCH_PASSWORD})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def build_scenarios(data, customer_headers, manager_headers, rng):
+    """name -> callable(client) returning an awaitable response"""
+    def rooms(client):
+        return client.get("/api/rooms", params={"city": rng.choice(data["cities"]), "limit": 20})
+
+    def availability(client):
+        start = datetime.utcnow() + timedelta(days=rng.randint(1, 120))
+        return client.post(f"/api/rooms/{rng.choice(data['room_ids'])}/availability", json={
+            "room_id": "x",
+            "start_date": start.isoformat(),
+            "end_date": (start + timedelta(days=1)).isoformat()
+        })
+
+    def ad_view(client):
+        ad_id = rng.choice(data["ad_ids"])
+        return client.post(f"/api/advertisements/{ad_id}/view", json={"ad_id": ad_id, "clicked": rng.random() < 0.05})
+
+    scenarios = {
+        "auth_login": lambda client: client.post(
+            "/api/auth/login", json={"email": data["customer_email"], "password": BENCH_PASSWORD}
+        ),
+        "search_rooms": rooms,
+        "room_availability": availability,
+        "bookings_customer": lambda client: client.get("/api/bookings", headers=customer_headers),
+        "bookings_manager": lambda client: client.get("/api/bookings", headers=manager_headers),
+        "advertisements_public": lambda client: client.get("/api/advertisements/public", params={"limit": 10}),
+    }
+    if data["ad_ids"]:
+        scenarios["track_ad_view"] = ad_view
+    return scenarios
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+
+async def run_scenario(client, call, args) -> dict:
+    for _ in range(args.warmup):
+        await call(client)
+
+    latencies = []
+    errors = 0
+    remaining = iter(range(args.requests))
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            started = time.perf_counter()
+            response = await call(client)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    to_ms = lambda value: round(value * 1000, 3) if value is not None else None
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else None,
+        "mean_ms": to_ms(statistics.fmean(latencies)) if latencies else None,
+        "p50_ms": to_ms(percentile(latencies, 0.50)),
+        "p95_ms": to_ms(percentile(latencies, 0.95)),
+        "p99_ms": to_ms(percentile(latencies, 0.99)),
+        "max_ms": to_ms(latencies[-1]) if latencies else None
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def print_report(results, previous=None):
+    header = f"{'scenario':<24}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}"
+    if previous:
+        header += f"{'Δ p50':>10}{'Δ rps':>10}"
+    print(header)
+    for name, result in results["scenarios"].items():
+        line = f"{name:<24}{result['throughput_rps']:>10}{result['p50_ms']:>10}{result['p95_ms']:>10}{result['p99_ms']:>10}{result['errors']:>8}"
+        old = (previous or {}).get("scenarios", {}).get(name)
+        if old and old.get("p50_ms") and old.get("throughput_rps"):
+            line += f"{(result['p50_ms'] / old['p50_ms'] - 1) * 100:>+9.1f}%"
+            line += f"{(result['throughput_rps'] / old['throughput_rps'] - 1) * 100:>+9.1f}%"
+        print(line)
+
+
+async def main():
+    args = parse_args()
+    server = load_app(args)
+    # Only server.py's view of httpx is replaced, the benchmark client stays real
+    server.httpx = types.SimpleNamespace(AsyncClient=StubAsyncClient)
+
+    data = await seed(server, args)
+    async with server.app.router.lifespan_context(server.app):
+        transport = httpx.ASGITransport(app=server.app, client=(CLIENT_IP, 50000))
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=60) as client:
+            customer_headers = await login(client, data["customer_email"])
+            manager_headers = await login(client, data["manager_email"])
+            scenarios = build_scenarios(data, customer_headers, manager_headers, random.Random(args.seed))
+
+            results = {
+                "meta": {
+                    "commit": git_commit(),
+                    "timestamp": datetime.utcnow().isoformat(),
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "database": "mongodb" if args.mongo_url else "mongomock-motor",
+                    "params": {key: value for key, value in vars(args).items() if key not in ("output", "compare", "mongo_url")},
+                    "data": data["counts"]
+                },
+                "scenarios": {}
+            }
+            for name, call in scenarios.items():
+                if args.scenario and name not in args.scenario:
+                    continue
+                print(f"running {name} ...", file=sys.stderr)
+                results["scenarios"][name] = await run_scenario(client, call, args)
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{datetime.utcnow():%Y%m%dT%H%M%S}_{results['meta']['commit']}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2, ensure_ascii=False))
+
+    previous = json.loads(Path(args.compare).read_text()) if args.compare else None
+    print_report(results, previous)
+    print(f"\nresults written to {output}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
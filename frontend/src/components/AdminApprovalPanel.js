@@ -7,6 +7,9 @@ import { toast } from 'sonner';
 
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
 const API = `${BACKEND_URL}/api`;
+// Limits of /admin/approvals/pending pages and /admin/approvals/batch requests
+const PENDING_PAGE_SIZE = 200;
+const APPROVAL_BATCH_SIZE = 500;
 
 const AdminApprovalPanel = () => {
   const { user } = useContext(AuthContext);
@@ -89,6 +92,47 @@ const AdminApprovalPanel = () => {
     }
   };
 
+  // Every pending id of an entity, the lists above only show the first 100
+  const fetchAllPendingIds = async (entity) => {
+    const ids = [];
+    let cursor = null;
+    do {
+      const response = await axios.get(`${API}/admin/approvals/pending`, {
+        params: { entity, limit: PENDING_PAGE_SIZE, cursor: cursor || undefined }
+      });
+      ids.push(...response.data.items.map((item) => item.id));
+      cursor = response.data.next_cursor;
+    } while (cursor);
+    return ids;
+  };
+
+  const handleApproveAll = async () => {
+    const entity = activeTab === 'hotels' ? 'hotel' : 'room';
+    if ((activeTab === 'hotels' ? pendingHotels : pendingRooms).length === 0) return;
+    try {
+      const ids = await fetchAllPendingIds(entity);
+      if (ids.length === 0) return;
+      if (!window.confirm(`${ids.length} öğenin tamamı onaylansın mı?`)) return;
+      let approvedCount = 0;
+      for (let start = 0; start < ids.length; start += APPROVAL_BATCH_SIZE) {
+        const response = await axios.post(`${API}/admin/approvals/batch`, {
+          operations: ids.slice(start, start + APPROVAL_BATCH_SIZE).map((id) => ({ entity, id, action: 'approve' }))
+        });
+        approvedCount += response.data.filter((result) => result.success).length;
+      }
+      if (approvedCount === ids.length) {
+        toast.success(`${approvedCount} öğe onaylandı!`);
+      } else {
+        toast.warning(`${approvedCount} / ${ids.length} öğe onaylandı`);
+      }
+      fetchPendingItems();
+    } catch (error) {
+      console.error('Error approving items:', error);
+      toast.error('Toplu onay sırasında hata oluştu');
+      fetchPendingItems();
+    }
+  };
+
   if (!user || user.role !== 'admin') {
     return (
       <div className="container mx-auto px-4 py-8">
@@ -146,6 +190,18 @@ const AdminApprovalPanel = () => {
             )}
           </div>
         </button>
+
+        {(activeTab === 'hotels' ? pendingHotels : pendingRooms).length > 0 && (
+          <div className="ml-auto pb-2">
+            <Button
+              onClick={handleApproveAll}
+              className="bg-green-600 hover:bg-green-700 text-white"
+            >
+              <CheckCircle className="h-4 w-4 mr-2" />
+              Tümünü Onayla
+            </Button>
+          </div>
+        )}
       </div>
 
       {loading ? (
@@ -11,6 +11,19 @@ import CreateRoomModal from './CreateRoomModal';
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
 const API = `${BACKEND_URL}/api`;
 
+const CURRENCY_SYMBOLS = { TRY: '₺', EUR: '€', USD: '$' };
+
+// Revenue is only meaningful per currency, amounts in different currencies are never added up
+const revenueByCurrency = (items) => {
+  const totals = {};
+  items.forEach(({ currency, revenue }) => {
+    totals[currency] = (totals[currency] || 0) + revenue;
+  });
+  return Object.entries(totals)
+    .map(([currency, revenue]) => ({ currency, revenue }))
+    .sort((a, b) => b.revenue - a.revenue);
+};
+
 const Dashboard = () => {
   const { user } = useContext(AuthContext);
   const [hotels, setHotels] = useState([]);
@@ -29,7 +42,7 @@ const Dashboard = () => {
     totalRooms: 0,
     totalBallrooms: 0,
     totalBookings: 0,
-    totalRevenue: 0
+    revenueByCurrency: []
   });
 
   useEffect(() => {
@@ -63,7 +76,10 @@ const Dashboard = () => {
           totalRooms: otherRoomsList.length,
           totalBallrooms: ballroomsList.length,
           totalBookings: allRoomsList.reduce((sum, room) => sum + (room.total_bookings || 0), 0),
-          totalRevenue: allRoomsList.reduce((sum, room) => sum + (room.price_per_day * (room.total_bookings || 0)), 0)
+          revenueByCurrency: revenueByCurrency(allRoomsList.map(room => ({
+            currency: room.currency || 'EUR',
+            revenue: room.price_per_day * (room.total_bookings || 0)
+          })))
         });
       } else if (user.role === 'hotel_manager') {
         // Hotel manager sees only their data
@@ -99,12 +115,23 @@ const Dashboard = () => {
           console.error('Error fetching advertisements:', error);
         }
         
+        // Booking and revenue figures are aggregated server-side
+        let bookingStats = { bookings: 0, revenue_by_currency: [] };
+        try {
+          const statsResponse = await axios.get(`${API}/manager/stats`, {
+            headers: { Authorization: `Bearer ${localStorage.getItem('token')}` }
+          });
+          bookingStats = statsResponse.data;
+        } catch (error) {
+          console.error('Error fetching manager stats:', error);
+        }
+        
         setStats({
           totalHotels: userHotels.length,
           totalRooms: otherRoomsList.length,
           totalBallrooms: ballroomsList.length,
-          totalBookings: allRooms.reduce((sum, room) => sum + (room.total_bookings || 0), 0),
-          totalRevenue: allRooms.reduce((sum, room) => sum + (room.price_per_day * (room.total_bookings || 0)), 0)
+          totalBookings: bookingStats.bookings,
+          revenueByCurrency: revenueByCurrency(bookingStats.revenue_by_currency)
         });
       }
     } catch (error) {
@@ -269,7 +296,15 @@ const Dashboard = () => {
               <div className="flex items-center justify-between">
                 <div>
                   <p className="text-sm font-medium text-gray-500">Toplam Gelir</p>
-                  <p className="text-3xl font-bold text-gray-900">₺{stats.totalRevenue.toLocaleString()}</p>
+                  {stats.revenueByCurrency.length === 0 ? (
+                    <p className="text-3xl font-bold text-gray-900">0</p>
+                  ) : (
+                    stats.revenueByCurrency.map(({ currency, revenue }) => (
+                      <p key={currency} className="text-3xl font-bold text-gray-900">
+                        {CURRENCY_SYMBOLS[currency] || `${currency} `}{revenue.toLocaleString()}
+                      </p>
+                    ))
+                  )}
                 </div>
                 <TrendingUp className="h-8 w-8 text-orange-600" />
               </div>
@@ -76,6 +76,7 @@ const HomePage = () => {
     capacity: '',
     roomType: 'seminar'
   });
+  const [suggestions, setSuggestions] = useState([]);
   const navigate = useNavigate();
 
   useEffect(() => {
@@ -83,6 +84,33 @@ const HomePage = () => {
     fetchAdvertisements();
   }, []);
 
+  // City / hotel suggestions while typing
+  useEffect(() => {
+    const prefix = searchParams.city.trim();
+    if (!prefix) {
+      setSuggestions([]);
+      return;
+    }
+    const timer = setTimeout(async () => {
+      try {
+        const response = await axios.get(`${API}/autocomplete`, { params: { prefix } });
+        setSuggestions(response.data);
+      } catch (error) {
+        setSuggestions([]);
+      }
+    }, 150);
+    return () => clearTimeout(timer);
+  }, [searchParams.city]);
+
+  const handleSuggestionSelect = (suggestion) => {
+    setSuggestions([]);
+    if (suggestion.type === 'hotel') {
+      navigate(`/hotels/${suggestion.id}`);
+    } else {
+      handleSearchParamChange('city', suggestion.value);
+    }
+  };
+
   // Auto-play carousel
   useEffect(() => {
     const timer = setInterval(() => {
@@ -373,7 +401,7 @@ const HomePage = () => {
                 <div className="grid grid-cols-1 md:grid-cols-12 gap-4 mb-6">
                   
                   {/* Location - Larger */}
-                  <div className="md:col-span-4">
+                  <div className="md:col-span-4 relative">
                     <label className="block text-sm font-semibold text-gray-700 mb-2 flex items-center">
                       <MapPin className="h-4 w-4 mr-1 text-indigo-600" />
                       Şehir / Otel Adı
@@ -383,8 +411,30 @@ const HomePage = () => {
                       placeholder="İstanbul, Ankara, İzmir..."
                       value={searchParams.city}
                       onChange={(e) => handleSearchParamChange('city', e.target.value)}
+                      onBlur={() => setTimeout(() => setSuggestions([]), 150)}
                       className="w-full h-12 px-4 text-gray-700 border-2 border-gray-200 rounded-xl focus:border-indigo-500 focus:ring-2 focus:ring-indigo-200"
                     />
+                    {suggestions.length > 0 && (
+                      <ul className="absolute z-20 left-0 right-0 mt-1 bg-white border border-gray-200 rounded-xl shadow-lg overflow-hidden">
+                        {suggestions.map((suggestion) => (
+                          <li
+                            key={`${suggestion.type}-${suggestion.id || suggestion.value}`}
+                            onMouseDown={() => handleSuggestionSelect(suggestion)}
+                            className="px-4 py-2 cursor-pointer hover:bg-indigo-50 flex items-center justify-between text-sm"
+                          >
+                            <span className="flex items-center text-gray-800">
+                              {suggestion.type === 'city'
+                                ? <MapPin className="h-4 w-4 mr-2 text-indigo-600" />
+                                : <Building2 className="h-4 w-4 mr-2 text-indigo-600" />}
+                              {suggestion.value}
+                            </span>
+                            <span className="text-xs text-gray-400">
+                              {suggestion.type === 'city' ? `${suggestion.hotel_count} otel` : suggestion.city}
+                            </span>
+                          </li>
+                        ))}
+                      </ul>
+                    )}
                   </div>
 
                   {/* Start Date */}
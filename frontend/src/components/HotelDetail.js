@@ -26,15 +26,12 @@ const HotelDetail = () => {
 
   const fetchHotelDetails = async () => {
     try {
-      const [hotelResponse, roomsResponse, servicesResponse] = await Promise.all([
-        axios.get(`${API}/hotels/${id}`),
-        axios.get(`${API}/hotels/${id}/rooms`),
-        axios.get(`${API}/hotels/${id}/services`).catch(() => ({ data: [] }))
-      ]);
+      // Hotel, rooms and services in one request
+      const response = await axios.get(`${API}/hotels/${id}/full`);
       
-      setHotel(hotelResponse.data);
-      setRooms(roomsResponse.data);
-      setServices(servicesResponse.data);
+      setHotel(response.data.hotel);
+      setRooms(response.data.rooms);
+      setServices(response.data.services);
     } catch (error) {
       console.error('Hotel details fetch error:', error);
       toast.error('Otel bilgileri yüklenirken hata oluştu');
@@ -1,13 +1,26 @@
-import React, { useState } from 'react';
+import React, { useState, useEffect } from 'react';
+import axios from 'axios';
 import { Button } from './ui/button';
 import { Card, CardContent, CardHeader, CardTitle } from './ui/card';
 import { Badge } from './ui/badge';
 import { X, Check, Users, MapPin, DollarSign, Star, Calendar } from 'lucide-react';
 
-const RoomComparison = ({ rooms, hotels, onClose }) => {
+const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
+const API = `${BACKEND_URL}/api`;
+
+const RoomComparison = ({ rooms, hotels = [], onClose }) => {
   const [selectedRooms, setSelectedRooms] = useState(rooms.slice(0, 3));
 
-  const getHotel = (hotelId) => hotels.find(h => h.id === hotelId);
+  useEffect(() => {
+    const ids = rooms.slice(0, 3).map(room => room.id);
+    if (ids.length === 0) return;
+    // One request for every room with its hotel and services
+    axios.get(`${API}/rooms/batch?ids=${ids.join(',')}`)
+      .then(response => setSelectedRooms(current => response.data.filter(room => current.some(r => r.id === room.id))))
+      .catch(error => console.error('Error fetching rooms for comparison:', error));
+  }, [rooms]);
+
+  const getHotel = (room) => room.hotel || hotels.find(h => h.id === room.hotel_id);
 
   const removeRoom = (roomId) => {
     setSelectedRooms(prev => prev.filter(room => room.id !== roomId));
@@ -60,7 +73,7 @@ const RoomComparison = ({ rooms, hotels, onClose }) => {
         <div className="p-6">
           <div className="grid grid-cols-1 md:grid-cols-3 gap-6">
             {selectedRooms.map((room) => {
-              const hotel = getHotel(room.hotel_id);
+              const hotel = getHotel(room);
               return (
                 <Card key={room.id} className="relative">
                   {/* Remove Button */}
@@ -114,6 +127,12 @@ const RoomComparison = ({ rooms, hotels, onClose }) => {
                           <span className="font-medium">{room.area_sqm} m²</span>
                         </div>
                       )}
+                      {room.services && (
+                        <div className="flex justify-between">
+                          <span className="text-gray-600">Ek Hizmetler:</span>
+                          <span className="font-medium">{room.services.length}</span>
+                        </div>
+                      )}
                       <div className="flex justify-between">
                         <span className="text-gray-600">Otel Yıldızı:</span>
                         <div className="flex">
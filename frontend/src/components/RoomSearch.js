@@ -16,6 +16,7 @@ const API = `${BACKEND_URL}/api`;
 const RoomSearch = () => {
   const [rooms, setRooms] = useState([]);
   const [hotels, setHotels] = useState([]);
+  const [facets, setFacets] = useState(null);
   const [loading, setLoading] = useState(true);
   const [searchParams] = useSearchParams();
   const navigate = useNavigate();
@@ -69,8 +70,12 @@ const RoomSearch = () => {
       if (filters.max_price) params.append('max_price', filters.max_price);
       if (filters.features.length > 0) params.append('features', filters.features.join(','));
       
-      const response = await axios.get(`${API}/rooms?${params.toString()}`);
+      const [response, facetsResponse] = await Promise.all([
+        axios.get(`${API}/rooms?${params.toString()}`),
+        axios.get(`${API}/rooms/facets?${params.toString()}&count_features=${availableFeatures.join(',')}`)
+      ]);
       setRooms(response.data);
+      setFacets(facetsResponse.data);
     } catch (error) {
       console.error('Room search error:', error);
       toast.error('Arama sırasında hata oluştu');
@@ -102,6 +107,14 @@ const RoomSearch = () => {
     });
   };
 
+  // Number of matching rooms that also have this feature (as if it were ticked)
+  const getFeatureCount = (feature) => {
+    if (!facets) return null;
+    // Features are counted on request (count_features) and come back lowercased, anything missing is unknown rather than 0
+    const facet = facets.features.find(f => f.value === feature.toLowerCase());
+    return facet ? facet.count : null;
+  };
+
   const getHotelName = (hotelId) => {
     const hotel = hotels.find(h => h.id === hotelId);
     return hotel ? hotel.name : 'Bilinmeyen Otel';
@@ -253,6 +266,9 @@ const RoomSearch = () => {
                         <label htmlFor={feature} className="flex items-center space-x-2 text-sm text-gray-700 cursor-pointer">
                           {getFeatureIcon(feature)}
                           <span>{getFeatureName(feature)}</span>
+                          {getFeatureCount(feature) !== null && (
+                            <span className="text-gray-400">({getFeatureCount(feature)})</span>
+                          )}
                         </label>
                       </div>
                     ))}
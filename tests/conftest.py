@@ -0,0 +1,90 @@
+import asyncio
+import os
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import httpx
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+
+# The backend modules import each other by bare name (as uvicorn runs them from backend/)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+
+@pytest.fixture
+def db():
+    """Fresh in-memory Motor database per test"""
+    return AsyncMongoMockClient()["test"]
+
+
+@pytest.fixture(scope="session")
+def loop():
+    """One event loop for the app tests: the global indexes and schedulers keep loop-bound locks and events"""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(scope="session")
+def server(tmp_path_factory):
+    """The server module on an in-memory database (it connects and reads its settings at import)"""
+    os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+    os.environ.setdefault("DB_NAME", "meetdelux_test")
+    os.environ["WORKER_BUS_DIR"] = str(tmp_path_factory.mktemp("worker_bus"))
+    with patch("motor.motor_asyncio.AsyncIOMotorClient", AsyncMongoMockClient):
+        import server
+    return server
+
+
+@pytest.fixture
+def api(server, loop):
+    """api(scenario) runs scenario(client) against the app between its startup and shutdown.
+
+    Exchange rates are pinned to 1.0 so startup never calls the rate API; the
+    database and per-worker caches are emptied after each test.
+    """
+    codes = [code.value for code in server.CurrencyCode]
+    pinned = {(base, target): (1.0, float("inf")) for base in codes for target in codes if base != target}
+
+    def run(scenario):
+        async def main():
+            server.exchange_rate_memory.update(pinned)
+            async with server.app.router.lifespan_context(server.app):
+                transport = httpx.ASGITransport(app=server.app)
+                async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                    return await scenario(client)
+
+        return loop.run_until_complete(main())
+
+    yield run
+    loop.run_until_complete(server.client.drop_database(os.environ["DB_NAME"]))
+    server.exchange_rate_memory.clear()
+    server.currency_contexts.clear()
+    server.response_cache.clear()
+    server.ownership_index.clear()
+
+
+async def login(client, email: str, role: str = "customer") -> dict:
+    """Register a user and return its Authorization header"""
+    await client.post("/api/auth/register", json={"email": email, "full_name": "Test User", "password": "secret", "role": role})
+    response = await client.post("/api/auth/login", json={"email": email, "password": "secret"})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def create_hotel(client, manager: dict, admin: dict = None, **fields) -> dict:
+    """A hotel of manager, approved if admin is given"""
+    hotel = {"name": "Grand Hotel", "address": "Main Street 1", "city": "Izmir", "phone": "1", "email": "hotel@example.com", **fields}
+    created = (await client.post("/api/hotels", headers=manager, json=hotel)).json()
+    if admin:
+        await client.put(f"/api/admin/hotels/{created['id']}/approve", headers=admin)
+    return created
+
+
+async def create_room(client, manager: dict, hotel_id: str, admin: dict = None, **fields) -> dict:
+    """A room of the hotel, approved if admin is given"""
+    room = {"name": "Hall", "capacity": 50, "price_per_day": 100.0, **fields}
+    created = (await client.post(f"/api/hotels/{hotel_id}/rooms", headers=manager, json=room)).json()
+    if admin:
+        await client.put(f"/api/admin/rooms/{created['id']}/approve", headers=admin)
+    return created
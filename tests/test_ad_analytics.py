@@ -0,0 +1,127 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from ad_analytics import AdAnalytics, HyperLogLog
+
+BASE = datetime(2024, 1, 1, 10)
+
+
+def view(ad_id="ad1", minutes=0, ip="1.1.1.1", clicked=False, **fields):
+    return {"ad_id": ad_id, "user_ip": ip, "user_agent": "test", "clicked": clicked, "timestamp": BASE + timedelta(minutes=minutes), **fields}
+
+
+def make_analytics(db) -> AdAnalytics:
+    analytics = AdAnalytics()
+    analytics.db = db
+    asyncio.run(analytics.ensure_indexes())
+    return analytics
+
+
+async def hourly(db) -> dict:
+    return {doc["bucket"]: (doc["views"], doc["clicks"]) async for doc in db.ad_stats_hourly.find({"ad_id": "ad1"})}
+
+
+def test_hyperloglog_estimates_and_merges():
+    first, second = HyperLogLog(), HyperLogLog()
+    for n in range(3000):
+        first.add(f"visitor-{n}")
+    for n in range(2000, 5000):
+        second.add(f"visitor-{n}")
+    assert abs(first.count() - 3000) < 3000 * 0.06
+    first.merge(second)
+    assert abs(first.count() - 5000) < 5000 * 0.06
+    # Adding known visitors or round-tripping the registers changes nothing
+    copy = HyperLogLog(first.to_bytes())
+    copy.add("visitor-1")
+    assert copy.count() == first.count()
+    assert HyperLogLog().count() == 0
+
+
+def test_rollup_buckets_views_and_stamps_them(db):
+    analytics = make_analytics(db)
+
+    async def scenario():
+        await db.ad_views.insert_many([
+            view(minutes=5), view(minutes=10, ip="2.2.2.2", clicked=True), view(minutes=70), view("ad2", minutes=5),
+        ])
+        first = await analytics.rollup()
+        second = await analytics.rollup()
+        daily = await db.ad_stats_daily.find_one({"ad_id": "ad1"})
+        unstamped = await db.ad_views.count_documents({"rolled_up_at": None})
+        return first, second, await hourly(db), daily, unstamped
+
+    first, second, buckets, daily, unstamped = asyncio.run(scenario())
+    assert first["processed"] == 4
+    assert second["processed"] == 0
+    assert buckets == {BASE: (2, 1), BASE + timedelta(hours=1): (1, 0)}
+    assert (daily["views"], daily["clicks"]) == (3, 1)
+    assert HyperLogLog(daily["hll"]).count() == 2
+    assert unstamped == 0
+
+
+def test_late_views_are_rolled_up_by_the_next_run(db):
+    analytics = make_analytics(db)
+
+    async def scenario():
+        await db.ad_views.insert_one(view(minutes=120))
+        await analytics.rollup()
+        # Stored after the watermark passed its timestamp
+        await db.ad_views.insert_one(view(minutes=5))
+        result = await analytics.rollup()
+        return result, await hourly(db)
+
+    result, buckets = asyncio.run(scenario())
+    assert result["processed"] == 1
+    assert buckets == {BASE: (1, 0), BASE + timedelta(hours=2): (1, 0)}
+
+
+def test_interrupted_batch_is_finished_once(db):
+    analytics = make_analytics(db)
+
+    async def scenario():
+        # "merged" reached the buckets before the process stopped, "claimed" did not
+        await db.ad_views.insert_many([
+            view(minutes=5, rollup_batch="merged"), view(minutes=6, rollup_batch="merged"), view(minutes=7, rollup_batch="claimed"),
+        ])
+        await db.ad_stats_hourly.insert_one({"ad_id": "ad1", "bucket": BASE, "views": 2, "clicks": 0, "batches": ["merged"]})
+        result = await analytics.rollup()
+        return result, await hourly(db), await db.ad_views.count_documents({"rolled_up_at": None})
+
+    result, buckets, unstamped = asyncio.run(scenario())
+    assert result["processed"] == 3
+    assert buckets == {BASE: (3, 0)}
+    assert unstamped == 0
+
+
+def test_stats_cover_whole_buckets_and_pending_views(db):
+    analytics = make_analytics(db)
+
+    async def scenario():
+        await db.ad_views.insert_many([view(minutes=5), view(minutes=65)])
+        await analytics.rollup()
+        # Not rolled up yet
+        await db.ad_views.insert_one(view(minutes=70, ip="9.9.9.9", clicked=True))
+        return await analytics.get_stats("ad1", "hour", BASE + timedelta(minutes=30), BASE + timedelta(minutes=61))
+
+    stats = asyncio.run(scenario())
+    assert stats["start"] == BASE
+    assert [(bucket["bucket"], bucket["views"], bucket["clicks"]) for bucket in stats["buckets"]] == [
+        (BASE, 1, 0), (BASE + timedelta(hours=1), 2, 1)
+    ]
+    assert stats["totals"]["views"] == 3
+    assert stats["totals"]["unique_visitors"] == 2
+
+
+def test_rollup_waits_for_another_process_lease(db):
+    analytics, other = make_analytics(db), make_analytics(db)
+
+    async def scenario():
+        await db.ad_views.insert_one(view(minutes=5))
+        assert await other._acquire_lease()
+        blocked = await analytics.rollup()
+        await other._release_lease()
+        return blocked, await analytics.rollup()
+
+    blocked, done = asyncio.run(scenario())
+    assert blocked["processed"] == 0
+    assert done["processed"] == 1
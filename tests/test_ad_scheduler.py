@@ -0,0 +1,122 @@
+import asyncio
+import fcntl
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import ad_scheduler as scheduler_module
+from ad_scheduler import AdStatusScheduler, ACTIVE, EXPIRED, INACTIVE, compute_ad_status
+
+NOW = datetime(2024, 6, 1, 12, 0)
+
+
+def ad(ad_id, start, end, status=INACTIVE, is_active=True):
+    return {"id": ad_id, "start_date": start, "end_date": end, "status": status, "is_active": is_active}
+
+
+def make_scheduler(db) -> AdStatusScheduler:
+    scheduler = AdStatusScheduler()
+    scheduler.db = db
+    return scheduler
+
+
+async def statuses(db) -> dict:
+    return {doc["id"]: doc["status"] async for doc in db.advertisements.find({}, {"_id": 0, "id": 1, "status": 1})}
+
+
+def test_compute_status_edges():
+    assert compute_ad_status(NOW, NOW + timedelta(days=1), True, now=NOW) == ACTIVE
+    assert compute_ad_status(NOW, NOW + timedelta(days=1), False, now=NOW) == INACTIVE
+    assert compute_ad_status(NOW + timedelta(seconds=1), NOW + timedelta(days=1), True, now=NOW) == INACTIVE
+    # end_date is inclusive
+    assert compute_ad_status(NOW - timedelta(days=1), NOW, True, now=NOW) == ACTIVE
+    assert compute_ad_status(NOW - timedelta(days=1), NOW, True, now=NOW + timedelta(milliseconds=1)) == EXPIRED
+
+
+def test_transitions_flip_due_ads_and_notify(db):
+    changes_seen = []
+
+    async def scenario():
+        await db.advertisements.insert_many([
+            ad("due", NOW - timedelta(hours=1), NOW + timedelta(days=1)),
+            ad("paused", NOW - timedelta(hours=1), NOW + timedelta(days=1), is_active=False),
+            ad("future", NOW + timedelta(hours=1), NOW + timedelta(days=1)),
+            ad("over", NOW - timedelta(days=2), NOW - timedelta(seconds=1), status=ACTIVE),
+        ])
+        scheduler = make_scheduler(db)
+        scheduler.add_listener(changes_seen.append)
+        changes = await scheduler.run_transitions(NOW)
+        # Nothing left to do, listeners are not called again
+        await scheduler.run_transitions(NOW)
+        return changes, await statuses(db)
+
+    changes, after = asyncio.run(scenario())
+    assert changes == {"expired": 1, "activated": 1}
+    assert after == {"due": ACTIVE, "paused": INACTIVE, "future": INACTIVE, "over": EXPIRED}
+    assert changes_seen == [changes]
+
+
+def test_next_boundary_is_nearest_start_or_end(db):
+    async def scenario():
+        scheduler = make_scheduler(db)
+        empty = await scheduler.next_boundary(NOW)
+        await db.advertisements.insert_many([
+            ad("later", NOW + timedelta(hours=3), NOW + timedelta(days=1)),
+            ad("running", NOW - timedelta(hours=1), NOW + timedelta(hours=2), status=ACTIVE),
+            # Paused ads never start on their own
+            ad("paused", NOW + timedelta(minutes=5), NOW + timedelta(days=1), is_active=False),
+        ])
+        return empty, await scheduler.next_boundary(NOW)
+
+    empty, boundary = asyncio.run(scenario())
+    assert empty is None
+    assert boundary == NOW + timedelta(hours=2, milliseconds=1)
+
+
+def test_loop_sleeps_until_the_boundary_and_wakes_on_notify(db, monkeypatch):
+    # Without any boundary the loop would sleep for the whole safety interval
+    monkeypatch.setattr(scheduler_module, "MAX_SLEEP_SECONDS", 60)
+
+    async def scenario():
+        scheduler = AdStatusScheduler()
+        await scheduler.start(db)
+        await asyncio.sleep(0.05)
+        assert scheduler.next_run_at is None
+
+        now = datetime.utcnow()
+        await db.advertisements.insert_one(ad("soon", now + timedelta(milliseconds=300), now + timedelta(days=1)))
+        scheduler.notify()
+        await asyncio.sleep(0.05)
+        pending = (await statuses(db))["soon"]
+        boundary = scheduler.next_run_at
+
+        await asyncio.sleep(0.5)
+        started = (await statuses(db))["soon"]
+        await scheduler.stop()
+        return pending, boundary, now, started
+
+    pending, boundary, now, started = asyncio.run(scenario())
+    assert pending == INACTIVE
+    assert abs((boundary - now).total_seconds() - 0.3) < 0.01
+    assert started == ACTIVE
+
+
+def test_only_the_leader_starts_the_scheduler(api, server, monkeypatch):
+    monkeypatch.setattr(server, "LEADER_RETRY_SECONDS", 0.05)
+    lock_path = Path(os.environ["WORKER_BUS_DIR"]) / "leader.lock"
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    other_worker = open(lock_path, "w")
+    fcntl.flock(other_worker, fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+    async def scenario(client):
+        follower = (server.worker_bus.is_leader, server.ad_scheduler._task)
+        fcntl.flock(other_worker, fcntl.LOCK_UN)
+        other_worker.close()
+        await asyncio.sleep(0.2)
+        return follower, (server.worker_bus.is_leader, server.ad_scheduler._task is not None)
+
+    follower, leader = api(scenario)
+    assert follower == (False, None)
+    assert leader == (True, True)
+    # Stopped again on shutdown
+    assert server.ad_scheduler._task is None
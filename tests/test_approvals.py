@@ -0,0 +1,97 @@
+from tests.conftest import create_hotel, create_room, login
+
+
+def test_batch_approves_and_reports_each_operation(api, server):
+    async def scenario(client):
+        admin = await login(client, "admin@example.com", "admin")
+        manager = await login(client, "manager@example.com", "hotel_manager")
+        hotel = await create_hotel(client, manager)
+        other = await create_hotel(client, manager, name="Other Hotel")
+        operations = [
+            {"entity": "hotel", "id": hotel["id"], "action": "approve"},
+            {"entity": "hotel", "id": other["id"], "action": "reject", "reason": "No photos"},
+            {"entity": "hotel", "id": hotel["id"], "action": "reject"},
+            {"entity": "room", "id": "missing", "action": "approve"},
+        ]
+        response = await client.post("/api/admin/approvals/batch", headers=admin, json={"operations": operations})
+        stored = {h["id"]: h async for h in server.db.hotels.find({}, {"_id": 0})}
+        forbidden = await client.post("/api/admin/approvals/batch", headers=manager, json={"operations": operations})
+        return hotel, other, response.json(), stored, forbidden.status_code
+
+    hotel, other, results, stored, forbidden = api(scenario)
+    assert [(r["success"], r["approval_status"], r["error"]) for r in results] == [
+        (True, "approved", None),
+        (True, "rejected", None),
+        (False, None, "Duplicate operation in batch"),
+        (False, None, "Room not found"),
+    ]
+    assert stored[hotel["id"]]["approval_status"] == "approved"
+    assert stored[other["id"]]["rejection_reason"] == "No photos"
+    assert forbidden == 403
+
+
+def test_approved_rooms_show_up_in_cached_reads(api):
+    async def scenario(client):
+        admin = await login(client, "admin@example.com", "admin")
+        manager = await login(client, "manager@example.com", "hotel_manager")
+        hotel = await create_hotel(client, manager, admin)
+        room = await create_room(client, manager, hotel["id"], features=["WiFi"])
+        # Cache the reads that exclude the pending room
+        before = [
+            (await client.get(f"/api/hotels/{hotel['id']}/rooms")).json(),
+            (await client.get("/api/rooms", params={"features": "wifi"})).json(),
+        ]
+        operations = [{"entity": "room", "id": room["id"], "action": "approve"}]
+        await client.post("/api/admin/approvals/batch", headers=admin, json={"operations": operations})
+        after = [
+            [r["id"] for r in (await client.get(f"/api/hotels/{hotel['id']}/rooms")).json()],
+            [r["id"] for r in (await client.get("/api/rooms", params={"features": "wifi"})).json()],
+        ]
+        return room, before, after
+
+    room, before, after = api(scenario)
+    assert before == [[], []]
+    assert after == [[room["id"]], [room["id"]]]
+
+
+def test_pending_pages_cover_every_item(api):
+    async def scenario(client):
+        admin = await login(client, "admin@example.com", "admin")
+        manager = await login(client, "manager@example.com", "hotel_manager")
+        created = [(await create_hotel(client, manager, name=f"Hotel {n}"))["id"] for n in range(5)]
+        seen, cursor = [], None
+        while True:
+            params = {"entity": "hotel", "limit": 2, **({"cursor": cursor} if cursor else {})}
+            page = (await client.get("/api/admin/approvals/pending", headers=admin, params=params)).json()
+            seen.append([item["id"] for item in page["items"]])
+            cursor = page["next_cursor"]
+            if not cursor:
+                return created, seen
+
+    created, seen = api(scenario)
+    assert [len(page) for page in seen] == [2, 2, 1]
+    assert sorted(sum(seen, [])) == sorted(created)
+
+
+def test_items_deleted_before_the_write_are_not_reported_approved(api, server, monkeypatch):
+    collection_type = type(server.db.hotels)
+    bulk_write = collection_type.bulk_write
+
+    async def scenario(client):
+        admin = await login(client, "admin@example.com", "admin")
+        manager = await login(client, "manager@example.com", "hotel_manager")
+        kept = await create_hotel(client, manager)
+        gone = await create_hotel(client, manager, name="Gone Hotel")
+
+        async def racing_bulk_write(collection, operations, **kwargs):
+            # Deleted between the existence lookup and the write
+            await server.db.hotels.delete_one({"id": gone["id"]})
+            return await bulk_write(collection, operations, **kwargs)
+
+        monkeypatch.setattr(collection_type, "bulk_write", racing_bulk_write)
+        operations = [{"entity": "hotel", "id": hotel["id"], "action": "approve"} for hotel in (kept, gone)]
+        response = await client.post("/api/admin/approvals/batch", headers=admin, json={"operations": operations})
+        return response.json()
+
+    results = api(scenario)
+    assert [(r["success"], r["error"]) for r in results] == [(True, None), (False, "Hotel not found")]
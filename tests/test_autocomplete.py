@@ -0,0 +1,96 @@
+import asyncio
+
+from autocomplete import AutocompleteIndex
+
+
+def hotel(hotel_id, name, city, **fields):
+    return {"id": hotel_id, "name": name, "city": city, "is_active": True, "approval_status": "approved", **fields}
+
+
+def build(db, hotels, bookings=()):
+    async def scenario():
+        await db.hotels.insert_many(hotels)
+        if bookings:
+            await db.conference_rooms.insert_many([{"id": f"room-{h['id']}", "hotel_id": h["id"]} for h in hotels])
+            await db.bookings.insert_many([
+                {"id": f"b{n}", "room_id": f"room-{hotel_id}", "status": status}
+                for n, (hotel_id, status) in enumerate(bookings)
+            ])
+        index = AutocompleteIndex()
+        index.init(db)
+        await index.rebuild()
+        return index
+
+    return asyncio.run(scenario())
+
+
+def values(suggestions):
+    return [suggestion["value"] for suggestion in suggestions]
+
+
+def test_prefix_matches_any_word_folded(db):
+    index = build(db, [hotel("h1", "Grand Pera Palas", "İstanbul"), hotel("h2", "Çırağan Palace", "Istanbul")])
+    assert values(index.suggest("pera")) == ["Grand Pera Palas"]
+    assert values(index.suggest("CIRA")) == ["Çırağan Palace"]
+    # Both spellings fold to one city
+    assert [(s["type"], s["hotel_count"]) for s in index.suggest("ist")] == [("city", 2)]
+
+
+def test_ranks_by_non_cancelled_bookings(db):
+    index = build(
+        db,
+        [hotel("h1", "Ankara Hotel", "Ankara"), hotel("h2", "Anadolu Inn", "Ankara"), hotel("h3", "Antik Otel", "Antalya")],
+        bookings=[("h2", "confirmed"), ("h2", "pending"), ("h3", "confirmed"), ("h1", "cancelled")]
+    )
+    assert values(index.suggest("an", limit=6)) == ["Ankara", "Anadolu Inn", "Antalya", "Antik Otel", "Ankara Hotel"]
+
+
+def test_most_popular_match_wins_past_thousands_of_names(db):
+    hotels = [hotel(f"h{n:05d}", f"A{n:05d}", "Bursa") for n in range(3000)]
+    index = build(db, hotels)
+    index.record_booking("h02999")
+    assert values(index.suggest("a", limit=1)) == ["A02999"]
+
+
+def test_cancellation_lowers_popularity(db):
+    index = build(db, [hotel("h1", "Alpha", "Izmir"), hotel("h2", "Alpine", "Izmir")])
+    sent = []
+    index.add_listener(lambda kind, ids: sent.append((kind, ids)))
+    index.record_booking("h2")
+    index.record_booking("h2")
+    index.record_booking("h1")
+    assert values(index.suggest("alp")) == ["Alpine", "Alpha"]
+    index.record_cancellation("h2")
+    index.record_cancellation("h2")
+    assert values(index.suggest("alp")) == ["Alpha", "Alpine"]
+    assert index.suggest("izm")[0]["popularity"] == 1
+    # Popularity never goes negative
+    index.record_cancellation("h2")
+    assert index.suggest("alpine")[0]["popularity"] == 0
+    assert sent[-1] == ("cancellation", ["h2"])
+
+
+def test_changes_from_other_workers_are_applied_without_rebroadcast(db):
+    index = build(db, [hotel("h1", "Alpha", "Izmir")])
+    sent = []
+    index.add_listener(lambda kind, ids: sent.append(kind))
+    index.apply("booking", ["h1"])
+    index.apply("booking", ["h1"])
+    index.apply("cancellation", ["h1"])
+    assert index.suggest("alpha")[0]["popularity"] == 1
+    index.apply("hotel", ["h1"])
+    assert sent == []
+
+
+def test_dropped_hotel_leaves_suggestions(db):
+    index = build(db, [hotel("h1", "Alpha", "Izmir"), hotel("h2", "Beta", "Izmir")])
+    assert values(index.suggest("alpha")) == ["Alpha"]
+
+    async def reject():
+        await db.hotels.update_one({"id": "h1"}, {"$set": {"approval_status": "rejected"}})
+        index.mark_dirty("h1", broadcast=False)
+        await index.sync()
+
+    asyncio.run(reject())
+    assert index.suggest("alpha") == []
+    assert index.suggest("izmir")[0]["hotel_count"] == 1
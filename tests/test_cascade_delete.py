@@ -0,0 +1,146 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from cascade_delete import CascadeDeleter
+from job_tracker import JobTracker
+from tests.conftest import create_hotel, create_room, login
+
+
+def make_deleter(db, tmp_path) -> CascadeDeleter:
+    jobs = JobTracker()
+    jobs.init(db)
+    deleter = CascadeDeleter()
+    (tmp_path / "hotels").mkdir()
+    (tmp_path / "rooms").mkdir()
+    deleter.init(db, jobs, tmp_path / "hotels", tmp_path / "rooms")
+    return deleter
+
+
+async def finish_jobs(deleter: CascadeDeleter):
+    await asyncio.gather(*deleter.jobs._tasks)
+
+
+async def insert_hotel(db, hotel_id="h1", rooms=("r1", "r2")):
+    await db.hotels.insert_one({"id": hotel_id, "name": "Grand", "is_active": True})
+    await db.conference_rooms.insert_many([{"id": room_id, "hotel_id": hotel_id} for room_id in rooms])
+    await db.bookings.insert_many([{"id": f"b-{room_id}", "room_id": room_id} for room_id in rooms])
+    await db.reviews.insert_many([
+        {"id": "v1", "hotel_id": hotel_id, "room_id": rooms[0], "overall_rating": 5},
+        {"id": "v2", "hotel_id": hotel_id, "room_id": rooms[0], "overall_rating": 5},
+        {"id": "v3", "hotel_id": hotel_id, "room_id": rooms[1], "overall_rating": 2},
+    ])
+    await db.extra_services.insert_one({"id": "s1", "hotel_id": hotel_id, "name": "Coffee"})
+    await db.advertisements.insert_many([{"id": "a1", "target_id": hotel_id}, {"id": "a2", "target_id": rooms[1]}])
+
+
+def test_hotel_purge_removes_dependents_and_images(db, tmp_path):
+    deleter = make_deleter(db, tmp_path)
+    for path in (tmp_path / "hotels" / "h1_a.jpg", tmp_path / "rooms" / "r2_b.jpg", tmp_path / "rooms" / "other_c.jpg"):
+        path.write_bytes(b"image")
+
+    async def scenario():
+        await insert_hotel(db)
+        job = await deleter.soft_delete_hotel("h1", requested_by="admin")
+        hidden = await db.conference_rooms.count_documents({"hotel_id": "h1", "is_available": False})
+        await finish_jobs(deleter)
+        left = {name: await db[name].count_documents({}) for name in
+                ("hotels", "conference_rooms", "bookings", "reviews", "extra_services", "advertisements")}
+        return hidden, await deleter.jobs.get(job["id"]), left
+
+    hidden, job, left = asyncio.run(scenario())
+    assert hidden == 2
+    assert job["status"] == "completed"
+    assert job["processed"] == job["total"] == 11
+    assert job["result"]["image_files"] == 2
+    assert set(left.values()) == {0}
+    assert [path.name for path in tmp_path.rglob("*.jpg")] == ["other_c.jpg"]
+
+
+def test_room_purge_recomputes_the_hotel_rating(db, tmp_path):
+    deleter = make_deleter(db, tmp_path)
+    refreshed = []
+    deleter.add_listener(refreshed.append)
+
+    async def scenario():
+        await insert_hotel(db)
+        await db.hotels.update_one({"id": "h1"}, {"$set": {"average_rating": 4.0, "total_reviews": 3}})
+        await deleter.soft_delete_room("r1")
+        await finish_jobs(deleter)
+        after_first = await db.hotels.find_one({"id": "h1"}, {"_id": 0, "average_rating": 1, "total_reviews": 1})
+        await deleter.soft_delete_room("r2")
+        await finish_jobs(deleter)
+        after_last = await db.hotels.find_one({"id": "h1"}, {"_id": 0, "average_rating": 1, "total_reviews": 1})
+        return after_first, after_last
+
+    after_first, after_last = asyncio.run(scenario())
+    assert after_first == {"average_rating": 2.0, "total_reviews": 1}
+    assert after_last == {"average_rating": 0.0, "total_reviews": 0}
+    assert refreshed == ["h1", "h1"]
+
+
+def test_resume_restarts_only_abandoned_purges(db, tmp_path):
+    deleter = make_deleter(db, tmp_path)
+    now = datetime.utcnow()
+
+    async def scenario():
+        await db.jobs.insert_many([
+            {"id": "live", "status": "running", "updated_at": now},
+            {"id": "stale", "status": "running", "updated_at": now - timedelta(hours=1)},
+            {"id": "cut", "status": "interrupted", "updated_at": now},
+        ])
+        await db.hotels.insert_many([
+            {"id": "h-live", "deleted_at": now, "deletion_job_id": "live"},
+            {"id": "h-stale", "deleted_at": now, "deletion_job_id": "stale"},
+        ])
+        await db.conference_rooms.insert_many([
+            {"id": "r-cut", "hotel_id": "h-other", "deleted_at": now, "deletion_job_id": "cut"},
+            # Purged with its hotel
+            {"id": "r-stale", "hotel_id": "h-stale", "deleted_at": now, "deletion_job_id": "stale"},
+        ])
+        await deleter.resume_pending()
+        await finish_jobs(deleter)
+        return (
+            sorted(await db.hotels.distinct("id")),
+            sorted(await db.conference_rooms.distinct("id")),
+            sorted([job["meta"]["entity_id"] async for job in db.jobs.find({"type": {"$exists": True}})]),
+        )
+
+    hotels, rooms, resumed = asyncio.run(scenario())
+    assert hotels == ["h-live"]
+    assert rooms == []
+    assert resumed == ["h-stale", "r-cut"]
+
+
+def test_deleting_a_hotel_hides_it_then_purges_everything(api, server, monkeypatch, tmp_path):
+    monkeypatch.setattr(server, "HOTEL_IMAGES_DIR", tmp_path / "hotels")
+    monkeypatch.setattr(server, "ROOM_IMAGES_DIR", tmp_path / "rooms")
+
+    async def scenario(client):
+        admin = await login(client, "admin@example.com", "admin")
+        manager = await login(client, "manager@example.com", "hotel_manager")
+        other = await login(client, "other@example.com", "hotel_manager")
+        hotel = await create_hotel(client, manager, admin)
+        room = await create_room(client, manager, hotel["id"], admin)
+        (tmp_path / "rooms" / f"{room['id']}_photo.jpg").write_bytes(b"image")
+
+        denied = await client.delete(f"/api/hotels/{hotel['id']}", headers=other)
+        deleted = (await client.delete(f"/api/hotels/{hotel['id']}", headers=manager)).json()
+        visible = [
+            (await client.get(f"/api/hotels/{hotel['id']}")).status_code,
+            (await client.get("/api/rooms")).json(),
+        ]
+        for _ in range(100):
+            job = (await client.get(f"/api/jobs/{deleted['job_id']}", headers=manager)).json()
+            if job["status"] != "running":
+                break
+            await asyncio.sleep(0.01)
+        stored = (await server.db.hotels.count_documents({}), await server.db.conference_rooms.count_documents({}))
+        return denied.status_code, visible, job, stored
+
+    denied, visible, job, stored = api(scenario)
+    assert denied == 403
+    assert visible == [404, []]
+    assert job["status"] == "completed"
+    assert job["result"]["image_files"] == 1
+    assert stored == (0, 0)
+    assert list(tmp_path.rglob("*.jpg")) == []
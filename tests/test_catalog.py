@@ -0,0 +1,149 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from catalog import CatalogSnapshot
+from feature_index import feature_index
+
+FIELDS = ["id", "hotel_id", "name", "capacity", "price_per_day", "currency"]
+START = datetime(2024, 1, 1)
+
+
+def room(room_id, hotel_id="h1", age=0, **fields):
+    return {
+        "id": room_id, "hotel_id": hotel_id, "name": room_id.upper(), "capacity": 10, "price_per_day": 100.0,
+        "currency": "EUR", "approval_status": "approved", "is_available": True,
+        "created_at": START + timedelta(minutes=age), **fields
+    }
+
+
+@pytest.fixture
+def catalog(db, monkeypatch):
+    # The snapshot reads the global feature index, pointed at this database for the test only
+    monkeypatch.setattr(feature_index, "db", db)
+    monkeypatch.setattr(feature_index, "_bits", {})
+    monkeypatch.setattr(feature_index, "_masks", feature_index._masks)
+
+    async def setup():
+        await feature_index.load_vocabulary()
+        await db.hotels.insert_many([
+            {"id": "h1", "is_active": True, "approval_status": "approved"},
+            {"id": "h2", "is_active": True, "approval_status": "approved"},
+            {"id": "pending", "is_active": True, "approval_status": "pending"},
+        ])
+
+    asyncio.run(setup())
+    snapshot = CatalogSnapshot(initial_rows=2, initial_hotels=2)
+    snapshot.init(db, FIELDS)
+    return snapshot
+
+
+def load(catalog, rooms):
+    async def scenario():
+        await catalog.db.conference_rooms.insert_many(rooms)
+        await catalog.rebuild()
+
+    asyncio.run(scenario())
+
+
+def ids(catalog, rows, skip=0, limit=100, fields=None):
+    return [document["id"] for document in catalog.page(rows, skip, limit, fields)]
+
+
+def test_only_visible_rooms_of_visible_hotels(catalog):
+    load(catalog, [
+        room("r1", age=1),
+        room("r2", age=2, approval_status="pending"),
+        room("r3", age=3, is_available=False),
+        room("r4", hotel_id="pending", age=4),
+        room("r5", hotel_id="h2", age=5),
+    ])
+    assert catalog.ready
+    assert ids(catalog, catalog.search()) == ["r1", "r5"]
+    assert ids(catalog, catalog.search(hotel_ids=["h2", "unknown"])) == ["r5"]
+
+
+def test_feature_masks_require_every_value(catalog):
+    load(catalog, [
+        room("r1", age=1, features=["wifi", "projector"], layout_options=["theater"]),
+        room("r2", age=2, features=["wifi"]),
+        room("r3", age=3, features=["projector"], layout_options=["theater", "classroom"]),
+    ])
+    assert ids(catalog, catalog.search(required_mask=feature_index.mask_of(["wifi"]))) == ["r1", "r2"]
+    assert ids(catalog, catalog.search(required_mask=feature_index.mask_of(["wifi", "projector"]))) == ["r1"]
+    assert ids(catalog, catalog.search(required_mask=feature_index.mask_of(["projector"], ["theater"]))) == ["r1", "r3"]
+
+
+def test_masks_wider_than_one_word(catalog):
+    many = [f"f{n}" for n in range(70)]
+    load(catalog, [room("wide", age=1, features=many), room("narrow", age=2, features=many[:2])])
+    assert ids(catalog, catalog.search(required_mask=feature_index.mask_of(["f69"]))) == ["wide"]
+    assert ids(catalog, catalog.search(required_mask=feature_index.mask_of(["f0", "f1"]))) == ["wide", "narrow"]
+    # A bit beyond every stored word matches nothing
+    assert ids(catalog, catalog.search(required_mask=1 << 500)) == []
+
+
+def test_filters_and_sorts(catalog):
+    load(catalog, [
+        room("eur", age=1, capacity=50, price_per_day=100.0),
+        room("usd", age=2, capacity=20, price_per_day=90.0, currency="USD"),
+        room("try", age=3, capacity=200, price_per_day=3000.0, currency="TRY"),
+    ])
+    rates = {"EUR": 1.0, "USD": 1.0 / 1.1, "TRY": 1.0 / 35.0}
+    assert ids(catalog, catalog.search(sort="price", rates=rates)) == ["usd", "try", "eur"]
+    assert ids(catalog, catalog.search(sort="-capacity")) == ["try", "eur", "usd"]
+    assert ids(catalog, catalog.search(min_capacity=30)) == ["eur", "try"]
+    # max_price compares the stored amount
+    assert ids(catalog, catalog.search(max_price=95)) == ["usd"]
+
+
+def test_page_hydrates_requested_fields(catalog):
+    load(catalog, [room(f"r{n}", age=n) for n in range(5)])
+    rows = catalog.search()
+    assert ids(catalog, rows, skip=1, limit=2) == ["r1", "r2"]
+    assert catalog.page(rows, 0, 1, ["id", "capacity", "unknown"]) == [{"id": "r0", "capacity": 10}]
+
+
+def test_sync_applies_room_and_hotel_changes(catalog):
+    load(catalog, [room("r1", age=1), room("r2", hotel_id="h2", age=2)])
+
+    async def scenario():
+        await catalog.db.conference_rooms.update_one({"id": "r1"}, {"$set": {"approval_status": "rejected"}})
+        await catalog.db.conference_rooms.insert_one(room("r3", age=3))
+        await catalog.db.hotels.update_one({"id": "h2"}, {"$set": {"is_active": False}})
+        catalog.mark_dirty("room", "r1", "r3", broadcast=False)
+        catalog.mark_dirty("hotel", "h2", broadcast=False)
+        await catalog.sync()
+
+    asyncio.run(scenario())
+    assert ids(catalog, catalog.search()) == ["r3"]
+
+
+def test_failed_sync_keeps_entries_dirty(catalog):
+    load(catalog, [room("r1", age=1)])
+
+    async def scenario():
+        await catalog.db.conference_rooms.insert_one(room("r2", age=2))
+        catalog.mark_dirty("room", "r2", broadcast=False)
+        load_rooms = catalog._load_rooms
+
+        async def failing_load(query):
+            raise ConnectionError("primary stepped down")
+
+        catalog._load_rooms = failing_load
+        with pytest.raises(ConnectionError):
+            await catalog.sync()
+        catalog._load_rooms = load_rooms
+        await catalog.sync()
+
+    asyncio.run(scenario())
+    assert ids(catalog, catalog.search()) == ["r1", "r2"]
+
+
+def test_dirty_marks_fan_out(catalog):
+    sent = []
+    catalog.add_listener(lambda kind, room_ids: sent.append((kind, room_ids)))
+    catalog.mark_dirty("room", "r1")
+    catalog.mark_dirty("hotel", "h1", broadcast=False)
+    assert sent == [("room", ["r1"])]
@@ -0,0 +1,94 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from tests.conftest import create_hotel, login
+
+
+async def wait_for_job(client, admin: dict, job_id: str) -> dict:
+    for _ in range(100):
+        job = (await client.get(f"/api/admin/jobs/{job_id}", headers=admin)).json()
+        if job["status"] != "running":
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"job {job_id} still running")
+
+
+def test_default_services_are_seeded_once(api, server):
+    async def scenario(client):
+        manager = await login(client, "manager@example.com", "hotel_manager")
+        hotel = await create_hotel(client, manager)
+        first = (await client.post(f"/api/hotels/{hotel['id']}/services/default", headers=manager)).json()
+        second = (await client.post(f"/api/hotels/{hotel['id']}/services/default", headers=manager)).json()
+        stored = await server.db.extra_services.count_documents({"hotel_id": hotel["id"]})
+        return first, second, stored
+
+    first, second, stored = api(scenario)
+    assert len(first["created_services"]) == len(server.DEFAULT_EXTRA_SERVICES)
+    assert second["created_services"] == []
+    assert stored == len(server.DEFAULT_EXTRA_SERVICES)
+
+
+def test_fleet_seed_refreshes_existing_templates(api, server):
+    template = server.DEFAULT_EXTRA_SERVICES[0]
+
+    async def scenario(client):
+        admin = await login(client, "admin@example.com", "admin")
+        manager = await login(client, "manager@example.com", "hotel_manager")
+        hotels = [await create_hotel(client, manager, name=f"Hotel {n}") for n in range(3)]
+        await client.post(f"/api/hotels/{hotels[0]['id']}/services/default", headers=manager)
+        await server.db.extra_services.update_one({"hotel_id": hotels[0]["id"], "name": template["name"]}, {"$set": {"price": 1.0}})
+
+        started = (await client.post("/api/admin/services/default/seed", headers=admin, json={"update_existing": True})).json()
+        job = await wait_for_job(client, admin, started["job_id"])
+        refreshed = await server.db.extra_services.find_one({"hotel_id": hotels[0]["id"], "name": template["name"]})
+        return started, job, refreshed, await server.db.extra_services.count_documents({})
+
+    started, job, refreshed, stored = api(scenario)
+    templates = len(server.DEFAULT_EXTRA_SERVICES)
+    assert started["total_hotels"] == 3
+    assert job["status"] == "completed"
+    assert job["result"]["created"] == 2 * templates
+    assert refreshed["price"] == template["price"]
+    assert stored == 3 * templates
+
+
+def test_duplicate_service_name_is_a_conflict(api):
+    async def scenario(client):
+        manager = await login(client, "manager@example.com", "hotel_manager")
+        hotel = await create_hotel(client, manager)
+        service = {"name": "Coffee", "price": 5, "category": "catering"}
+        first = await client.post(f"/api/hotels/{hotel['id']}/services", headers=manager, json=service)
+        second = await client.post(f"/api/hotels/{hotel['id']}/services", headers=manager, json=service)
+        return first.status_code, second.status_code
+
+    assert api(scenario) == (200, 409)
+
+
+def test_existing_duplicates_are_reported_not_renamed_at_startup(api, server, loop):
+    created = datetime(2024, 1, 1)
+    loop.run_until_complete(server.db.extra_services.insert_many([
+        {"id": f"s{n}", "hotel_id": "h1", "name": "Coffee", "price": 5, "category": "catering", "created_at": created + timedelta(minutes=n)}
+        for n in range(3)
+    ] + [{"id": "s3", "hotel_id": "h1", "name": "Coffee (2)", "price": 5, "category": "catering", "created_at": created}]))
+
+    async def scenario(client):
+        admin = await login(client, "admin@example.com", "admin")
+        names_after_startup = sorted(await server.db.extra_services.distinct("name"))
+        duplicates = (await client.get("/api/admin/services/duplicates", headers=admin)).json()
+        started = (await client.post("/api/admin/services/duplicates/rename", headers=admin)).json()
+        job = await wait_for_job(client, admin, started["job_id"])
+        names = {s["id"]: s["name"] async for s in server.db.extra_services.find()}
+        indexes = await server.db.extra_services.index_information()
+        index_built = any(index["key"] == [("hotel_id", 1), ("name", 1)] and index.get("unique") for index in indexes.values())
+        return names_after_startup, duplicates, job, names, index_built
+
+    names_after_startup, duplicates, job, names, index_built = api(scenario)
+    assert names_after_startup == ["Coffee", "Coffee (2)"]
+    assert duplicates == {"duplicates": [{"hotel_id": "h1", "name": "Coffee", "service_ids": ["s0", "s1", "s2"]}]}
+    assert names == {"s0": "Coffee", "s1": "Coffee (3)", "s2": "Coffee (4)", "s3": "Coffee (2)"}
+    assert job["result"]["renamed"] == [
+        {"id": "s1", "hotel_id": "h1", "old_name": "Coffee", "new_name": "Coffee (3)"},
+        {"id": "s2", "hotel_id": "h1", "old_name": "Coffee", "new_name": "Coffee (4)"},
+    ]
+    assert job["result"]["unique_index"] is True
+    assert index_built
@@ -0,0 +1,57 @@
+from datetime import datetime
+from typing import List, Optional
+
+import pytest
+from pydantic import BaseModel
+
+from fast_json import dumps, projection_for, sparse_fields, trusted_documents
+
+
+class Room(BaseModel):
+    id: str
+    name: str
+    capacity: int
+    features: List[str] = []
+    rating: Optional[float] = None
+
+
+def test_sparse_fields_keeps_model_order_and_adds_id():
+    assert sparse_fields(Room, "capacity, name") == ["id", "name", "capacity"]
+    assert sparse_fields(Room, "name,name,,") == ["id", "name"]
+
+
+def test_sparse_fields_without_parameter_means_every_field():
+    assert sparse_fields(Room, None) is None
+    assert sparse_fields(Room, "") is None
+
+
+def test_sparse_fields_rejects_unknown_field():
+    with pytest.raises(ValueError, match="password"):
+        sparse_fields(Room, "name,password")
+
+
+def test_projection_for_fields():
+    assert projection_for(Room) == {"id": 1, "name": 1, "capacity": 1, "features": 1, "rating": 1, "_id": 0}
+    assert projection_for(Room, ["id", "name"]) == {"id": 1, "name": 1, "_id": 0}
+
+
+def test_trusted_documents_fill_defaults_then_trim():
+    documents = [{"id": "r1", "name": "Hall", "capacity": 10}]
+    full = trusted_documents(Room, documents)
+    assert full == [{"id": "r1", "name": "Hall", "capacity": 10, "features": [], "rating": None}]
+
+    trimmed = trusted_documents(Room, [{"id": "r1", "name": "Hall", "capacity": 10}], ["id", "features"])
+    assert trimmed == [{"id": "r1", "features": []}]
+
+
+def test_default_factories_are_not_shared():
+    documents = trusted_documents(Room, [{"id": "a", "name": "A", "capacity": 1}, {"id": "b", "name": "B", "capacity": 1}])
+    documents[0]["features"].append("wifi")
+    assert documents[1]["features"] == []
+
+
+def test_dumps_accepts_models_and_datetimes():
+    room = Room(id="r1", name="Hall", capacity=10)
+    assert dumps({"room": room, "at": datetime(2024, 1, 2, 3, 4, 5)}) == (
+        b'{"room":{"id":"r1","name":"Hall","capacity":10,"features":[],"rating":null},"at":"2024-01-02T03:04:05"}'
+    )
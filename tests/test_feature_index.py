@@ -0,0 +1,118 @@
+import asyncio
+
+from feature_index import FeatureIndex, feature_keys, mask_words, to_binary
+
+
+def make_index(db) -> FeatureIndex:
+    index = FeatureIndex(initial_rows=2)
+    index.init(db)
+    return index
+
+
+def test_feature_keys_normalise_and_namespace_values():
+    assert feature_keys([" WiFi", "wifi", "", "Projector"], ["U-Shape"]) == [
+        "feature:wifi", "feature:projector", "layout:u-shape"
+    ]
+
+
+def test_stored_mask_is_little_endian():
+    assert bytes(to_binary(0)) == b"\x00"
+    assert bytes(to_binary(1 << 9)) == b"\x00\x02"
+    assert mask_words((1 << 64) | 3, 2).tolist() == [3, 1]
+
+
+def test_workers_agree_on_bits(db):
+    async def scenario():
+        first, second = make_index(db), make_index(db)
+        a = await first.encode(["wifi", "projector"])
+        b = await second.encode(["projector", "catering"])
+        c = await first.encode(["catering"])
+        return a, b, c
+
+    a, b, c = asyncio.run(scenario())
+    assert a == 0b11
+    assert b == 0b110
+    assert c == 0b100
+
+
+def test_rebuild_backfills_masks_and_filters_rooms(db):
+    async def scenario():
+        await db.conference_rooms.insert_many([
+            {"id": "r1", "features": ["wifi", "projector"], "layout_options": ["theater"]},
+            {"id": "r2", "features": ["wifi"], "layout_options": ["theater", "classroom"]},
+            {"id": "r3", "features": ["projector"], "deleted_at": "yesterday"},
+        ])
+        index = make_index(db)
+        await index.rebuild()
+        stored = await db.conference_rooms.find_one({"id": "r1"})
+        return index, stored
+
+    index, stored = asyncio.run(scenario())
+    assert index.size == 2
+    assert int.from_bytes(bytes(stored["feature_mask"]), "little") == index.mask_of(["wifi", "projector"], ["theater"])
+    assert sorted(index.matching(index.mask_of(["wifi"]))) == ["r1", "r2"]
+    assert index.matching(index.mask_of(["wifi", "projector"])) == ["r1"]
+    assert index.matching(index.mask_of([], ["classroom"])) == ["r2"]
+    assert index.mask_of(["sauna"]) is None
+
+
+def test_masks_wider_than_one_word(db):
+    async def scenario():
+        index = make_index(db)
+        many = [f"f{n}" for n in range(70)]
+        await db.conference_rooms.insert_many([
+            {"id": "wide", "features": many},
+            {"id": "narrow", "features": many[:3]},
+        ])
+        await index.rebuild()
+        return index, many
+
+    index, many = asyncio.run(scenario())
+    assert index.matching(index.mask_of(["f69"])) == ["wide"]
+    assert sorted(index.matching(index.mask_of(["f0", "f2"]))) == ["narrow", "wide"]
+
+
+def test_sync_reloads_changed_and_drops_deleted_rooms(db):
+    async def scenario():
+        await db.conference_rooms.insert_many([
+            {"id": "r1", "features": ["wifi"]},
+            {"id": "r2", "features": ["wifi"]},
+        ])
+        index = make_index(db)
+        await index.rebuild()
+        await db.conference_rooms.update_one({"id": "r1"}, {"$set": {"features": ["projector"]}})
+        await db.conference_rooms.delete_one({"id": "r2"})
+        index.mark_dirty("r1", "r2", broadcast=False)
+        await index.sync()
+        return index
+
+    index = asyncio.run(scenario())
+    assert index.matching(index.mask_of(["wifi"])) == []
+    assert index.matching(index.mask_of(["projector"])) == ["r1"]
+    assert index.size == 1
+
+
+def test_failed_sync_keeps_rooms_dirty(db):
+    async def scenario():
+        await db.conference_rooms.insert_one({"id": "r1", "features": ["wifi"]})
+        index = make_index(db)
+        await index.rebuild()
+        await db.conference_rooms.update_one({"id": "r1"}, {"$set": {"features": ["projector"]}})
+        index.mark_dirty("r1", broadcast=False)
+
+        load = index._load
+
+        async def failing_load(query):
+            raise ConnectionError("primary stepped down")
+
+        index._load = failing_load
+        try:
+            await index.sync()
+        except ConnectionError:
+            pass
+        index._load = load
+        await index.sync()
+        return index
+
+    index = asyncio.run(scenario())
+    assert index.matching(index.mask_of(["projector"])) == ["r1"]
@@ -0,0 +1,147 @@
+import asyncio
+
+import pytest
+
+from geo_index import GeoIndex, haversine_km
+from tests.conftest import create_hotel, login
+
+
+def hotel(hotel_id, lat, lng, **fields):
+    return {
+        "id": hotel_id, "name": hotel_id, "city": "Somewhere", "latitude": lat, "longitude": lng,
+        "is_active": True, "approval_status": "approved", **fields
+    }
+
+
+def make_index(db, *hotels) -> GeoIndex:
+    index = GeoIndex()
+    index.init(db)
+
+    async def build():
+        if hotels:
+            await db.hotels.insert_many(list(hotels))
+        await index.rebuild()
+
+    asyncio.run(build())
+    return index
+
+
+def test_haversine_distances():
+    assert haversine_km(0, 0, 0, 0) == 0
+    # One degree of longitude on the equator, and across the antimeridian
+    assert haversine_km(0, 0, 0, 1) == pytest.approx(111.2, abs=0.1)
+    assert haversine_km(0, 179.5, 0, -179.5) == pytest.approx(111.2, abs=0.1)
+
+
+def test_only_mappable_hotels_are_indexed(db):
+    index = make_index(
+        db,
+        hotel("ok", 41.0, 29.0),
+        hotel("pending", 41.0, 29.0, approval_status="pending"),
+        hotel("hidden", 41.0, 29.0, is_active=False),
+        hotel("deleted", 41.0, 29.0, deleted_at="now"),
+        hotel("unplaced", None, None),
+    )
+    assert index.size == 1
+    assert [hit["id"] for hit in index.nearby(41.0, 29.0, 1, 10)] == ["ok"]
+
+
+def test_nearby_is_nearest_first_within_radius(db):
+    index = make_index(
+        db,
+        hotel("center", 41.0, 29.0),
+        hotel("close", 41.05, 29.0),
+        hotel("far", 41.5, 29.0),
+        hotel("east", 0.0, 179.95),
+        hotel("west", 0.0, -179.95),
+    )
+    hits = index.nearby(41.0, 29.0, 10, 10)
+    assert [(hit["id"], round(hit["distance_km"])) for hit in hits] == [("center", 0), ("close", 6)]
+    assert [hit["id"] for hit in index.nearby(41.0, 29.0, 100, 1)] == ["center"]
+    # The search box wraps around the antimeridian
+    assert [hit["id"] for hit in index.nearby(0.0, 179.99, 20, 10)] == ["east", "west"]
+
+
+def test_in_bounds_across_the_antimeridian(db):
+    index = make_index(db, hotel("fiji", -17.7, 178.0), hotel("samoa", -13.8, -172.0), hotel("lima", -12.0, -77.0))
+    assert sorted(hit["id"] for hit in index.in_bounds(-20, 170, -10, -170)) == ["fiji", "samoa"]
+    assert sorted(hit["id"] for hit in index.in_bounds(-20, -180, -10, 180)) == ["fiji", "lima", "samoa"]
+    assert list(index.in_bounds(0, 170, 10, -170)) == []
+
+
+def test_clusters_are_centered_on_their_hotels():
+    index = GeoIndex()
+    hotels = [hotel("a", 10.0, 20.0), hotel("b", 10.2, 20.4), hotel("c", 60.0, 20.0)]
+    singles, clusters = index.clustered(hotels, zoom=4)
+    assert [single["id"] for single in singles] == ["c"]
+    assert clusters == [{
+        "latitude": pytest.approx(10.1), "longitude": pytest.approx(20.2), "count": 2,
+        "south": 10.0, "west": 20.0, "north": 10.2, "east": 20.4
+    }]
+
+
+def test_cluster_on_the_antimeridian():
+    index = GeoIndex()
+    # 180 and -180 are the same meridian, the hotels are 11 km apart
+    _, clusters = index.clustered([hotel("a", 10.0, 180.0), hotel("b", 10.0, -179.9)], zoom=6)
+    assert len(clusters) == 1
+    cluster = clusters[0]
+    assert cluster["longitude"] == pytest.approx(-179.95)
+    assert (cluster["west"], cluster["east"]) == (180.0, -179.9)
+
+
+def test_sync_reloads_dirty_hotels_and_retries_after_a_failure(db):
+    index = make_index(db, hotel("moved", 41.0, 29.0), hotel("rejected", 41.0, 29.0))
+    broadcast = []
+    index.add_listener(broadcast.append)
+
+    async def scenario():
+        await db.hotels.update_one({"id": "moved"}, {"$set": {"latitude": 38.4, "longitude": 27.1}})
+        await db.hotels.update_one({"id": "rejected"}, {"$set": {"approval_status": "rejected"}})
+        index.mark_dirty("moved", "rejected")
+        working = index.db
+        index.db = None
+        with pytest.raises(AttributeError):
+            await index.sync()
+        index.db = working
+        await index.sync()
+        return index.nearby(41.0, 29.0, 10, 10), index.nearby(38.4, 27.1, 10, 10)
+
+    old_place, new_place = asyncio.run(scenario())
+    assert old_place == []
+    assert [hit["id"] for hit in new_place] == ["moved"]
+    assert broadcast == [["moved", "rejected"]]
+
+
+def test_map_endpoints(api):
+    async def scenario(client):
+        admin = await login(client, "admin@example.com", "admin")
+        manager = await login(client, "manager@example.com", "hotel_manager")
+        await create_hotel(client, manager, admin, name="Galata", latitude=41.026, longitude=28.974)
+        await create_hotel(client, manager, admin, name="Pera", latitude=41.031, longitude=28.977)
+        await create_hotel(client, manager, admin, name="Kadikoy", latitude=40.990, longitude=29.029)
+        await create_hotel(client, manager, None, name="Pending", latitude=41.027, longitude=28.975)
+        await create_hotel(client, manager, admin, name="Nowhere")
+
+        nearby = (await client.get("/api/hotels/nearby", params={"lat": 41.025, "lng": 28.973, "radius_km": 2})).json()
+        viewport = {"south": 40.9, "west": 28.9, "north": 41.1, "east": 29.1}
+        plain = (await client.get("/api/hotels/in-bounds", params=viewport)).json()
+        clustered = (await client.get("/api/hotels/in-bounds", params={**viewport, "zoom": 10})).json()
+        errors = [
+            (await client.get("/api/hotels/nearby", params={"lat": 91, "lng": 0})).status_code,
+            (await client.get("/api/hotels/nearby", params={"lat": 0, "lng": 0, "radius_km": 0})).status_code,
+            (await client.get("/api/hotels/in-bounds", params={**viewport, "south": 42})).status_code,
+            (await client.get("/api/hotels/in-bounds", params={**viewport, "zoom": 23})).status_code,
+        ]
+        return nearby, plain, clustered, errors
+
+    nearby, plain, clustered, errors = api(scenario)
+    assert [hotel["name"] for hotel in nearby] == ["Galata", "Pera"]
+    assert nearby[0]["distance_km"] < nearby[1]["distance_km"]
+    assert plain["total"] == 3 and plain["clusters"] == []
+    # Nearest to the viewport center first
+    assert [hotel["name"] for hotel in plain["hotels"]] == ["Kadikoy", "Galata", "Pera"]
+    assert clustered["total"] == 3
+    assert [hotel["name"] for hotel in clustered["hotels"]] == ["Kadikoy"]
+    assert [cluster["count"] for cluster in clustered["clusters"]] == [2]
+    assert errors == [400, 400, 400, 400]
@@ -0,0 +1,79 @@
+from datetime import datetime, timedelta
+
+from tests.conftest import create_hotel, create_room, login
+
+
+def booking(room_id: str, days_ahead: int, days: int = 2) -> dict:
+    start = datetime.utcnow().replace(microsecond=0) + timedelta(days=days_ahead)
+    return {
+        "room_id": room_id, "start_date": start.isoformat(), "end_date": (start + timedelta(days=days)).isoformat(),
+        "guest_count": 10, "contact_person": "Ada", "contact_phone": "1", "contact_email": "ada@example.com",
+    }
+
+
+def revenue(stats: dict) -> dict:
+    return {
+        row["currency"]: (row["revenue"], {item["status"]: (item["bookings"], item["revenue"]) for item in row["by_status"]})
+        for row in stats["revenue_by_currency"]
+    }
+
+
+def test_revenue_is_split_per_room_currency(api):
+    async def scenario(client):
+        admin = await login(client, "admin@example.com", "admin")
+        manager = await login(client, "manager@example.com", "hotel_manager")
+        customer = await login(client, "customer@example.com")
+        hotel = await create_hotel(client, manager, admin)
+        euro_room = await create_room(client, manager, hotel["id"], admin, price_per_day=100.0, currency="EUR")
+        dollar_room = await create_room(client, manager, hotel["id"], admin, price_per_day=80.0, currency="USD")
+        # Another manager's bookings never show up
+        other = await login(client, "other@example.com", "hotel_manager")
+        other_room = await create_room(client, other, (await create_hotel(client, other, admin))["id"], admin)
+
+        await client.post("/api/bookings", headers=customer, json=booking(euro_room["id"], 10))
+        cancelled = (await client.post("/api/bookings", headers=customer, json=booking(euro_room["id"], 20, days=3))).json()
+        await client.patch(f"/api/bookings/{cancelled['id']}/status", headers=customer, json={"status": "cancelled"})
+        await client.post("/api/bookings", headers=customer, json=booking(dollar_room["id"], 10, days=1))
+        await client.post("/api/bookings", headers=customer, json=booking(other_room["id"], 10))
+
+        mine = (await client.get("/api/manager/stats", headers=manager)).json()
+        as_admin = await client.get("/api/manager/stats", headers=admin, params={"manager_id": mine["manager_id"]})
+        forbidden = await client.get("/api/manager/stats", headers=customer)
+        return mine, as_admin.json(), forbidden.status_code
+
+    mine, as_admin, forbidden = api(scenario)
+    assert mine["bookings"] == 3
+    assert mine["bookings_by_status"] == {"pending": 2, "cancelled": 1}
+    # Cancelled bookings are listed but not counted as revenue
+    assert revenue(mine) == {
+        "EUR": (200.0, {"cancelled": (1, 300.0), "pending": (1, 200.0)}),
+        "USD": (80.0, {"pending": (1, 80.0)}),
+    }
+    assert revenue(as_admin) == revenue(mine)
+    assert forbidden == 403
+
+
+def test_booking_writes_refresh_cached_stats(api):
+    async def scenario(client):
+        admin = await login(client, "admin@example.com", "admin")
+        manager = await login(client, "manager@example.com", "hotel_manager")
+        customer = await login(client, "customer@example.com")
+        hotel = await create_hotel(client, manager, admin)
+        room = await create_room(client, manager, hotel["id"], admin)
+
+        seen = [(await client.get("/api/manager/stats", headers=manager)).json()]
+        created = (await client.post("/api/bookings", headers=customer, json=booking(room["id"], 10))).json()
+        seen.append((await client.get("/api/manager/stats", headers=manager)).json())
+        await client.patch(f"/api/bookings/{created['id']}/status", headers=manager, json={"status": "confirmed"})
+        seen.append((await client.get("/api/manager/stats", headers=manager)).json())
+        # Served from the cache while nothing changed
+        seen.append((await client.get("/api/manager/stats", headers=manager)).json())
+        return seen
+
+    empty, created, confirmed, cached = api(scenario)
+    assert (empty["bookings"], empty["revenue_by_currency"]) == (0, [])
+    assert created["bookings_by_status"] == {"pending": 1}
+    assert confirmed["bookings_by_status"] == {"confirmed": 1}
+    assert revenue(confirmed) == {"EUR": (200.0, {"confirmed": (1, 200.0)})}
+    assert cached["generated_at"] == confirmed["generated_at"]
+    assert created["generated_at"] != empty["generated_at"]
@@ -0,0 +1,79 @@
+from types import SimpleNamespace
+
+from metrics import Histogram, MetricsRegistry, MongoCommandListener, MongoPoolListener, RequestStats, current_request_stats
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram((0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        histogram.observe(value)
+    assert histogram.counts == [1, 2]
+    assert (histogram.total, histogram.sum) == (3, 5.55)
+
+
+def test_render_request_series():
+    registry = MetricsRegistry()
+    stats = RequestStats()
+    stats.queries, stats.docs = 2, 7
+    registry.observe_request("GET", "/api/hotels/{hotel_id}", 200, 0.02, stats)
+    text = registry.render()
+    assert 'http_requests_total{method="GET",route="/api/hotels/{hotel_id}",status="200"} 1' in text
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/api/hotels/{hotel_id}",le="0.01"} 0' in text
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/api/hotels/{hotel_id}",le="0.025"} 1' in text
+    assert 'mongo_queries_per_request_bucket{route="/api/hotels/{hotel_id}",le="2"} 1' in text
+    assert 'mongo_documents_total{route="/api/hotels/{hotel_id}"} 7' in text
+    assert text.endswith("\n")
+
+
+def test_commands_are_attributed_to_the_current_request():
+    registry = MetricsRegistry()
+    listener = MongoCommandListener(registry)
+    stats = RequestStats()
+    token = current_request_stats.set(stats)
+    try:
+        listener.succeeded(SimpleNamespace(command_name="find", duration_micros=2000, reply={"cursor": {"firstBatch": [{}, {}]}}))
+        listener.succeeded(SimpleNamespace(command_name="update", duration_micros=1000, reply={"n": 3}))
+        listener.failed(SimpleNamespace(command_name="find", duration_micros=1000, reply={}))
+    finally:
+        current_request_stats.reset(token)
+    # Outside a request only the command series move
+    listener.succeeded(SimpleNamespace(command_name="find", duration_micros=1000, reply={"n": 1}))
+
+    assert (stats.queries, stats.docs, round(stats.duration, 6)) == (3, 5, 0.004)
+    assert registry.mongo_command_latency["find"].total == 3
+    assert registry.mongo_failures == {"find": 1}
+
+
+def test_pool_gauges_and_checkout_waits():
+    registry = MetricsRegistry()
+    listener = MongoPoolListener(registry)
+    listener.connection_created(None)
+    listener.connection_created(None)
+    listener.connection_check_out_started(None)
+    listener.connection_checked_out(None)
+    listener.connection_check_out_started(None)
+    listener.connection_check_out_failed(SimpleNamespace(reason="timeout"))
+    listener.connection_closed(None)
+    assert (registry.pool_connections, registry.pool_checked_out) == (1, 1)
+    assert registry.pool_wait.total == 2
+    assert registry.pool_checkout_failures == {"timeout": 1}
+    listener.connection_checked_in(None)
+    assert registry.pool_checked_out == 0
+
+
+def test_metrics_endpoint_needs_the_token(api, server, monkeypatch):
+    async def scrape(client):
+        await client.get("/api/hotels/unknown")
+        return [
+            await client.get("/metrics"),
+            await client.get("/metrics", headers={"Authorization": "Bearer wrong"}),
+            await client.get("/metrics", headers={"Authorization": "Bearer secret"}),
+        ]
+
+    monkeypatch.setattr(server, "METRICS_TOKEN", None)
+    assert api(lambda client: client.get("/metrics")).status_code == 404
+
+    monkeypatch.setattr(server, "METRICS_TOKEN", "secret")
+    missing, wrong, scraped = api(scrape)
+    assert (missing.status_code, wrong.status_code, scraped.status_code) == (401, 401, 200)
+    assert 'http_requests_total{method="GET",route="/api/hotels/{hotel_id}",status="404"}' in scraped.text
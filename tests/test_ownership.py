@@ -0,0 +1,113 @@
+import asyncio
+import json
+from datetime import datetime, timedelta
+
+from ownership import OwnershipIndex
+from tests.conftest import create_hotel, login
+
+START = datetime(2024, 1, 1)
+
+
+def make_index(db, max_entries=100) -> OwnershipIndex:
+    index = OwnershipIndex(max_entries=max_entries)
+    index.init(db)
+    return index
+
+
+def test_entries_are_evicted_least_recently_used_first(db):
+    index = make_index(db, max_entries=2)
+
+    async def scenario():
+        index.add_hotel("h1", "m1")
+        index.add_hotel("h2", "m2")
+        # A hit makes h1 the most recently used
+        assert await index.hotel_manager("h1") == "m1"
+        index.add_hotel("h3", "m3")
+        return list(index._hotel_manager)
+
+    assert asyncio.run(scenario()) == ["h1", "h3"]
+
+
+def test_misses_load_only_live_documents(db):
+    index = make_index(db)
+
+    async def scenario():
+        await db.hotels.insert_many([
+            {"id": "h1", "manager_id": "m1"},
+            {"id": "gone", "manager_id": "m1", "deleted_at": START},
+        ])
+        await db.conference_rooms.insert_many([
+            {"id": "r1", "hotel_id": "h1"},
+            {"id": "r-gone", "hotel_id": "h1", "deleted_at": START},
+        ])
+        answers = (
+            await index.hotel_manager("h1"), await index.hotel_manager("gone"), await index.hotel_manager("missing"),
+            await index.room_hotel("r1"), await index.room_hotel("r-gone"),
+            await index.owns_room("m1", "r1"), await index.owns_room("m2", "r1"), await index.owns_room("m1", "r-gone"),
+        )
+        # Hits are cached, misses are not
+        await db.hotels.delete_one({"id": "h1"})
+        await db.hotels.insert_one({"id": "missing", "manager_id": "m9"})
+        return answers, await index.hotel_manager("h1"), await index.hotel_manager("missing")
+
+    answers, cached, loaded = asyncio.run(scenario())
+    assert answers == ("m1", None, None, "h1", None, True, False, False)
+    assert (cached, loaded) == ("m1", "m9")
+
+
+def test_warm_preloads_the_newest_live_documents(db):
+    index = make_index(db, max_entries=2)
+
+    async def scenario():
+        await db.hotels.insert_many([
+            {"id": f"h{n}", "manager_id": "m1", "created_at": START + timedelta(days=n)} for n in range(3)
+        ] + [{"id": "gone", "manager_id": "m1", "created_at": START + timedelta(days=9), "deleted_at": START}])
+        await db.conference_rooms.insert_one({"id": "r1", "hotel_id": "h2", "created_at": START})
+        await index.warm()
+
+    asyncio.run(scenario())
+    assert sorted(index._hotel_manager) == ["h1", "h2"]
+    assert dict(index._room_hotel) == {"r1": "h2"}
+
+
+def test_removals_fan_out_unless_they_came_from_another_worker(db):
+    index = make_index(db)
+    sent = []
+    index.add_listener(lambda kind, entity_id: sent.append((kind, entity_id)))
+    index.add_hotel("h1", "m1")
+    index.add_room("r1", "h1")
+    index.add_room("r2", "h1")
+    index.add_room("r3", "h2")
+    index.remove_room("r3")
+    # A hotel takes its rooms with it
+    index.remove_hotel("h1", broadcast=False)
+    assert sent == [("room", "r3")]
+    assert (dict(index._hotel_manager), dict(index._room_hotel)) == ({}, {})
+
+
+def test_worker_bus_messages_remove_entries(server):
+    server.ownership_index.add_hotel("h1", "m1")
+    server.ownership_index.add_room("r1", "h1")
+    server.ownership_index.add_room("r2", "h2")
+    server.worker_bus._dispatch(json.dumps({"channel": "ownership", "payload": {"kind": "room", "id": "r2"}}).encode())
+    server.worker_bus._dispatch(json.dumps({"channel": "ownership", "payload": {"kind": "hotel", "id": "h1"}}).encode())
+    assert (dict(server.ownership_index._hotel_manager), dict(server.ownership_index._room_hotel)) == ({}, {})
+
+
+def test_upload_is_gated_on_hotel_ownership(api, server, monkeypatch, tmp_path):
+    monkeypatch.setattr(server, "HOTEL_IMAGES_DIR", tmp_path)
+
+    async def scenario(client):
+        owner = await login(client, "owner@example.com", "hotel_manager")
+        other = await login(client, "other@example.com", "hotel_manager")
+        hotel = await create_hotel(client, owner)
+        files = {"file": ("photo.jpg", b"image", "image/jpeg")}
+        statuses = [
+            (await client.post(f"/api/hotels/{hotel['id']}/upload-image", headers=other, files=files)).status_code,
+            (await client.post(f"/api/hotels/{hotel['id']}/upload-image", headers=owner, files=files)).status_code,
+        ]
+        await client.delete(f"/api/hotels/{hotel['id']}", headers=owner)
+        statuses.append((await client.post(f"/api/hotels/{hotel['id']}/upload-image", headers=owner, files=files)).status_code)
+        return statuses
+
+    assert api(scenario) == [403, 200, 404]
@@ -0,0 +1,68 @@
+import asyncio
+
+from queries import Queries
+
+
+def make_queries(db) -> Queries:
+    queries = Queries()
+    queries.init(db)
+    return queries
+
+
+def test_principal_never_returns_password(db):
+    async def scenario():
+        await db.users.insert_one({"id": "u1", "email": "a@x.com", "password": "hash", "role": "customer"})
+        queries = make_queries(db)
+        principal = await queries.principal("a@x.com")
+        login = await queries.login_user("a@x.com")
+        return principal, login
+
+    principal, login = asyncio.run(scenario())
+    assert principal == {"id": "u1", "email": "a@x.com", "role": "customer"}
+    assert login["password"] == "hash"
+    assert "_id" not in login
+
+
+def test_room_ref_only_carries_ids(db):
+    async def scenario():
+        await db.conference_rooms.insert_one(
+            {"id": "r1", "hotel_id": "h1", "name": "Hall", "description": "long", "images": ["a.jpg"], "approval_status": "approved"}
+        )
+        queries = make_queries(db)
+        return await queries.room_ref("r1"), await queries.room_ref("r1", approval_status="pending")
+
+    ref, filtered = asyncio.run(scenario())
+    assert ref == {"id": "r1", "hotel_id": "h1"}
+    assert filtered is None
+
+
+def test_hotel_summary_is_owner_and_name(db):
+    async def scenario():
+        await db.hotels.insert_one({"id": "h1", "name": "Grand", "manager_id": "m1", "description": "long", "images": []})
+        return await make_queries(db).hotel_summary("h1")
+
+    assert asyncio.run(scenario()) == {"id": "h1", "name": "Grand", "manager_id": "m1"}
+
+
+def test_booking_access_is_ids_only(db):
+    async def scenario():
+        await db.bookings.insert_one(
+            {"id": "b1", "room_id": "r1", "customer_id": "u1", "total_price": 100.0, "extra_services": [{"name": "Tea"}]}
+        )
+        queries = make_queries(db)
+        return await queries.booking_access("b1"), await queries.booking_access("missing")
+
+    access, missing = asyncio.run(scenario())
+    assert access == {"id": "b1", "room_id": "r1", "customer_id": "u1"}
+    assert missing is None
+
+
+def test_manager_room_ids_follow_hotel_ownership(db):
+    async def scenario():
+        await db.hotels.insert_many([{"id": "h1", "manager_id": "m1"}, {"id": "h2", "manager_id": "m2"}])
+        await db.conference_rooms.insert_many([
+            {"id": "r1", "hotel_id": "h1"}, {"id": "r2", "hotel_id": "h1"}, {"id": "r3", "hotel_id": "h2"}
+        ])
+        return await make_queries(db).manager_room_ids("m1")
+
+    assert sorted(asyncio.run(scenario())) == ["r1", "r2"]
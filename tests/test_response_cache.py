@@ -0,0 +1,101 @@
+import asyncio
+
+from response_cache import ResponseCache
+
+
+def counting_compute(value):
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        return value
+
+    return compute, calls
+
+
+def test_hit_until_a_tag_is_invalidated():
+    async def scenario():
+        cache = ResponseCache()
+        compute, calls = counting_compute({"rooms": [1, 2]})
+        first, first_hit = await cache.get_or_compute("rooms?page=1", ("rooms", "hotel:h1"), compute)
+        _, second_hit = await cache.get_or_compute("rooms?page=1", ("rooms", "hotel:h1"), compute)
+        cache.invalidate("hotel:h1")
+        third, third_hit = await cache.get_or_compute("rooms?page=1", ("rooms", "hotel:h1"), compute)
+        return first, first_hit, second_hit, third, third_hit, len(calls)
+
+    first, first_hit, second_hit, third, third_hit, calls = asyncio.run(scenario())
+    assert (first_hit, second_hit, third_hit) == (False, True, False)
+    assert calls == 2
+    assert first.body == third.body == b'{"rooms":[1,2]}'
+    assert first.etag == third.etag
+
+
+def test_invalidation_only_drops_tagged_entries():
+    async def scenario():
+        cache = ResponseCache()
+        compute, calls = counting_compute([])
+        await cache.get_or_compute("hotel:h1", ("hotel:h1",), compute)
+        await cache.get_or_compute("hotel:h2", ("hotel:h2",), compute)
+        cache.invalidate("hotel:h1")
+        _, h1_hit = await cache.get_or_compute("hotel:h1", ("hotel:h1",), compute)
+        _, h2_hit = await cache.get_or_compute("hotel:h2", ("hotel:h2",), compute)
+        return h1_hit, h2_hit
+
+    assert asyncio.run(scenario()) == (False, True)
+
+
+def test_entry_computed_across_an_invalidation_is_not_stored():
+    async def scenario():
+        cache = ResponseCache()
+
+        async def compute():
+            # A write lands while the response is being computed
+            cache.invalidate("rooms")
+            return {"stale": True}
+
+        _, hit = await cache.get_or_compute("rooms", ("rooms",), compute)
+        return hit, cache._lookup("rooms")
+
+    hit, stored = asyncio.run(scenario())
+    assert hit is False
+    assert stored is None
+
+
+def test_concurrent_misses_share_one_computation():
+    async def scenario():
+        cache = ResponseCache()
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {"n": 1}
+
+        results = await asyncio.gather(*(cache.get_or_compute("k", ("t",), compute) for _ in range(5)))
+        return results, len(calls)
+
+    results, calls = asyncio.run(scenario())
+    assert calls == 1
+    assert [hit for _, hit in results].count(False) == 1
+
+
+def test_invalidate_notifies_listeners_unless_received_from_another_worker():
+    cache = ResponseCache()
+    received = []
+    cache.add_listener(received.append)
+    cache.invalidate("hotel:h1", "rooms")
+    cache.invalidate("hotel:h2", broadcast=False)
+    assert received == [("hotel:h1", "rooms")]
+
+
+def test_least_recently_used_entry_is_evicted():
+    async def scenario():
+        cache = ResponseCache(max_entries=2)
+        compute, _ = counting_compute(1)
+        for key in ("a", "b"):
+            await cache.get_or_compute(key, (), compute)
+        await cache.get_or_compute("a", (), compute)  # a is now the most recent
+        await cache.get_or_compute("c", (), compute)
+        return [(await cache.get_or_compute(key, (), compute))[1] for key in ("a", "c", "b")]
+
+    assert asyncio.run(scenario()) == [True, True, False]
@@ -0,0 +1,33 @@
+from tests.conftest import create_hotel, create_room, login
+
+
+def counts(facets: dict, name: str) -> dict:
+    return {facet["value"]: facet["count"] for facet in facets[name]}
+
+
+def test_features_are_counted_case_insensitively(api):
+    async def scenario(client):
+        admin = await login(client, "admin@example.com", "admin")
+        manager = await login(client, "manager@example.com", "hotel_manager")
+        hotel = await create_hotel(client, manager, admin)
+        await create_room(client, manager, hotel["id"], admin, name="A", features=["WiFi", "Projector"])
+        await create_room(client, manager, hotel["id"], admin, name="B", features=["wifi"])
+        # Tagged twice in different spellings, still one room
+        await create_room(client, manager, hotel["id"], admin, name="C", features=["WIFI", "wifi", "whiteboard"])
+
+        params = {"count_features": "Wifi,sound_system"}
+        everything = (await client.get("/api/rooms/facets", params=params)).json()
+        with_wifi = (await client.get("/api/rooms/facets", params={**params, "features": "WIFI"})).json()
+        rooms = (await client.get("/api/rooms", params={"features": "WIFI"})).json()
+        # Same filter in other spellings, served from the same cache entry
+        respelled = await client.get("/api/rooms/facets", params={"count_features": "sound_system,wifi", "features": "Wifi"})
+        return everything, with_wifi, len(rooms), respelled.json(), respelled.headers.get("X-Cache")
+
+    everything, with_wifi, room_count, respelled, cache = api(scenario)
+    assert everything["total"] == 3
+    assert counts(everything, "features") == {"wifi": 3, "projector": 1, "whiteboard": 1, "sound_system": 0}
+    # The facet agrees with the rooms the filter returns
+    assert with_wifi["total"] == room_count == 3
+    assert counts(with_wifi, "features")["wifi"] == 3
+    assert respelled == with_wifi
+    assert cache == "HIT"
@@ -0,0 +1,150 @@
+import asyncio
+
+from search_index import SearchIndex, fold, tokenize
+from tests.conftest import create_hotel, create_room, login
+
+
+def hotel(hotel_id, name, city, approval_status="approved", **fields):
+    return {"id": hotel_id, "name": name, "city": city, "approval_status": approval_status, "is_active": True, **fields}
+
+
+def room(room_id, hotel_id, name, **fields):
+    return {"id": room_id, "hotel_id": hotel_id, "name": name, "approval_status": "approved", "is_available": True, **fields}
+
+
+def make_index(db) -> SearchIndex:
+    index = SearchIndex()
+    index.init(db)
+    return index
+
+
+def ids(hits) -> list:
+    return [(hit["type"], hit["id"]) for hit in hits]
+
+
+def test_fold_meets_turkish_and_accented_spellings():
+    assert {fold("İstanbul"), fold("istanbul"), fold("ISTANBUL"), fold("ıstanbul")} == {"istanbul"}
+    assert fold("Çeşme Güzelyalı") == "cesme guzelyali"
+    assert fold(None) == ""
+    assert tokenize("Hall-A, Kat_2 / Ürgüp!") == ["hall", "a", "kat", "2", "urgup"]
+
+
+def test_prefixes_match_and_rank_below_whole_words(db):
+    index = make_index(db)
+
+    async def scenario():
+        await db.hotels.insert_many([
+            hotel("h1", "Bosphorus Palace", "İstanbul"),
+            hotel("h2", "Ankara Business", "Ankara", description="Near the bosphorus bridge bus"),
+            hotel("h3", "Bosphorus View", "Istanbul", approval_status="pending"),
+        ])
+        await db.conference_rooms.insert_many([
+            room("r1", "h1", "Marmara Hall"),
+            room("r2", "h3", "Hidden Hall"),
+            room("r3", "h1", "Closed Hall", is_available=False),
+        ])
+        await index.rebuild()
+        return (
+            index.search("ISTANBUL"), index.search("bosph"), index.search("bus"),
+            index.search("hall"), index.search("palace ankara"), index.search("b"),
+        )
+
+    istanbul, prefix, bus, hall, nothing, short = asyncio.run(scenario())
+    # The room carries its hotel's city, pending hotels are not searchable
+    assert ids(istanbul) == [("hotel", "h1"), ("room", "r1")]
+    # Hotel names weigh more than the hotel name a room is indexed with, which weighs as much as a description
+    assert ids(prefix) == [("hotel", "h1"), ("room", "r1"), ("hotel", "h2")]
+    # "bus" matches the description word and the "business" name prefix of the same hotel
+    assert ids(bus) == [("hotel", "h2")]
+    assert ids(hall) == [("room", "r1")]
+    assert nothing == []
+    # One letter only matches whole words
+    assert short == []
+
+
+def test_ranking_prefers_frequent_and_short_matches(db):
+    index = make_index(db)
+
+    async def scenario():
+        await db.hotels.insert_many([
+            hotel("long", "Sea Hotel", "Izmir", description="A hotel by the sea with a long description of many words"),
+            hotel("short", "Sea Sea", "Izmir"),
+            hotel("other", "Mountain Lodge", "Izmir"),
+        ])
+        await index.rebuild()
+        return index.search("sea"), index.search("sea", kind="room"), index.search("sea", limit=1)
+
+    ranked, rooms_only, limited = asyncio.run(scenario())
+    assert ids(ranked) == [("hotel", "short"), ("hotel", "long")]
+    assert ranked[0]["score"] > ranked[1]["score"]
+    assert rooms_only == []
+    assert ids(limited) == [("hotel", "short")]
+
+
+def test_sync_drops_unapproved_and_deleted_hotels(db):
+    index = make_index(db)
+    broadcast = []
+    index.add_listener(lambda kind, dirty: broadcast.append((kind, dirty)))
+
+    async def scenario():
+        await db.hotels.insert_many([hotel("h1", "Grand", "İzmir"), hotel("h2", "Royal", "Izmir")])
+        await db.conference_rooms.insert_one(room("r1", "h1", "Grand Hall"))
+        await index.rebuild()
+        before = ids(index.search("grand")), sorted(index.city_hotel_ids("IZMIR"))
+
+        await db.hotels.update_one({"id": "h1"}, {"$set": {"approval_status": "rejected"}})
+        await db.hotels.update_one({"id": "h2"}, {"$set": {"deleted_at": "now"}})
+        # Stale until the write is reported
+        stale = ids(index.search("grand"))
+        index.mark_dirty("hotel", "h1", "h2")
+        await index.sync()
+        return before, stale, ids(index.search("grand")), index.search("royal"), index.city_hotel_ids("izm")
+
+    before, stale, after, royal, cities = asyncio.run(scenario())
+    assert before == ([("hotel", "h1"), ("room", "r1")], ["h1", "h2"])
+    assert stale == before[0]
+    # The rejected hotel takes its rooms along but still counts for the city filters
+    assert after == []
+    assert royal == []
+    assert cities == ["h1"]
+    assert broadcast == [("hotel", ["h1", "h2"])]
+
+
+def test_failed_sync_keeps_documents_dirty(db):
+    index = make_index(db)
+
+    async def scenario():
+        await index.rebuild()
+        await db.hotels.insert_one(hotel("h1", "Grand", "Izmir"))
+        index.mark_dirty("hotel", "h1", broadcast=False)
+        working = index.db
+        index.db = None
+        try:
+            await index.sync()
+        except AttributeError:
+            pass
+        index.db = working
+        await index.sync()
+        return ids(index.search("grand"))
+
+    assert asyncio.run(scenario()) == [("hotel", "h1")]
+
+
+def test_search_endpoint_follows_hotel_writes(api):
+    async def scenario(client):
+        admin = await login(client, "admin@example.com", "admin")
+        manager = await login(client, "manager@example.com", "hotel_manager")
+        hotel = await create_hotel(client, manager, admin, name="Pera Palace", city="İstanbul")
+        await create_room(client, manager, hotel["id"], admin, name="Ballroom")
+        found = (await client.get("/api/search", params={"q": "pera ball"})).json()
+        by_city = (await client.get("/api/hotels", params={"city": "ISTANBUL"})).json()
+        await client.put(f"/api/admin/hotels/{hotel['id']}/reject", headers=admin)
+        rejected = (await client.get("/api/search", params={"q": "pera"})).json()
+        bad_type = await client.get("/api/search", params={"q": "pera", "type": "city"})
+        return found, by_city, rejected, bad_type.status_code
+
+    found, by_city, rejected, bad_type = api(scenario)
+    assert [(hit["type"], hit["name"]) for hit in found["results"]] == [("room", "Ballroom")]
+    assert [hotel["name"] for hotel in by_city] == ["Pera Palace"]
+    assert rejected["results"] == []
+    assert bad_type == 400
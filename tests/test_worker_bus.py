@@ -0,0 +1,99 @@
+import asyncio
+import os
+
+import worker_bus as worker_bus_module
+from job_tracker import JobTracker
+from worker_bus import WorkerBus
+
+
+async def start_worker(directory, pid: int, monkeypatch) -> WorkerBus:
+    """A bus as the worker process pid would start it"""
+    bus = WorkerBus()
+    with monkeypatch.context() as patched:
+        patched.setattr(os, "getpid", lambda: pid)
+        await bus.start(directory)
+    return bus
+
+
+def test_messages_reach_every_other_worker(tmp_path, monkeypatch):
+    received = {pid: [] for pid in (1, 2, 3)}
+
+    async def scenario():
+        buses = {pid: await start_worker(tmp_path, pid, monkeypatch) for pid in received}
+        for pid, bus in buses.items():
+            bus.subscribe("cache", received[pid].append)
+        buses[1].publish("cache", ["hotels"])
+        buses[2].publish("other", "ignored")
+        await asyncio.sleep(0.05)
+        for bus in buses.values():
+            await bus.stop()
+
+    asyncio.run(scenario())
+    assert received == {1: [], 2: [["hotels"]], 3: [["hotels"]]}
+    assert list(tmp_path.glob("*.sock")) == []
+
+
+def test_dead_workers_and_oversized_messages(tmp_path, monkeypatch):
+    received = []
+
+    async def scenario():
+        sender = await start_worker(tmp_path, 1, monkeypatch)
+        receiver = await start_worker(tmp_path, 2, monkeypatch)
+        receiver.subscribe("cache", received.append)
+        # Left behind by a worker that died without unlinking it
+        (tmp_path / "3.sock").touch()
+        sender.publish("cache", "x" * worker_bus_module.MAX_MESSAGE_BYTES)
+        sender.publish("cache", "small")
+        await asyncio.sleep(0.05)
+        await sender.stop()
+        await receiver.stop()
+
+    asyncio.run(scenario())
+    assert received == ["small"]
+    assert not (tmp_path / "3.sock").exists()
+
+
+def test_one_leader_until_it_stops(tmp_path, monkeypatch):
+    async def scenario():
+        first = await start_worker(tmp_path, 1, monkeypatch)
+        second = await start_worker(tmp_path, 2, monkeypatch)
+        claims = [first.try_acquire_leadership(), second.try_acquire_leadership(), first.try_acquire_leadership()]
+        await first.stop()
+        claims.append(second.try_acquire_leadership())
+        await second.stop()
+        return claims
+
+    assert asyncio.run(scenario()) == [True, False, True, True]
+
+
+def test_drain_waits_then_interrupts(db):
+    async def job(seconds):
+        await asyncio.sleep(seconds)
+        return {"slept": seconds}
+
+    async def scenario():
+        jobs = JobTracker()
+        jobs.init(db)
+        quick = await jobs.create("test")
+        slow = await jobs.create("test")
+        jobs.run(quick["id"], job(0.05))
+        jobs.run(slow["id"], job(10))
+        await jobs.drain(0.2)
+        return (await jobs.get(quick["id"]))["status"], (await jobs.get(slow["id"]))["status"], jobs._tasks
+
+    assert asyncio.run(scenario()) == ("completed", "interrupted", set())
+
+
+def test_shutdown_drains_background_jobs(api, server, loop, monkeypatch):
+    monkeypatch.setattr(server, "SHUTDOWN_DRAIN_SECONDS", 0.5)
+
+    async def scenario(client):
+        job = await server.job_tracker.create("test")
+        server.job_tracker.run(job["id"], asyncio.sleep(0.1, result={"done": True}))
+        return job["id"]
+
+    job_id = api(scenario)
+    job = loop.run_until_complete(server.db.jobs.find_one({"id": job_id}))
+    assert (job["status"], job["result"]) == ("completed", {"done": True})
+    # The bus socket is gone with the worker
+    assert server.worker_bus.path is None or not server.worker_bus.path.exists()